@@ -16,6 +16,8 @@ from claims import extract_claims, rank_claims_by_importance
 from summarize import get_summarizer
 from utils import extract_keywords, extract_key_sentences
 from search import verify_with_sources
+from resilience import source_health_stats
+from executors import run_in_thread, run_in_process
 
 router = APIRouter(prefix="/ai", tags=["AI Assistant"])
 
@@ -67,17 +69,18 @@ async def ai_ask(request: AskRequest):
     try:
         stats["total_queries"] += 1
         
-        vector_store = get_vector_store()
+        vector_store = await run_in_thread(get_vector_store)
         
         # If context provided, add to vector store temporarily
         if request.context:
-            vector_store.add(
+            await run_in_thread(
+                vector_store.add,
                 [request.context],
                 [{"source": "user_context", "timestamp": time.time()}]
             )
         
         # Retrieve relevant evidence
-        results = vector_store.search(request.question, k=3)
+        results = await run_in_thread(vector_store.search, request.question, k=3)
         
         # Build answer from evidence
         if results:
@@ -110,7 +113,7 @@ async def extract_claims_endpoint(request: ExtractClaimsRequest):
     try:
         stats["total_claims_extracted"] += 1
         
-        claims = extract_claims(request.text)
+        claims = await run_in_process(extract_claims, request.text)
         ranked_claims = rank_claims_by_importance(claims)
         
         return {
@@ -131,8 +134,8 @@ async def rag_query(request: RAGQueryRequest):
     try:
         stats["total_rag_queries"] += 1
         
-        vector_store = get_vector_store()
-        results = vector_store.search(request.query, k=request.k)
+        vector_store = await run_in_thread(get_vector_store)
+        results = await run_in_thread(vector_store.search, request.query, k=request.k)
         
         return {
             "query": request.query,
@@ -152,19 +155,19 @@ async def generate_draft(request: DraftRequest):
     try:
         stats["total_drafts"] += 1
         
-        summarizer = get_summarizer()
+        summarizer = await run_in_thread(get_summarizer)
         draft_type = request.draft_type.lower()
         
         if draft_type == "summary":
-            draft = summarizer.summarize(request.text, max_length=150)
+            draft = await run_in_thread(summarizer.summarize, request.text, max_length=150)
         
         elif draft_type == "bullets":
-            key_sentences = extract_key_sentences(request.text, num_sentences=5)
+            key_sentences = await run_in_process(extract_key_sentences, request.text, num_sentences=5)
             draft = "\n".join([f"• {s}" for s in key_sentences])
         
         elif draft_type == "tweet":
-            summary = summarizer.summarize(request.text, max_length=60)
-            keywords = extract_keywords(request.text, top_n=3)
+            summary = await run_in_thread(summarizer.summarize, request.text, max_length=60)
+            keywords = await run_in_process(extract_keywords, request.text, top_n=3)
             hashtags = ' '.join([f'#{kw}' for kw in keywords])
             draft = f"{summary}\n\n{hashtags}"
         
@@ -187,7 +190,7 @@ Recommendation: Treat as UNVERIFIED until confirmed by established news outlets.
 """
         
         elif draft_type == "press_release":
-            keywords = extract_keywords(request.text, top_n=5)
+            keywords = await run_in_process(extract_keywords, request.text, top_n=5)
             draft = f"""PRESS RELEASE - FACT VERIFICATION ALERT
 
 FOR IMMEDIATE RELEASE
@@ -221,7 +224,7 @@ async def explain_prediction(request: ExplainRequest):
     Explain model reasoning and confidence factors
     """
     try:
-        keywords = extract_keywords(request.text, top_n=10)
+        keywords = await run_in_process(extract_keywords, request.text, top_n=10)
         
         # Analyze confidence
         confidence_level = "High" if request.confidence > 0.8 else "Medium" if request.confidence > 0.6 else "Low"
@@ -286,13 +289,14 @@ async def health_check():
     System health check
     """
     try:
-        vector_store = get_vector_store()
+        vector_store = await run_in_thread(get_vector_store)
         vs_stats = vector_store.stats()
         
         return {
             "status": "healthy",
             "uptime_seconds": time.time() - stats["start_time"],
             "vector_store": vs_stats,
+            "sources": source_health_stats(),
             "stats": stats
         }
     
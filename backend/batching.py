@@ -0,0 +1,164 @@
+"""
+Micro-batching scheduler - Coalesce concurrent inference calls into one vectorized batch
+"""
+
+import asyncio
+import os
+import time
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+def _bucket(size: int) -> str:
+    """Power-of-two histogram bucket label for a batch size"""
+    if size <= 1:
+        return "1"
+    low = 1 << (size.bit_length() - 1)
+    return f"{low}-{(low << 1) - 1}"
+
+
+class MicroBatcher:
+    """
+    Collects items submitted concurrently over a short window and runs
+    them through `process_fn` as one batch. Each caller awaits its own result.
+    """
+
+    def __init__(
+        self,
+        process_fn: Callable[[List[Any]], List[Any]],
+        window_ms: float = 5.0,
+        max_batch: int = 64,
+        name: str = "batcher",
+        runner: Optional[Callable[..., Awaitable[Any]]] = None
+    ):
+        """
+        Args:
+            process_fn: Callable taking a list of items and returning a
+                list of results in the same order
+            window_ms: How long to wait for more items after the first arrives
+            max_batch: Flush immediately once this many items are queued
+            name: Label used in stats output
+            runner: Optional async runner such as executors.run_in_thread;
+                when omitted, process_fn runs inline on the event loop
+        """
+        self.process_fn = process_fn
+        self.window_ms = window_ms
+        self.max_batch = max(1, max_batch)
+        self.name = name
+        self.runner = runner
+
+        self._pending: List[Tuple[Any, asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running = set()
+
+        self._histogram = Counter()
+        self._total_batches = 0
+        self._total_items = 0
+        self._max_seen = 0
+        self._total_wait = 0.0
+        self._total_process = 0.0
+
+    async def submit(self, item: Any) -> Any:
+        """Queue one item and wait for its result"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future, time.perf_counter()))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_ms / 1000.0, self._flush)
+
+        return await future
+
+    def _flush(self):
+        """Take up to max_batch queued items and process them"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch = self._pending[:self.max_batch]
+        self._pending = self._pending[self.max_batch:]
+
+        # Anything left over starts a fresh window
+        if self._pending:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.window_ms / 1000.0, self._flush)
+
+        if batch:
+            # Hold a reference so the task is not garbage collected mid-run
+            task = asyncio.ensure_future(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future, float]]):
+        """Process a batch and resolve every caller's future"""
+        started = time.perf_counter()
+        items = [item for item, _, _ in batch]
+
+        try:
+            if self.runner is not None:
+                results = await self.runner(self.process_fn, items)
+            else:
+                results = self.process_fn(items)
+            if len(results) != len(items):
+                raise RuntimeError(
+                    f"{self.name}: expected {len(items)} results, got {len(results)}"
+                )
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future, _), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+        finished = time.perf_counter()
+        self._record(batch, started, finished)
+
+    def _record(self, batch: List[Tuple[Any, asyncio.Future, float]], started: float, finished: float):
+        """Update batch-size histogram and timing counters"""
+        size = len(batch)
+        self._histogram[_bucket(size)] += 1
+        self._total_batches += 1
+        self._total_items += size
+        self._max_seen = max(self._max_seen, size)
+        self._total_wait += sum(started - queued for _, _, queued in batch)
+        self._total_process += finished - started
+
+    def stats(self) -> Dict:
+        """Get batching statistics"""
+        batches = self._total_batches
+        items = self._total_items
+
+        return {
+            "name": self.name,
+            "window_ms": self.window_ms,
+            "max_batch": self.max_batch,
+            "total_batches": batches,
+            "total_items": items,
+            "mean_batch_size": round(items / batches, 2) if batches else 0.0,
+            "max_batch_seen": self._max_seen,
+            "mean_queue_wait_ms": round(self._total_wait / items * 1000, 3) if items else 0.0,
+            "mean_process_ms": round(self._total_process / batches * 1000, 3) if batches else 0.0,
+            "pending": len(self._pending),
+            "batch_size_histogram": dict(
+                sorted(self._histogram.items(), key=lambda kv: int(kv[0].split("-")[0]))
+            )
+        }
+
+
+def batcher_from_env(
+    process_fn: Callable[[List[Any]], List[Any]],
+    name: str = "model",
+    runner: Optional[Callable[..., Awaitable[Any]]] = None
+) -> MicroBatcher:
+    """Build a MicroBatcher using BATCH_WINDOW_MS / BATCH_MAX_SIZE from the environment"""
+    return MicroBatcher(
+        process_fn,
+        window_ms=float(os.environ.get("BATCH_WINDOW_MS", 5)),
+        max_batch=int(os.environ.get("BATCH_MAX_SIZE", 64)),
+        name=name,
+        runner=runner
+    )
@@ -0,0 +1,84 @@
+"""
+Cascade benchmark: how much of the traffic each escalation band sends to the transformer
+
+Scores the politifact titles with the fast model, then for a few bands
+reports the share of titles that would be escalated and the fast-tier
+accuracy inside and outside the band (every title in the CSV is fake). When
+transformers and CASCADE_MODEL load, it also times the second tier on the
+escalated titles, gives its accuracy on them and the expected mean latency
+per text: fast + escalation rate x transformer.
+
+Usage (from backend/):
+    python benchmarks/bench_cascade.py [--bands 0.45-0.55,0.4-0.6,0.35-0.65,0.3-0.7] [--sample 64]
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from cascade import Cascade, p_real
+from registry import ModelRegistry
+
+DATASET = os.path.join(os.path.dirname(__file__), '..', '..', 'politifact', 'politifact_fake.csv')
+
+
+def load_titles():
+    # tweet_ids can be a very long field
+    csv.field_size_limit(sys.maxsize)
+    with open(DATASET, newline='', encoding='utf-8') as f:
+        return [row['title'] for row in csv.DictReader(f) if row.get('title')]
+
+
+def accuracy(labels):
+    return sum(label == 0 for label in labels) / len(labels) if labels else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--bands', default="0.45-0.55,0.4-0.6,0.35-0.65,0.3-0.7")
+    parser.add_argument('--sample', type=int, default=64, help="escalated titles timed on the transformer")
+    args = parser.parse_args()
+
+    registry = ModelRegistry()
+    model = registry.load().model
+    titles = load_titles()
+
+    started = time.perf_counter()
+    probabilities = model.predict_proba(titles)
+    fast_ms = (time.perf_counter() - started) * 1000 / len(titles)
+    labels = [int(row.argmax()) for row in probabilities]
+    scores = [(label, float(row[label])) for row, label in zip(probabilities, labels)]
+
+    second = Cascade(enabled=True)
+    classifier = second.load()
+
+    print(f"{len(titles)} titles, fast tier {fast_ms:.3f} ms/text, accuracy {accuracy(labels):.3f}")
+    print(f"{'band':<12}{'escalated':>11}{'fast acc in':>13}{'fast acc out':>14}{'heavy acc in':>14}{'mean ms':>9}")
+    for band in args.bands.split(","):
+        low, high = (float(bound) for bound in band.split("-"))
+        inside = [i for i, (label, confidence) in enumerate(scores) if low <= p_real(label, confidence) <= high]
+        outside = sorted(set(range(len(titles))) - set(inside))
+        rate = len(inside) / len(titles)
+
+        heavy_acc, mean_ms = "-", "-"
+        if classifier is not None and inside:
+            sample = [titles[i] for i in inside[:args.sample]]
+            started = time.perf_counter()
+            heavy = classifier.classify(sample)
+            heavy_ms = (time.perf_counter() - started) * 1000 / len(sample)
+            heavy_acc = f"{accuracy([label for label, _ in heavy]):.3f}"
+            mean_ms = f"{fast_ms + rate * heavy_ms:.2f}"
+
+        print(f"{band:<12}{rate:>10.1%}{accuracy([labels[i] for i in inside]):>13.3f}"
+              f"{accuracy([labels[i] for i in outside]):>14.3f}{heavy_acc:>14}{mean_ms:>9}")
+
+    if classifier is None:
+        print(f"⚠️ Second tier not timed: {second.error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Micro-benchmark: sklearn pipeline predict_proba vs the exported FastScorer
+
+Times single-item scoring (headline and article length) and one batch of all
+politifact titles both ways, and checks the probabilities agree.
+
+Usage (from backend/, after python ../export_fast_model.py):
+    python benchmarks/bench_fastmodel.py [--rounds 300]
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import joblib
+import numpy as np
+
+from fastmodel import FastScorer, FAST_MODEL_PATH
+from textnorm import with_normalizer
+
+MODEL_PATH = os.path.join(os.path.dirname(__file__), '..', 'model', 'model.pkl')
+DATASET = os.path.join(os.path.dirname(__file__), '..', '..', 'politifact', 'politifact_fake.csv')
+
+
+def load_titles():
+    # tweet_ids can be a very long field
+    csv.field_size_limit(sys.maxsize)
+    with open(DATASET, newline='', encoding='utf-8') as f:
+        return [row['title'] for row in csv.DictReader(f) if row.get('title')]
+
+
+def per_call(fn, rounds):
+    fn()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - started) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rounds', type=int, default=300)
+    args = parser.parse_args()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        pipe = with_normalizer(joblib.load(MODEL_PATH))
+    scorer = FastScorer(FAST_MODEL_PATH)
+
+    titles = load_titles()
+    article = ' '.join(titles[:40])
+    max_diff = float(np.abs(pipe.predict_proba(titles) - scorer.predict_proba(titles)).max())
+
+    print(f"{'case':<18}{'pipeline':>12}{'fast':>12}{'speedup':>9}")
+    for name, texts, rounds in [
+        ("headline", [titles[0]], args.rounds),
+        ("article", [article], args.rounds),
+        (f"batch of {len(titles)}", titles, max(1, args.rounds // 30)),
+    ]:
+        slow = per_call(lambda: pipe.predict_proba(texts), rounds)
+        fast = per_call(lambda: scorer.predict_proba(texts), rounds)
+        print(f"{name:<18}{slow * 1e6:>10.0f}us{fast * 1e6:>10.0f}us{slow / fast:>8.1f}x")
+    print(f"max probability difference: {max_diff:.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Micro-benchmark: per-term substring scans vs the single-pass PatternMatcher
+
+Grows a claim-type lexicon from the built-in terms to thousands of terms and
+times category detection over the politifact headlines: the naive loop over
+categories, and PatternMatcher forced to each of its two strategies (per-term
+`in` scan, single regex). The last column is the strategy PatternMatcher
+picks by default for that size (matcher.MATCHER_SCAN_THRESHOLD).
+
+Usage (from backend/):
+    python benchmarks/bench_matcher.py [--sizes 20,33,48,64,200,2000,5000]
+"""
+
+import argparse
+import csv
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from matcher import PatternMatcher, MATCHER_SCAN_THRESHOLD
+from utils import CLAIM_TYPE_LEXICON
+
+DATASET = os.path.join(os.path.dirname(__file__), '..', '..', 'politifact', 'politifact_fake.csv')
+
+
+def load_titles():
+    # tweet_ids can be a very long field
+    csv.field_size_limit(sys.maxsize)
+    with open(DATASET, newline='', encoding='utf-8') as f:
+        return [row['title'] for row in csv.DictReader(f) if row.get('title')]
+
+
+def grow_lexicon(size):
+    """Built-in lexicon padded with random pseudo-words up to size terms"""
+    random.seed(size)
+    lexicon = {category: list(terms) for category, terms in CLAIM_TYPE_LEXICON.items()}
+    categories = list(lexicon)
+    total = sum(len(terms) for terms in lexicon.values())
+    while total < size:
+        word = ''.join(random.choices('abcdefghijklmnopqrstuvwxyz', k=random.randint(5, 12)))
+        lexicon[random.choice(categories)].append(word)
+        total += 1
+    return lexicon
+
+
+def naive(texts, lexicon):
+    for text in texts:
+        text_lower = text.lower()
+        {c for c, terms in lexicon.items() if any(t in text_lower for t in terms)}
+
+
+def compiled(texts, matcher):
+    for text in texts:
+        matcher.categories(text)
+
+
+def timed(run, *args, repeat=5):
+    """Best of repeat runs, in ms"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run(*args)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', default='20,33,48,64,200,2000,5000')
+    args = parser.parse_args()
+
+    texts = load_titles()
+    print(f"{'terms':>6}  {'naive ms':>9}  {'scan ms':>8}  {'regex ms':>9}  {'default':>7}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        lexicon = grow_lexicon(size)
+        scan = PatternMatcher(lexicon, scan_threshold=size)
+        regex = PatternMatcher(lexicon, scan_threshold=0)
+
+        # Warm up every path so the first size isn't charged for it
+        naive(texts[:50], lexicon)
+        compiled(texts[:50], scan)
+        compiled(texts[:50], regex)
+
+        naive_ms = timed(naive, texts, lexicon)
+        scan_ms = timed(compiled, texts, scan)
+        regex_ms = timed(compiled, texts, regex)
+        default = "scan" if size <= MATCHER_SCAN_THRESHOLD else "regex"
+        print(f"{size:>6}  {naive_ms:>9.2f}  {scan_ms:>8.2f}  {regex_ms:>9.2f}  {default:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Memory benchmark: `uvicorn --workers N` (spawned workers) vs serve.py (pre-forked workers)
+
+Starts the API both ways, and pre-forked without gc.freeze, with the same
+components warmed in every worker, sends some /predict and /summarize traffic
+so workers touch their models, then reads /proc/<pid>/smaps_rollup (Linux only) for every server process and
+reports per worker RSS, PSS (shared pages split between the processes mapping
+them) and private memory, plus the PSS of the whole server - the parent
+included - which is what the deployment really costs.
+
+Usage (from backend/):
+    python benchmarks/bench_prefork.py [--workers 4] [--components idf,nlp,summarizer,embeddings,vectorstore]
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.parse
+import urllib.request
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+TEXTS = [
+    "Officials confirmed the new national budget on Monday after a long debate in parliament.",
+    "SHOCKING: scientists hide the truth about this miracle cure, share before it is deleted!",
+    "The central bank raised interest rates by a quarter point, citing persistent inflation."
+]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def request(port: int, path: str, body=None, method: str = "GET"):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(f"http://127.0.0.1:{port}{path}", data=data, method=method,
+                                 headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=60) as response:
+        return json.loads(response.read())
+
+
+def memory(pid: int):
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "private": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+    }
+
+
+def children(pid: int):
+    pids = []
+    for task in os.listdir(f"/proc/{pid}/task"):
+        with open(f"/proc/{pid}/task/{task}/children") as f:
+            pids += [int(child) for child in f.read().split()]
+    workers = []
+    for child in pids:
+        with open(f"/proc/{child}/cmdline", "rb") as f:
+            if b"resource_tracker" not in f.read():
+                workers.append(child)
+    return workers
+
+
+def run(mode: str, workers: int, components: str):
+    port = free_port()
+    env = dict(os.environ, WARMUP_COMPONENTS=components, PRELOAD_COMPONENTS=components,
+               SERVE_GC_FREEZE="0" if mode == "no-freeze" else "1")
+    if mode == "spawn":
+        command = [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--workers", str(workers),
+                   "--log-level", "warning"]
+    else:
+        command = [sys.executable, "serve.py", "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers),
+                   "--log-level", "warning"]
+    proc = subprocess.Popen(command, cwd=BACKEND, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    try:
+        started = time.perf_counter()
+        while True:
+            try:
+                request(port, "/ready")
+                break
+            except OSError:
+                if proc.poll() is not None or time.perf_counter() - started > 300:
+                    raise RuntimeError(f"{mode} server did not start")
+                time.sleep(0.2)
+        ready_s = time.perf_counter() - started
+
+        # Let every worker finish its warm-up, then give each some traffic
+        while len(children(proc.pid)) < workers:
+            time.sleep(0.2)
+        time.sleep(5)
+        for i in range(40 * workers):
+            text = TEXTS[i % len(TEXTS)]
+            request(port, "/predict", {"text": f"{text} {i}"}, method="POST")
+            request(port, "/summarize?" + urllib.parse.urlencode({"text": " ".join(TEXTS) * 2}), method="POST")
+        time.sleep(1)
+
+        pids = children(proc.pid)
+        per_worker = [memory(pid) for pid in pids]
+        parent = memory(proc.pid)
+        average = {key: sum(m[key] for m in per_worker) / len(per_worker) for key in ("rss", "pss", "private")}
+        total_pss = parent["pss"] + sum(m["pss"] for m in per_worker)
+        return ready_s, average, total_pss
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--components', default="idf,nlp,summarizer,embeddings,vectorstore")
+    args = parser.parse_args()
+
+    print(f"{args.workers} workers, components: {args.components} (memory in MiB)")
+    print(f"{'mode':<9}{'ready s':>9}{'rss/worker':>12}{'pss/worker':>12}{'private/worker':>16}{'total pss':>11}")
+    for mode in ("spawn", "no-freeze", "prefork"):
+        ready_s, average, total_pss = run(mode, args.workers, args.components)
+        print(f"{mode:<9}{ready_s:>9.1f}{average['rss'] / 1024:>12.1f}{average['pss'] / 1024:>12.1f}"
+              f"{average['private'] / 1024:>16.1f}{total_pss / 1024:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
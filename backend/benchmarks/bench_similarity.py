@@ -0,0 +1,97 @@
+"""
+Micro-benchmark: per-pair TF-IDF similarity vs one-pass batch similarity
+
+Scores one user text against 30 headlines (6 sources x 5 headlines, the
+shape of a full /verify run) both ways and checks the scores agree.
+
+With --global-idf it instead compares the per-call scores with those of the
+global IDF table at IDF_PATH over every headline pair, and counts the pairs
+whose verdict flips at the 0.6 verification threshold - check this before
+setting GLOBAL_IDF_ENABLED=1.
+
+Usage (from backend/):
+    python benchmarks/bench_similarity.py [--rounds 50] [--headlines 30] [--global-idf]
+"""
+
+import argparse
+import csv
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils import calculate_similarity, batch_similarity
+
+DATASET = os.path.join(os.path.dirname(__file__), '..', '..', 'politifact', 'politifact_fake.csv')
+
+
+def load_titles():
+    # tweet_ids can be a very long field
+    csv.field_size_limit(sys.maxsize)
+    with open(DATASET, newline='', encoding='utf-8') as f:
+        return [row['title'] for row in csv.DictReader(f) if row.get('title')]
+
+
+def time_it(fn, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        result = fn()
+    return (time.perf_counter() - started) / rounds, result
+
+
+def compare_global_idf(titles, threshold=0.6):
+    from idf import GlobalIDF, IDF_PATH
+
+    table = GlobalIDF(IDF_PATH)
+    random.seed(42)
+    pairs = [tuple(random.sample(titles, 2)) for _ in range(500)]
+    # Near-duplicates too, the pairs the threshold has to decide
+    pairs += [(title, title.split(':')[-1] + ' report') for title in titles[:500]]
+
+    per_call = np.array([calculate_similarity(a, b) for a, b in pairs])
+    vectors = [table.transform([a, b]) for a, b in pairs]
+    with_table = np.array([float(v[0].multiply(v[1]).sum()) for v in vectors])
+
+    flips = int(((per_call >= threshold) != (with_table >= threshold)).sum())
+    print(f"IDF table: {len(table)} terms, {table.meta.get('n_docs')} documents ({table.meta.get('source')})")
+    print(f"Pairs:                {len(pairs)}")
+    print(f"Mean score per-call:  {per_call.mean():.3f}   with table: {with_table.mean():.3f}")
+    print(f"Max abs difference:   {np.abs(per_call - with_table).max():.3f}")
+    print(f"Verdicts flipped at {threshold}: {flips}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rounds', type=int, default=50)
+    parser.add_argument('--headlines', type=int, default=30)
+    parser.add_argument('--global-idf', action='store_true', help="compare scores with the global IDF table")
+    args = parser.parse_args()
+
+    titles = load_titles()
+    if args.global_idf:
+        compare_global_idf(titles)
+        return
+    random.seed(42)
+    user_text = ' '.join(random.sample(titles, 3))
+    headlines = random.sample(titles, args.headlines)
+
+    per_pair, expected = time_it(
+        lambda: [calculate_similarity(user_text, h) for h in headlines], args.rounds
+    )
+    batched, actual = time_it(lambda: batch_similarity(user_text, headlines), args.rounds)
+
+    max_diff = max(abs(a - b) for a, b in zip(expected, actual))
+
+    print(f"Headlines per run: {len(headlines)}  rounds: {args.rounds}")
+    print(f"Per-pair fits:     {per_pair * 1000:8.2f} ms/run")
+    print(f"Batch (one pass):  {batched * 1000:8.2f} ms/run")
+    print(f"Speedup:           {per_pair / batched:8.1f}x")
+    print(f"Max score diff:    {max_diff:.2e}")
+
+
+if __name__ == "__main__":
+    main()
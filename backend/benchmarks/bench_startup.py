@@ -0,0 +1,93 @@
+"""
+Startup benchmark: unpickling model.pkl vs opening the memory-mapped fast-scorer artifact
+
+Starts --workers fresh processes per format, all holding the model at the same
+time (like uvicorn/gunicorn workers), and reports per worker the model load
+time and the memory the model adds over a worker with no model: RSS, PSS
+(shared pages split between the processes mapping them) and private pages,
+from /proc/self/smaps_rollup (Linux only). sklearn and numpy are imported in
+every worker, since the API imports them anyway.
+
+Usage (from backend/, after python ../export_fast_model.py):
+    python benchmarks/bench_startup.py [--workers 4]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+WORKER = r'''
+import json, os, sys, time
+sys.path.insert(0, {backend!r})
+import numpy, joblib
+import sklearn.pipeline, sklearn.linear_model, sklearn.feature_extraction.text
+import warnings
+warnings.simplefilter("ignore")
+
+def memory():
+    fields = {{}}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {{
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "private": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+    }}
+
+started = time.perf_counter()
+if {mode!r} == "pickle":
+    model = joblib.load(os.path.join({backend!r}, "model", "model.pkl"))
+elif {mode!r} == "mmap":
+    from fastmodel import FastScorer
+    model = FastScorer()
+if {mode!r} != "none":
+    model.predict_proba(["warm up the model with one prediction"])
+load_ms = (time.perf_counter() - started) * 1000
+
+print("ready", flush=True)
+sys.stdin.readline()  # wait until every worker has loaded
+print(json.dumps({{"load_ms": load_ms, **memory()}}), flush=True)
+'''
+
+
+def run(mode, workers):
+    script = WORKER.format(backend=BACKEND, mode=mode)
+    procs = [
+        subprocess.Popen([sys.executable, "-c", script], stdin=subprocess.PIPE,
+                         stdout=subprocess.PIPE, text=True)
+        for _ in range(workers)
+    ]
+    for proc in procs:
+        assert proc.stdout.readline().strip() == "ready"
+    results = []
+    for proc in procs:
+        proc.stdin.write("\n")
+        proc.stdin.flush()
+        results.append(json.loads(proc.stdout.readline()))
+        proc.wait()
+    return {key: sum(r[key] for r in results) / len(results) for key in results[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    baseline = run("none", args.workers)
+    print(f"{args.workers} workers, averages per worker (KiB over a worker without a model)")
+    print(f"{'format':<8}{'load ms':>9}{'rss':>8}{'pss':>8}{'private':>9}")
+    for mode in ("pickle", "mmap"):
+        r = run(mode, args.workers)
+        added = {key: r[key] - baseline[key] for key in ("rss", "pss", "private")}
+        print(f"{mode:<8}{r['load_ms']:>9.1f}{added['rss']:>8.0f}{added['pss']:>8.0f}{added['private']:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
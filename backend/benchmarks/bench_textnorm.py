@@ -0,0 +1,94 @@
+"""
+Micro-benchmark: the Flask demo's eight-pass `wordpre` chain vs textnorm
+
+Normalizes an article corpus three ways (wordpre per text, normalize per
+text, normalize_batch) and checks all three produce identical output. Uses
+Dataset/Fake.csv and Dataset/True.csv when present, otherwise builds
+article-length texts from the politifact titles.
+
+Usage (from backend/):
+    python benchmarks/bench_textnorm.py [--articles 5000]
+"""
+
+import argparse
+import csv
+import os
+import random
+import re
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from textnorm import normalize, normalize_batch
+
+ROOT = os.path.join(os.path.dirname(__file__), '..', '..')
+POLITIFACT = os.path.join(ROOT, 'politifact', 'politifact_fake.csv')
+
+
+def wordpre(text):
+    """The original chain from `Model deployment using Flask/app.py`"""
+    text = text.lower()
+    text = re.sub(r'\[.*?\]', '', text)
+    text = re.sub("\\W", " ", text)
+    text = re.sub(r'https?://\S+|www\.\S+', '', text)
+    text = re.sub('<.*?>+', '', text)
+    text = re.sub('[%s]' % re.escape(string.punctuation), '', text)
+    text = re.sub('\n', '', text)
+    text = re.sub(r'\w*\d\w*', '', text)
+    return text
+
+
+def load_articles(count):
+    # tweet_ids can be a very long field
+    csv.field_size_limit(sys.maxsize)
+
+    articles = []
+    for name in ('Fake.csv', 'True.csv'):
+        path = os.path.join(ROOT, 'Dataset', name)
+        if os.path.exists(path):
+            with open(path, newline='', encoding='utf-8') as f:
+                articles.extend(f"{row['title']} {row['text']}" for row in csv.DictReader(f))
+    if articles:
+        random.seed(42)
+        return random.sample(articles, min(count, len(articles)))
+
+    # No training data here: stitch ~40 headlines (plus a link and a caption) into each article
+    with open(POLITIFACT, newline='', encoding='utf-8') as f:
+        titles = [row['title'] for row in csv.DictReader(f) if row.get('title')]
+    random.seed(42)
+    return [
+        ' '.join(random.sample(titles, 40)) + f" [Photo: AP] Read more at https://example.com/{i}\n"
+        for i in range(count)
+    ]
+
+
+def time_it(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--articles', type=int, default=5000)
+    args = parser.parse_args()
+
+    articles = load_articles(args.articles)
+    size_mb = sum(len(a) for a in articles) / 1e6
+
+    chain, expected = time_it(lambda: [wordpre(a) for a in articles])
+    single, actual = time_it(lambda: [normalize(a) for a in articles])
+    batch, batched = time_it(lambda: normalize_batch(articles))
+
+    assert actual == expected and batched == expected, "normalizer output differs from wordpre"
+
+    print(f"Articles: {len(articles)}  ({size_mb:.1f} MB)")
+    print(f"wordpre (8 passes):  {chain * 1000:9.1f} ms")
+    print(f"normalize:           {single * 1000:9.1f} ms  ({chain / single:.1f}x)")
+    print(f"normalize_batch:     {batch * 1000:9.1f} ms  ({chain / batch:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
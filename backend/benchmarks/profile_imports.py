@@ -0,0 +1,85 @@
+"""
+Import-time profile of the API: what `import main` costs and when /predict can answer
+
+Runs a fresh interpreter with `python -X importtime`, imports main, sends the
+first /predict and reports: wall time to import and to the first prediction,
+the slowest modules imported directly (cumulative), time per top-level
+package (self time summed) and which heavy libraries were loaded at all -
+faiss, transformers, torch, sentence_transformers, openai and nltk should be
+absent until first use or the background warm-up.
+
+Usage (from backend/):
+    python benchmarks/profile_imports.py [--top 15]
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+HEAVY = ["sklearn", "scipy", "pandas", "nltk", "transformers", "torch", "sentence_transformers", "faiss", "openai"]
+
+CHILD = r'''
+import json, sys, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+response = TestClient(main.app).post("/predict", json={"text": "Officials confirmed the new budget on Monday"})
+predicted = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - started,
+    "first_predict_s": predicted - started,
+    "status": response.status_code,
+    "loaded": sorted(name for name in %r if name in sys.modules)
+}))
+''' % (HEAVY,)
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", CHILD], cwd=BACKEND,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        sys.exit(proc.stderr[-2000:])
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    direct = []
+    children = []
+    packages = defaultdict(int)
+    for match in LINE.finditer(proc.stderr):
+        self_us, cumulative_us, indent, name = int(match[1]), int(match[2]), len(match[3]), match[4]
+        packages[name.split(".")[0]] += self_us
+        # A module's imports are reported before it: collect depth-1 lines until main's own line
+        if indent == 3:
+            children.append((cumulative_us, name))
+        elif indent == 1:
+            if name == "main":
+                direct = children
+            children = []
+
+    print(f"import main:          {result['import_s'] * 1000:8.0f} ms")
+    print(f"first /predict ready: {result['first_predict_s'] * 1000:8.0f} ms (status {result['status']})")
+    print(f"heavy libraries loaded: {', '.join(result['loaded']) or 'none'}")
+
+    print(f"\nslowest modules imported by main (cumulative ms)")
+    for cumulative_us, name in sorted(direct, reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f}  {name}")
+
+    print(f"\ntime per top-level package (self ms)")
+    for name, self_us in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {self_us / 1000:8.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Result cache - Bounded LRU caches with per-entry TTL, keyed by normalized content hash,
+plus single-flight coalescing of identical in-flight work
+"""
+
+import asyncio
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+_WHITESPACE = re.compile(r'\s+')
+
+# Returned by TTLCache.get on a miss (None is a valid cached value)
+MISSING = object()
+
+
+def normalize_content(text: Optional[str]) -> str:
+    """
+    Normalize text for cache keys: unicode NFC, collapsed whitespace, trimmed
+    """
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFC", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def content_key(text: Optional[str], headline: Optional[str] = None, *extra: Any) -> str:
+    """
+    SHA-256 key over normalized text + headline (+ any extra parameters)
+    """
+    digest = hashlib.sha256()
+    for part in (text, headline):
+        digest.update(normalize_content(part).encode("utf-8"))
+        digest.update(b"\x00")
+    for part in extra:
+        digest.update(repr(part).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class TTLCache:
+    """
+    LRU cache with a size bound and per-entry expiry
+
+    With stale_ttl > 0 an entry stays servable for stale_ttl seconds after it
+    stops being fresh, so callers using lookup() can return it immediately
+    while they refresh it (stale-while-revalidate).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 300.0,
+        name: str = "cache",
+        stale_ttl: float = 0.0
+    ):
+        """
+        Args:
+            max_entries: Least recently used entries are evicted beyond this
+            ttl: Default time-to-live in seconds
+            name: Label used in stats output
+            stale_ttl: Extra seconds an expired entry may still be served stale
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.name = name
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Any:
+        """Return the cached value if fresh, else MISSING"""
+        value, fresh = self.lookup(key, allow_stale=False)
+        return value
+
+    def lookup(self, key: str, allow_stale: bool = True) -> Tuple[Any, bool]:
+        """
+        Return (value, is_fresh); value is MISSING when absent or fully expired
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING, False
+
+            value, fresh_until, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return MISSING, False
+
+            if fresh_until <= now:
+                if not allow_stale:
+                    self.misses += 1
+                    return MISSING, False
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                return value, False
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value, True
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, stale_ttl: Optional[float] = None):
+        """Store a value, evicting the least recently used entries if full"""
+        fresh_until = time.monotonic() + (self.ttl if ttl is None else ttl)
+        expires_at = fresh_until + (self.stale_ttl if stale_ttl is None else stale_ttl)
+        with self._lock:
+            self._entries[key] = (value, fresh_until, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: str):
+        """Drop a single entry"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        """Get cache statistics"""
+        served = self.hits + self.stale_hits
+        lookups = served + self.misses
+        return {
+            "name": self.name,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "stale_ttl_seconds": self.stale_ttl,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": round(served / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key onto one in-flight task
+
+    The first caller (leader) starts the work; callers arriving while it is
+    still running await the same task instead of repeating it. A caller
+    being cancelled doesn't affect the others, but when the last one waiting
+    is cancelled the task is cancelled too, so abandoned work stops.
+    """
+
+    def __init__(self, name: str = "flight"):
+        self.name = name
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._waiters: Dict[asyncio.Future, int] = {}
+
+        self.leaders = 0
+        self.collapsed = 0
+        self.cancelled = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn() for key, or join the call already running for it"""
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(key)
+
+        if task is not None and not task.done() and task.get_loop() is loop:
+            self.collapsed += 1
+        else:
+            self.leaders += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            # Shield so one caller being cancelled doesn't cancel the work for the others
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[task] == 1 and not task.done():
+                task.cancel()
+                self.cancelled += 1
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+
+    def _forget(self, key: str, task: asyncio.Future):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def stats(self) -> Dict:
+        """Get coalescing statistics"""
+        calls = self.leaders + self.collapsed
+        return {
+            "name": self.name,
+            "in_flight": len(self._inflight),
+            "executed": self.leaders,
+            "collapsed": self.collapsed,
+            "cancelled": self.cancelled,
+            "collapse_rate": round(self.collapsed / calls, 4) if calls else 0.0
+        }
@@ -0,0 +1,211 @@
+"""
+Cascade classifier - Cheap model first, a transformer only for the uncertain band
+
+The logistic-regression model answers a text in microseconds, but on short
+headlines its P(REAL) often sits close to 0.5. With CASCADE_ENABLED=1, the
+fast tier still scores every text, and only the ones whose P(REAL) falls
+inside [CASCADE_BAND_LOW, CASCADE_BAND_HIGH] are escalated to CASCADE_MODEL,
+a HuggingFace text-classification model run on CPU. Escalated texts from
+concurrent requests go through one MicroBatcher, so the transformer runs a
+single forward pass per window. Average latency stays close to the fast path
+as long as the escalation rate is low; stats() reports it.
+
+transformers is imported when the classifier is first needed. If it (or the
+model) can't be loaded, escalated texts keep the fast tier's answer and are
+counted as fallbacks.
+"""
+
+import asyncio
+import importlib.util
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from batching import MicroBatcher
+from executors import run_in_thread
+
+TRANSFORMERS_AVAILABLE = importlib.util.find_spec("transformers") is not None
+
+CASCADE_ENABLED = os.environ.get("CASCADE_ENABLED", "0") == "1"
+CASCADE_MODEL = os.environ.get("CASCADE_MODEL", "hamzab/roberta-fake-news-classification")
+
+# Fast-tier P(REAL) inside this band is escalated
+CASCADE_BAND_LOW = float(os.environ.get("CASCADE_BAND_LOW", 0.4))
+CASCADE_BAND_HIGH = float(os.environ.get("CASCADE_BAND_HIGH", 0.6))
+
+# Labels of CASCADE_MODEL that mean "real"; every other label counts as fake
+CASCADE_REAL_LABELS = {
+    label.strip().upper()
+    for label in os.environ.get("CASCADE_REAL_LABELS", "TRUE,REAL,LABEL_1").split(",")
+    if label.strip()
+}
+
+CASCADE_BATCH_WINDOW_MS = float(os.environ.get("CASCADE_BATCH_WINDOW_MS", 10))
+CASCADE_BATCH_MAX = int(os.environ.get("CASCADE_BATCH_MAX", 16))
+
+# (label, confidence), label 0 = Fake, 1 = Real
+Score = Tuple[int, float]
+
+
+def p_real(label: int, confidence: float) -> float:
+    """Probability of REAL from a (label, confidence) answer"""
+    return confidence if label == 1 else 1.0 - confidence
+
+
+class TransformerClassifier:
+    """
+    Second tier: a sequence-classification model through the transformers pipeline
+    """
+
+    def __init__(self, model_name: str = CASCADE_MODEL, real_labels=CASCADE_REAL_LABELS,
+                 batch_size: int = CASCADE_BATCH_MAX):
+        from transformers import pipeline
+
+        print(f"Loading cascade classifier: {model_name}...")
+        self.model_name = model_name
+        self.real_labels = set(real_labels)
+        self.batch_size = batch_size
+        self.pipeline = pipeline(
+            "text-classification",
+            model=model_name,
+            device=-1,  # CPU
+            truncation=True
+        )
+        print(f"✓ Cascade classifier loaded: {model_name}")
+
+    def classify(self, texts: List[str]) -> List[Score]:
+        """Score a batch in one pipeline call; probabilities of every 'real' label are summed"""
+        outputs = self.pipeline(list(texts), batch_size=self.batch_size, top_k=None)
+        scores = []
+        for labels in outputs:
+            real = sum(item["score"] for item in labels if item["label"].upper() in self.real_labels)
+            scores.append((1, real) if real >= 0.5 else (0, 1.0 - real))
+        return scores
+
+
+class Cascade:
+    """
+    Decides which fast-tier answers to escalate and runs them through the second tier
+    """
+
+    def __init__(
+        self,
+        classifier_factory: Optional[Callable[[], object]] = None,
+        low: float = CASCADE_BAND_LOW,
+        high: float = CASCADE_BAND_HIGH,
+        enabled: bool = CASCADE_ENABLED,
+        window_ms: float = CASCADE_BATCH_WINDOW_MS,
+        max_batch: int = CASCADE_BATCH_MAX
+    ):
+        """
+        Args:
+            classifier_factory: Builds the second tier, an object with
+                classify(texts) -> [(label, confidence)]; defaults to
+                TransformerClassifier(CASCADE_MODEL)
+            low, high: Fast-tier P(REAL) band that gets escalated
+            enabled: When False every answer stays on the fast tier
+        """
+        self.classifier_factory = classifier_factory or TransformerClassifier
+        self.low = low
+        self.high = high
+        self.enabled = enabled
+        self.classifier = None
+        self.error: Optional[str] = None
+        self.batcher = MicroBatcher(self.classify, window_ms=window_ms, max_batch=max_batch,
+                                    name="cascade", runner=run_in_thread)
+        self._lock = threading.Lock()
+
+        self.scored = 0
+        self.escalated = 0
+        self.fallbacks = 0
+        self.heavy_seconds = 0.0
+
+    def uncertain(self, label: int, confidence: float) -> bool:
+        """Whether a fast-tier answer falls in the escalation band"""
+        return self.enabled and self.low <= p_real(label, confidence) <= self.high
+
+    def load(self):
+        """Create the second tier once; None (and self.error set) if it can't load"""
+        if self.classifier is None and self.error is None:
+            with self._lock:
+                if self.classifier is None and self.error is None:
+                    if self.classifier_factory is TransformerClassifier and not TRANSFORMERS_AVAILABLE:
+                        self.error = "transformers not installed"
+                    else:
+                        try:
+                            self.classifier = self.classifier_factory()
+                        except Exception as e:
+                            self.error = str(e)
+                    if self.error:
+                        print(f"⚠️ Cascade classifier unavailable, fast tier answers everything: {self.error}")
+        return self.classifier
+
+    def classify(self, texts: List[str]) -> List[Optional[Score]]:
+        """
+        Second-tier answers for a batch (blocking; the batcher runs it on a
+        worker thread). None for every text when the tier is unavailable.
+        """
+        classifier = self.load()
+        if classifier is not None:
+            started = time.perf_counter()
+            try:
+                scores = classifier.classify(texts)
+                self.heavy_seconds += time.perf_counter() - started
+                return scores
+            except Exception as e:
+                print(f"⚠️ Cascade classifier failed: {e}")
+
+        self.fallbacks += len(texts)
+        return [None] * len(texts)
+
+    async def refine(self, texts: List[str], scores: List[Score]) -> List[Optional[Score]]:
+        """
+        Escalate the uncertain fast-tier scores
+
+        Returns the second tier's answer for each escalated text, and None
+        where the fast answer stands (confident, or the second tier failed).
+        """
+        answers: List[Optional[Score]] = [None] * len(texts)
+        self.scored += len(texts)
+        if not self.enabled:
+            return answers
+
+        uncertain = [i for i, (label, confidence) in enumerate(scores) if self.uncertain(label, confidence)]
+        self.escalated += len(uncertain)
+        heavy = await asyncio.gather(*(self.batcher.submit(texts[i]) for i in uncertain))
+        for i, answer in zip(uncertain, heavy):
+            answers[i] = answer
+        return answers
+
+    def stats(self) -> Dict:
+        """Get escalation rate and second-tier state"""
+        answered = self.escalated - self.fallbacks
+        return {
+            "enabled": self.enabled,
+            "model": getattr(self.classifier, "model_name", CASCADE_MODEL),
+            "loaded": self.classifier is not None,
+            "error": self.error,
+            "band": [self.low, self.high],
+            "scored": self.scored,
+            "escalated": self.escalated,
+            "escalation_rate": round(self.escalated / self.scored, 4) if self.scored else 0.0,
+            "fallbacks": self.fallbacks,
+            "answered_by": {"fast": self.scored - answered, "transformer": answered},
+            "avg_heavy_ms_per_text": round(self.heavy_seconds * 1000 / answered, 2) if answered > 0 else 0.0,
+            "batching": self.batcher.stats()
+        }
+
+
+_cascade: Optional[Cascade] = None
+_cascade_lock = threading.Lock()
+
+
+def get_cascade() -> Cascade:
+    """Get or create the shared cascade"""
+    global _cascade
+    if _cascade is None:
+        with _cascade_lock:
+            if _cascade is None:
+                _cascade = Cascade()
+    return _cascade
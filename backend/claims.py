@@ -4,11 +4,31 @@ Claims extraction module - Extract verifiable claims from articles
 
 import re
 from typing import List, Dict
-from utils import clean_text
-import nltk
+from utils import clean_text, as_document, as_text, Document, TextLike
+from matcher import get_matcher
 
 
-def extract_claims(text: str) -> List[Dict]:
+# One lexicon for everything claims.py looks for in a sentence, matched in a single pass
+CLAIM_SENTENCE_LEXICON = {
+    'indicator': [
+        'announced', 'stated', 'confirmed', 'revealed', 'reported',
+        'said', 'according to', 'claims that', 'alleges', 'died',
+        'killed', 'arrested', 'passed away', 'discovered', 'found',
+        'launched', 'signed', 'approved', 'rejected', 'banned'
+    ],
+    'prediction': ['will', 'would', 'expect', 'predict', 'likely'],
+    'opinion': ['should', 'must', 'need to', 'ought'],
+    'death': ['died', 'killed', 'death', 'passed away'],
+    'policy': ['law', 'policy', 'bill', 'signed', 'approved']
+}
+CLAIM_KIND_ORDER = ('prediction', 'opinion', 'death', 'policy')
+
+
+def _sentence_matcher():
+    return get_matcher("claim_sentence", CLAIM_SENTENCE_LEXICON)
+
+
+def extract_claims(text: TextLike) -> List[Dict]:
     """
     Extract major claims from article text
     
@@ -18,26 +38,34 @@ def extract_claims(text: str) -> List[Dict]:
         - type: claim type (factual, opinion, prediction, etc.)
         - entities: Named entities mentioned
         - verification_query: Suggested search query
+        - sentence_index, start, end: Where the claim sits in the text
     """
+    doc = as_document(text)
+    claims = doc.memo("claims", lambda: _extract_claims(doc))
+    
+    # Copies, so callers (e.g. rank_claims_by_importance) can't alter the memoized view
+    return [dict(claim) for claim in claims]
+
+
+def _extract_claims(doc: Document) -> List[Dict]:
+    text = doc.text
     if not text or len(text.strip()) < 50:
         return []
     
-    # Split into sentences
-    sentences = re.split(r'(?<=[.!?])\s+', text)
+    # Sentence spans (shared with summarization); each sentence is sliced as it is visited
+    spans = doc.sentence_spans
     
     claims = []
-    claim_indicators = [
-        'announced', 'stated', 'confirmed', 'revealed', 'reported',
-        'said', 'according to', 'claims that', 'alleges', 'died',
-        'killed', 'arrested', 'passed away', 'discovered', 'found',
-        'launched', 'signed', 'approved', 'rejected', 'banned'
-    ]
+    matcher = _sentence_matcher()
     
-    for i, sentence in enumerate(sentences):
-        sentence_lower = sentence.lower()
+    for i, (start, end) in enumerate(spans.tolist()):
+        sentence = text[start:end]
+        
+        # Indicator and claim-type terms found in one pass over the sentence
+        found = matcher.categories(sentence)
         
         # Check if sentence contains claim indicators
-        has_indicator = any(indicator in sentence_lower for indicator in claim_indicators)
+        has_indicator = 'indicator' in found
         
         # Check for quotes (often claims)
         has_quote = '"' in sentence or '"' in sentence or "'" in sentence
@@ -49,15 +77,20 @@ def extract_claims(text: str) -> List[Dict]:
         is_claim = has_indicator or has_quote or (has_number and len(sentence.split()) > 5)
         
         if is_claim and len(sentence.split()) >= 5:
-            claim_type = determine_claim_type(sentence)
+            claim_type = _claim_kind(sentence, found)
             entities = extract_entities_simple(sentence)
             
+            claim = sentence.strip()
+            start += len(sentence) - len(sentence.lstrip())
+            
             claims.append({
-                "claim": sentence.strip(),
+                "claim": claim,
                 "type": claim_type,
                 "entities": entities,
                 "verification_query": build_verification_query(sentence, entities),
-                "sentence_index": i
+                "sentence_index": i,
+                "start": start,
+                "end": start + len(claim)
             })
     
     # Limit to top 10 claims
@@ -66,19 +99,14 @@ def extract_claims(text: str) -> List[Dict]:
 
 def determine_claim_type(sentence: str) -> str:
     """Classify claim type"""
-    sentence_lower = sentence.lower()
-    
-    if any(word in sentence_lower for word in ['will', 'would', 'expect', 'predict', 'likely']):
-        return 'prediction'
-    
-    if any(word in sentence_lower for word in ['should', 'must', 'need to', 'ought']):
-        return 'opinion'
-    
-    if any(word in sentence_lower for word in ['died', 'killed', 'death', 'passed away']):
-        return 'death'
-    
-    if any(word in sentence_lower for word in ['law', 'policy', 'bill', 'signed', 'approved']):
-        return 'policy'
+    return _claim_kind(sentence, _sentence_matcher().categories(sentence))
+
+
+def _claim_kind(sentence: str, found) -> str:
+    """Claim type from the lexicon categories already found in the sentence"""
+    for kind in CLAIM_KIND_ORDER:
+        if kind in found:
+            return kind
     
     if re.search(r'\d+', sentence):
         return 'statistical'
@@ -86,11 +114,12 @@ def determine_claim_type(sentence: str) -> str:
     return 'factual'
 
 
-def extract_entities_simple(text: str) -> List[str]:
+def extract_entities_simple(text: TextLike) -> List[str]:
     """
     Simple entity extraction using patterns
     (In production, use spaCy or NER model)
     """
+    text = as_text(text)
     entities = []
     
     # Capitalized sequences (likely names/places)
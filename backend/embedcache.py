@@ -0,0 +1,337 @@
+"""
+Embedding cache - Content-addressed vectors, an LRU in memory and a memory-mapped matrix on disk
+
+EmbeddingGenerator.embed runs the encoder on every text it is given, for
+VectorStore.add and for every search query, although questions, RAG
+queries and re-ingested articles recur. Vectors are keyed by
+sha256(model id, normalized text) (cache.content_key), so a different
+embedding model never reads another model's vectors.
+
+Lookups go to an LRU in memory first (EMBED_CACHE_MEMORY_ENTRIES), then to
+the disk tier, and only the remaining texts are encoded, in one call. Each
+model gets a directory under EMBED_CACHE_PATH holding:
+
+    vectors.f32   float32 rows, appended, read through np.memmap
+    keys.bin      the 32-byte key of each row, in the same order (the key index)
+    meta.json     model id and dimension
+
+Rows are appended under an exclusive flock, so pre-forked workers share one
+cache; a process that misses first picks up the rows others appended. Once
+the disk tier holds EMBED_CACHE_MAX_ROWS rows, it is rewritten keeping the
+newest half.
+"""
+
+import json
+import math
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from cache import TTLCache, MISSING, content_key
+
+try:
+    import fcntl
+except ImportError:  # Windows: single process, the thread lock is enough
+    fcntl = None
+
+EMBED_CACHE_ENABLED = os.environ.get("EMBED_CACHE_ENABLED", "1") == "1"
+EMBED_CACHE_PATH = os.environ.get("EMBED_CACHE_PATH", ".embedcache")
+EMBED_CACHE_MEMORY_ENTRIES = int(os.environ.get("EMBED_CACHE_MEMORY_ENTRIES", 4096))
+EMBED_CACHE_MAX_ROWS = int(os.environ.get("EMBED_CACHE_MAX_ROWS", 100000))
+
+VECTORS_FILE = "vectors.f32"
+KEYS_FILE = "keys.bin"
+META_FILE = "meta.json"
+KEY_BYTES = 32
+
+
+def embedding_key(model_id: str, text: str) -> bytes:
+    """32-byte key of a text's vector under one embedding model"""
+    return bytes.fromhex(content_key(text, None, model_id))
+
+
+class DiskEmbeddingStore:
+    """
+    Append-only float32 matrix plus key index for one embedding model
+    """
+
+    def __init__(self, path: str, model_id: str, max_rows: int = EMBED_CACHE_MAX_ROWS):
+        self.model_id = model_id
+        self.path = os.path.join(path, re.sub(r"[^A-Za-z0-9_.-]+", "_", model_id))
+        self.max_rows = max(2, max_rows)
+        os.makedirs(self.path, exist_ok=True)
+
+        self.dim: Optional[int] = None
+        self.index: Dict[bytes, int] = {}
+        self.rows = 0
+        self.compactions = 0
+        self._keys_id = None
+        self._vectors: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+        with self._file_lock(exclusive=False):
+            self._reload()
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """flock shared between processes (the thread lock is held by the caller)"""
+        if fcntl is None:
+            yield
+            return
+        with open(self._file("lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _stat_keys(self):
+        try:
+            st = os.stat(self._file(KEYS_FILE))
+            return (st.st_dev, st.st_ino), st.st_size
+        except FileNotFoundError:
+            return None, 0
+
+    def _reload(self):
+        """Read the key index and map the matrix (under the file lock)"""
+        if self.dim is None and os.path.exists(self._file(META_FILE)):
+            with open(self._file(META_FILE)) as f:
+                meta = json.load(f)
+            if meta.get("model_id") != self.model_id:
+                raise ValueError(f"{self.path} holds vectors of {meta.get('model_id')}, not {self.model_id}")
+            self.dim = int(meta["dim"])
+
+        self._keys_id, size = self._stat_keys()
+        keys = b""
+        if self._keys_id is not None:
+            with open(self._file(KEYS_FILE), "rb") as f:
+                keys = f.read(size - size % KEY_BYTES)
+
+        rows = len(keys) // KEY_BYTES
+        if self.dim and os.path.exists(self._file(VECTORS_FILE)):
+            # A row whose key was written but not its vector (interrupted append) doesn't count
+            rows = min(rows, os.path.getsize(self._file(VECTORS_FILE)) // (self.dim * 4))
+        else:
+            rows = 0
+
+        self.index = {keys[i * KEY_BYTES:(i + 1) * KEY_BYTES]: i for i in range(rows)}
+        self.rows = rows
+        self._map()
+
+    def _map(self):
+        self._vectors = (
+            np.memmap(self._file(VECTORS_FILE), dtype=np.float32, mode="r", shape=(self.rows, self.dim))
+            if self.rows else None
+        )
+
+    def _refresh(self):
+        """Pick up rows appended (or a compaction done) by other processes"""
+        keys_id, size = self._stat_keys()
+        if keys_id != self._keys_id or size // KEY_BYTES > self.rows:
+            with self._file_lock(exclusive=False):
+                self._reload()
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        """Vectors found on disk, by key"""
+        with self._lock:
+            if any(key not in self.index for key in keys):
+                self._refresh()
+            return {
+                key: np.array(self._vectors[self.index[key]])
+                for key in keys if key in self.index
+            }
+
+    def put_many(self, keys: List[bytes], vectors: np.ndarray):
+        """Append the vectors of keys not stored yet, compacting first when full"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock, self._file_lock(exclusive=True):
+            if self._stat_keys() != (self._keys_id, self.rows * KEY_BYTES):
+                self._reload()
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                with open(self._file(META_FILE), "w") as f:
+                    json.dump({"model_id": self.model_id, "dim": self.dim}, f)
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Expected {self.dim}-dimensional vectors, got {vectors.shape[1]}")
+
+            new = {}
+            for key, vector in zip(keys, vectors):
+                if key not in self.index:
+                    new[key] = vector
+            if not new:
+                return
+            new_keys = list(new)[-self.max_rows:]
+
+            if self.rows + len(new_keys) > self.max_rows:
+                self._compact(max(0, self.max_rows // 2 - len(new_keys)))
+
+            # Vectors before keys: an interrupted append leaves an unindexed row that gets overwritten
+            for name, data, width in (
+                (VECTORS_FILE, np.stack([new[key] for key in new_keys]).tobytes(), self.dim * 4),
+                (KEYS_FILE, b"".join(new_keys), KEY_BYTES)
+            ):
+                with open(self._file(name), "r+b" if os.path.exists(self._file(name)) else "wb") as f:
+                    f.seek(self.rows * width)
+                    f.write(data)
+                    f.truncate()
+
+            for i, key in enumerate(new_keys):
+                self.index[key] = self.rows + i
+            self.rows += len(new_keys)
+            self._keys_id, _ = self._stat_keys()
+            self._map()
+
+    def _compact(self, keep: int):
+        """Rewrite both files with the newest `keep` rows (under the exclusive lock)"""
+        start = self.rows - keep
+        keys = sorted(self.index, key=self.index.get)[start:]
+        vectors = np.array(self._vectors[start:]) if keep else np.empty((0, self.dim), dtype=np.float32)
+        for name, data in ((VECTORS_FILE, vectors.tobytes()), (KEYS_FILE, b"".join(keys))):
+            tmp = self._file(name + ".tmp")
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._file(name))
+
+        self.index = {key: i for i, key in enumerate(keys)}
+        self.rows = keep
+        self.compactions += 1
+        self._map()
+
+    def stats(self) -> Dict:
+        return {
+            "path": self.path,
+            "rows": self.rows,
+            "max_rows": self.max_rows,
+            "dimension": self.dim,
+            "bytes": self.rows * (self.dim or 0) * 4 + self.rows * KEY_BYTES,
+            "compactions": self.compactions
+        }
+
+
+class EmbeddingCache:
+    """
+    Memory LRU in front of the disk store for one embedding model
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        path: Optional[str] = EMBED_CACHE_PATH,
+        memory_entries: int = EMBED_CACHE_MEMORY_ENTRIES,
+        max_rows: int = EMBED_CACHE_MAX_ROWS
+    ):
+        """
+        Args:
+            model_id: Embedding model the vectors belong to (part of every key)
+            path: Directory of the disk tier; empty or None (or a directory that
+                can't be opened) keeps only the memory tier
+            memory_entries: Vectors kept in the in-memory LRU
+            max_rows: Size cap of the disk tier
+        """
+        self.model_id = model_id
+        self.memory = TTLCache(memory_entries, ttl=math.inf, name="embeddings")
+        self.disk: Optional[DiskEmbeddingStore] = None
+        if path:
+            try:
+                self.disk = DiskEmbeddingStore(path, model_id, max_rows)
+            except (OSError, ValueError) as e:
+                # Unwritable path or another model's files: embeddings still work, memory tier only
+                print(f"⚠️ Embedding cache disk tier unavailable, using memory only: {e}")
+
+        self.lookups = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.encoded = 0
+
+    def get_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Cached vector of each text, None where it has to be encoded"""
+        keys = [embedding_key(self.model_id, text) for text in texts]
+        found: List[Optional[np.ndarray]] = []
+        for key in keys:
+            vector = self.memory.get(key)
+            found.append(None if vector is MISSING else vector)
+        self.lookups += len(texts)
+        self.memory_hits += sum(vector is not None for vector in found)
+
+        missing = [i for i, vector in enumerate(found) if vector is None]
+        if self.disk is not None and missing:
+            on_disk = self.disk.get_many([keys[i] for i in missing])
+            for i in missing:
+                vector = on_disk.get(keys[i])
+                if vector is not None:
+                    found[i] = vector
+                    self.memory.set(keys[i], vector)
+            self.disk_hits += len(on_disk)
+        return found
+
+    def put_many(self, texts: List[str], vectors: np.ndarray):
+        """Store freshly encoded vectors in both tiers"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        keys = [embedding_key(self.model_id, text) for text in texts]
+        for key, vector in zip(keys, vectors):
+            self.memory.set(key, vector.copy())
+        self.encoded += len(texts)
+        if self.disk is not None:
+            try:
+                self.disk.put_many(keys, vectors)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Embedding cache write failed: {e}")
+
+    def stats(self) -> Dict:
+        """Get per-tier hit counts and the disk tier's size"""
+        # Share of texts that didn't go through the encoder (repeats within one call included)
+        served = self.lookups - self.encoded
+        return {
+            "model_id": self.model_id,
+            "lookups": self.lookups,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "encoded": self.encoded,
+            "hit_rate": round(served / self.lookups, 4) if self.lookups else 0.0,
+            "memory": {
+                "entries": len(self.memory),
+                "max_entries": self.memory.max_entries,
+                "evictions": self.memory.evictions
+            },
+            "disk": self.disk.stats() if self.disk is not None else None
+        }
+
+
+class CachedEmbeddingGenerator:
+    """
+    EmbeddingGenerator interface that only encodes texts missing from the cache
+    """
+
+    def __init__(self, generator, cache: EmbeddingCache):
+        self.generator = generator
+        self.cache = cache
+        self.method = generator.method
+        self.model_id = cache.model_id
+
+    def embed(self, text: Union[str, List[str]]) -> np.ndarray:
+        texts = [text] if isinstance(text, str) else list(text)
+        if not texts:
+            return self.generator.embed(texts)
+
+        vectors = self.cache.get_many(texts)
+        # Each distinct missing text is encoded once, all of them in one call
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, vectors) if vector is None))
+        if missing:
+            encoded = np.asarray(self.generator.embed(missing), dtype=np.float32)
+            self.cache.put_many(missing, encoded)
+            fresh = dict(zip(missing, encoded))
+            vectors = [fresh[text] if vector is None else vector for text, vector in zip(texts, vectors)]
+        return np.stack(vectors)
+
+    def get_dimension(self) -> int:
+        return self.generator.get_dimension()
+
+    def stats(self) -> Dict:
+        return self.cache.stats()
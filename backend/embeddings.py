@@ -3,23 +3,25 @@ Embeddings module - Generate vector embeddings for text
 Supports OpenAI embeddings (if API key) or local SentenceTransformer
 """
 
+import importlib.util
 import os
+import threading
 from typing import List, Union
 import numpy as np
 
+# Backends are only looked up here; openai / sentence_transformers (and torch)
+# are imported when the generator is created
+
 # Try OpenAI first
-try:
-    import openai
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+OPENAI_AVAILABLE = importlib.util.find_spec("openai") is not None
 
 # Fallback to SentenceTransformer
-try:
+SENTENCE_TRANSFORMER_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
+
+
+def _sentence_transformer(name: str):
     from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMER_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMER_AVAILABLE = False
+    return SentenceTransformer(name)
 
 
 class EmbeddingGenerator:
@@ -39,10 +41,11 @@ class EmbeddingGenerator:
             # Try OpenAI first
             if OPENAI_AVAILABLE and os.getenv("OPENAI_API_KEY"):
                 self.method = "openai"
+                import openai
                 openai.api_key = os.getenv("OPENAI_API_KEY")
             elif SENTENCE_TRANSFORMER_AVAILABLE:
                 self.method = "sentence-transformer"
-                self.model = SentenceTransformer('all-MiniLM-L6-v2')
+                self.model = _sentence_transformer('all-MiniLM-L6-v2')
             else:
                 raise RuntimeError("No embedding model available")
         
@@ -51,12 +54,19 @@ class EmbeddingGenerator:
                 raise RuntimeError("OpenAI not installed")
             if not os.getenv("OPENAI_API_KEY"):
                 raise RuntimeError("OPENAI_API_KEY not set")
+            import openai
             openai.api_key = os.getenv("OPENAI_API_KEY")
         
         elif method == "sentence-transformer":
             if not SENTENCE_TRANSFORMER_AVAILABLE:
                 raise RuntimeError("sentence-transformers not installed")
-            self.model = SentenceTransformer('all-MiniLM-L6-v2')
+            self.model = _sentence_transformer('all-MiniLM-L6-v2')
+        
+        # Identifies the vectors this generator produces (embedding cache keys)
+        if self.method == "openai":
+            self.model_id = "openai:text-embedding-ada-002"
+        else:
+            self.model_id = "sentence-transformer:all-MiniLM-L6-v2"
         
         print(f"✓ Embeddings initialized with method: {self.method}")
     
@@ -80,6 +90,7 @@ class EmbeddingGenerator:
     
     def _embed_openai(self, texts: List[str]) -> np.ndarray:
         """OpenAI embeddings"""
+        import openai
         try:
             response = openai.Embedding.create(
                 input=texts,
@@ -110,15 +121,38 @@ class EmbeddingGenerator:
 
 # Global instance
 _embedding_generator = None
+_embedding_generator_lock = threading.Lock()
 
 def get_embedding_generator() -> EmbeddingGenerator:
-    """Get or create global embedding generator"""
+    """Get or create global embedding generator (once, even when warm-up and a request race)"""
     global _embedding_generator
     if _embedding_generator is None:
-        _embedding_generator = EmbeddingGenerator(method="auto")
+        with _embedding_generator_lock:
+            if _embedding_generator is None:
+                from model_server import MODEL_SERVER_SOCKET, RemoteEmbeddingGenerator
+                from embedcache import EMBED_CACHE_ENABLED, CachedEmbeddingGenerator, EmbeddingCache
+                # With a model server the embedding model lives there, not in every worker
+                if MODEL_SERVER_SOCKET:
+                    try:
+                        generator = RemoteEmbeddingGenerator()
+                    except RuntimeError as e:
+                        print(f"⚠️ {e}; loading embeddings in-process")
+                        generator = EmbeddingGenerator(method="auto")
+                else:
+                    generator = EmbeddingGenerator(method="auto")
+                # Repeated texts are served from the cache instead of the encoder
+                if EMBED_CACHE_ENABLED:
+                    generator = CachedEmbeddingGenerator(generator, EmbeddingCache(generator.model_id))
+                _embedding_generator = generator
     return _embedding_generator
 
 
+def embedding_cache_stats():
+    """Embedding cache statistics; None before embeddings are first used or with the cache off"""
+    stats = getattr(_embedding_generator, "stats", None)
+    return stats() if stats else None
+
+
 def embed_text(text: Union[str, List[str]]) -> np.ndarray:
     """Convenience function to embed text"""
     generator = get_embedding_generator()
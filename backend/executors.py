@@ -0,0 +1,109 @@
+"""
+Executor layer - Keep CPU-bound work off the asyncio event loop
+
+Thread pool: work that releases the GIL (sklearn/numpy, FAISS, torch models).
+Process pool: pure-Python work that holds the GIL (HTML parsing, TF-IDF text processing).
+Set PROCESS_POOL_WORKERS=0 (default) to run "process" work on the thread pool instead.
+
+The process pool is off by default because serve.py already runs one
+worker process per CPU: a pool inside each of them would start
+workers x PROCESS_POOL_WORKERS processes competing for the same cores, and
+every task pickles its input (whole HTML pages) across a pipe. Turn it on
+for a single-process `uvicorn main:app`, e.g. PROCESS_POOL_WORKERS=<cores - 1>.
+"""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+
+THREAD_POOL_WORKERS = int(os.environ.get("THREAD_POOL_WORKERS", min(32, (os.cpu_count() or 1) + 4)))
+PROCESS_POOL_WORKERS = int(os.environ.get("PROCESS_POOL_WORKERS", 0))
+
+_thread_pool: Optional[ThreadPoolExecutor] = None
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+_stats = {
+    "thread_tasks": 0,
+    "process_tasks": 0,
+    "process_fallbacks": 0
+}
+
+
+def get_thread_pool() -> ThreadPoolExecutor:
+    """Get or create the shared thread pool"""
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = ThreadPoolExecutor(
+            max_workers=THREAD_POOL_WORKERS,
+            thread_name_prefix="cpu-worker"
+        )
+    return _thread_pool
+
+
+def get_process_pool() -> Optional[ProcessPoolExecutor]:
+    """Get or create the shared process pool (None when disabled)"""
+    global _process_pool
+    if PROCESS_POOL_WORKERS <= 0:
+        return None
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=PROCESS_POOL_WORKERS)
+    return _process_pool
+
+
+async def run_in_thread(fn: Callable, *args, **kwargs) -> Any:
+    """Run fn(*args, **kwargs) on the thread pool and await the result"""
+    loop = asyncio.get_running_loop()
+    _stats["thread_tasks"] += 1
+    return await loop.run_in_executor(get_thread_pool(), functools.partial(fn, *args, **kwargs))
+
+
+async def run_in_process(fn: Callable, *args, **kwargs) -> Any:
+    """
+    Run fn(*args, **kwargs) on the process pool and await the result
+
+    fn and its arguments must be picklable (module-level functions).
+    Falls back to the thread pool when the process pool is disabled or broken.
+    """
+    global _process_pool
+    pool = get_process_pool()
+    if pool is None:
+        return await run_in_thread(fn, *args, **kwargs)
+
+    loop = asyncio.get_running_loop()
+    _stats["process_tasks"] += 1
+    try:
+        return await loop.run_in_executor(pool, functools.partial(fn, *args, **kwargs))
+    except BrokenProcessPool:
+        # A worker died - shut the pool down (reaping the surviving workers)
+        # and drop it so the next call starts a fresh one
+        if _process_pool is pool:
+            print("⚠️ Process pool broken, recreating and running task on thread pool")
+            _process_pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+        _stats["process_fallbacks"] += 1
+        return await run_in_thread(fn, *args, **kwargs)
+
+
+def shutdown_executors(wait: bool = True):
+    """Shut down both pools (called on application shutdown)"""
+    global _thread_pool, _process_pool
+    if _thread_pool is not None:
+        _thread_pool.shutdown(wait=wait)
+        _thread_pool = None
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=wait)
+        _process_pool = None
+
+
+def executor_stats() -> Dict:
+    """Get executor configuration and task counters"""
+    return {
+        "thread_pool_workers": THREAD_POOL_WORKERS,
+        "process_pool_workers": PROCESS_POOL_WORKERS,
+        "process_pool_enabled": PROCESS_POOL_WORKERS > 0,
+        **_stats
+    }
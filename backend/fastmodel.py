@@ -0,0 +1,307 @@
+"""
+Fast model scorer - Pipeline-free inference for the bag-of-words classifier
+
+export_pipeline() turns a trained Pipeline(CountVectorizer -> TfidfTransformer
+-> LogisticRegression) into a compact artifact directory: the sorted
+vocabulary, IDF vector and coefficient vector as raw .npy arrays plus a small
+meta.json. The arrays are memory-mapped read-only, so every worker process
+shares one copy through the page cache and loading is a few file opens
+instead of unpickling the pipeline. FastScorer
+tokenizes with the vectorizer's own token pattern, looks terms up in a hash
+index built from the vocabulary array and applies the TF-IDF weighting, L2
+norm and logistic function directly - the arithmetic of
+predict_proba without sklearn's input validation or a sparse matrix.
+
+A mapped file must never be rewritten: truncating it under a running scorer
+kills the process with SIGBUS, and rewriting it at the same size silently
+changes the arrays under the scorer's term index. So each export goes to a
+new version directory inside the path (staged under a temporary name and
+renamed when complete), and the CURRENT file naming the active version is
+replaced atomically last. Running scorers keep reading the version they
+mapped; the two newest versions are kept. A path without CURRENT holds a
+single artifact directly (the layout of older exports).
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+FAST_MODEL_PATH = os.environ.get(
+    "FAST_MODEL_PATH", os.path.join(os.path.dirname(__file__), "model", "fast")
+)
+FAST_MODEL_ENABLED = os.environ.get("FAST_MODEL_ENABLED", "1") == "1"
+
+ARTIFACT_VERSION = 2
+
+TERMS_FILE = "terms.npy"
+IDF_FILE = "idf.npy"
+COEF_FILE = "coef.npy"
+META_FILE = "meta.json"
+CURRENT_FILE = "CURRENT"
+
+# Exported versions kept on disk; older ones are removed by the next export
+KEEP_VERSIONS = 2
+
+DEFAULT_TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def resolve_artifact(path: str = FAST_MODEL_PATH) -> str:
+    """Directory of the active artifact: the version CURRENT names, or path itself"""
+    try:
+        with open(os.path.join(path, CURRENT_FILE)) as f:
+            name = f.read().strip()
+    except FileNotFoundError:
+        return path
+    return os.path.join(path, name) if name else path
+
+
+def _prune_versions(path: str, current: str):
+    """Remove exported versions beyond the newest KEEP_VERSIONS (never the current one)"""
+    versions = sorted(name for name in os.listdir(path) if name.startswith("v") and
+                      os.path.isdir(os.path.join(path, name)))
+    for name in versions[:-KEEP_VERSIONS]:
+        if name != current:
+            # Unlinking is safe for a scorer that still maps the files; only rewriting isn't
+            shutil.rmtree(os.path.join(path, name), ignore_errors=True)
+
+
+def _unpack_pipeline(pipe):
+    """
+    Split a pipeline into (normalize, vectorizer, tfidf, classifier), raising
+    ValueError for anything FastScorer can't reproduce exactly
+    """
+    from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer, TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.preprocessing import FunctionTransformer
+
+    steps = [step for _, step in pipe.steps if step not in (None, "passthrough")]
+
+    normalize = False
+    if steps and isinstance(steps[0], FunctionTransformer):
+        from textnorm import normalize_batch
+        if steps[0].func is not normalize_batch or steps[0].inverse_func is not None:
+            raise ValueError("only the textnorm.normalize_batch FunctionTransformer is supported")
+        normalize = True
+        steps = steps[1:]
+
+    if len(steps) == 3 and isinstance(steps[0], CountVectorizer) and isinstance(steps[1], TfidfTransformer):
+        vectorizer, tfidf, classifier = steps
+    elif len(steps) == 2 and isinstance(steps[0], TfidfVectorizer):
+        vectorizer, classifier = steps
+        tfidf = vectorizer
+    else:
+        raise ValueError("expected CountVectorizer -> TfidfTransformer -> classifier (or TfidfVectorizer -> classifier)")
+
+    if not isinstance(classifier, LogisticRegression) or len(classifier.classes_) != 2:
+        raise ValueError("only binary LogisticRegression classifiers are supported")
+
+    unsupported = {
+        "analyzer": vectorizer.analyzer != "word",
+        "ngram_range": tuple(vectorizer.ngram_range) != (1, 1),
+        "tokenizer": vectorizer.tokenizer is not None,
+        "preprocessor": vectorizer.preprocessor is not None,
+        "strip_accents": vectorizer.strip_accents is not None,
+        "input": vectorizer.input != "content",
+        "norm": tfidf.norm not in ("l2", None)
+    }
+    bad = [name for name, flag in unsupported.items() if flag]
+    if bad:
+        raise ValueError(f"unsupported vectorizer settings: {', '.join(bad)}")
+
+    return normalize, vectorizer, tfidf, classifier
+
+
+def export_pipeline(pipe, path: str = FAST_MODEL_PATH, source: Optional[str] = None) -> Dict:
+    """
+    Write the compact inference artifact for a trained pipeline to a new
+    version in the path directory and make it the current one
+
+    source is the pickled pipeline the artifact was exported from; its hash is
+    recorded so a stale artifact is ignored after the pickle is replaced.
+    """
+    normalize, vectorizer, tfidf, classifier = _unpack_pipeline(pipe)
+
+    vocabulary = vectorizer.vocabulary_
+    terms = sorted(vocabulary)
+    columns = np.asarray([vocabulary[term] for term in terms], dtype=np.int64)
+    width = max((len(term) for term in terms), default=1)
+
+    idf = np.asarray(tfidf.idf_, dtype=np.float64)[columns] if tfidf.use_idf else np.ones(len(terms))
+    coef = np.asarray(classifier.coef_[0], dtype=np.float64)[columns]
+
+    meta = {
+        "version": ARTIFACT_VERSION,
+        "terms": len(terms),
+        "normalize": normalize,
+        "lowercase": bool(vectorizer.lowercase),
+        "token_pattern": vectorizer.token_pattern,
+        "binary": bool(vectorizer.binary),
+        "sublinear_tf": bool(tfidf.sublinear_tf),
+        "norm": tfidf.norm,
+        "intercept": float(classifier.intercept_[0]),
+        "classes": np.asarray(classifier.classes_).tolist(),
+        "source": os.path.basename(source) if source else None,
+        "source_sha256": file_sha256(source) if source else None
+    }
+
+    os.makedirs(path, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".export-", dir=path)
+    try:
+        np.save(os.path.join(staging, TERMS_FILE), np.asarray(terms, dtype=f"<U{width}"))
+        np.save(os.path.join(staging, IDF_FILE), idf)
+        np.save(os.path.join(staging, COEF_FILE), coef)
+        with open(os.path.join(staging, META_FILE), "w") as f:
+            json.dump(meta, f, indent=2)
+
+        # Complete: give it its version name, then point CURRENT at it in one rename
+        version = f"v{time.time_ns()}"
+        os.rename(staging, os.path.join(path, version))
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    pointer = os.path.join(path, f".{CURRENT_FILE}.{os.getpid()}")
+    with open(pointer, "w") as f:
+        f.write(version)
+    os.replace(pointer, os.path.join(path, CURRENT_FILE))
+
+    _prune_versions(path, version)
+    return meta
+
+
+class FastScorer:
+    """
+    Binary TF-IDF + logistic regression scorer over memory-mapped exported arrays
+
+    Drop-in for the pipeline where main.py uses it: predict_proba(texts) and
+    classes_ behave like the sklearn versions.
+    """
+
+    def __init__(self, path: str = FAST_MODEL_PATH):
+        # The version directory, not the path CURRENT is in: it never changes under us
+        path = resolve_artifact(path)
+        self.path = path
+        with open(os.path.join(path, META_FILE)) as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") != ARTIFACT_VERSION:
+            raise ValueError(f"unsupported fast model artifact version {self.meta.get('version')}")
+
+        self.terms = np.load(os.path.join(path, TERMS_FILE), mmap_mode="r")
+        self.idf = np.load(os.path.join(path, IDF_FILE), mmap_mode="r")
+        self.coef = np.load(os.path.join(path, COEF_FILE), mmap_mode="r")
+        self.intercept = float(self.meta["intercept"])
+        self.classes_ = np.asarray(self.meta["classes"])
+
+        # sklearn's default pattern; without the \\b anchors findall returns the
+        # same tokens (a match can only start mid-word if the word is 1 char) faster
+        pattern = self.meta["token_pattern"]
+        self._token = re.compile(r"\w\w+" if pattern == DEFAULT_TOKEN_PATTERN else pattern)
+
+        # Hash index over the vocabulary array: term -> column
+        self._index = {term: column for column, term in enumerate(self.terms.tolist())}
+        self._normalize = None
+        if self.meta["normalize"]:
+            from textnorm import normalize
+            self._normalize = normalize
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def _counts(self, text: str) -> Counter:
+        if self._normalize is not None:
+            text = self._normalize(text)
+        if self.meta["lowercase"]:
+            text = text.lower()
+        return Counter(self._token.findall(text))
+
+    def decision_function(self, texts: Sequence[str]) -> np.ndarray:
+        """Logit of the positive class (classes_[1]) for each text"""
+        index = self._index
+        columns: List[int] = []
+        tfs: List[int] = []
+        rows: List[int] = []
+
+        # Known terms of every text, looked up in the hash index; unknown terms contribute nothing
+        for row, text in enumerate(texts):
+            for term, count in self._counts(text).items():
+                column = index.get(term)
+                if column is not None:
+                    columns.append(column)
+                    tfs.append(count)
+                    rows.append(row)
+
+        scores = np.full(len(texts), self.intercept)
+        if not columns:
+            return scores
+
+        tf = np.asarray(tfs, dtype=np.float64)
+        if self.meta["binary"]:
+            tf[:] = 1.0
+        elif self.meta["sublinear_tf"]:
+            tf = np.log(tf) + 1.0
+
+        # Then one vectorized pass for the whole batch
+        weights = tf * self.idf[columns]
+        dot = np.bincount(rows, weights=weights * self.coef[columns], minlength=len(texts))
+        if self.meta["norm"] == "l2":
+            norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=len(texts)))
+            dot = np.divide(dot, norms, out=np.zeros_like(dot), where=norms > 0)
+        return scores + dot
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        """(n, 2) class probabilities in classes_ order, like LogisticRegression"""
+        positive = 1.0 / (1.0 + np.exp(-self.decision_function(texts)))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, texts: Sequence[str]) -> np.ndarray:
+        return self.classes_[(self.decision_function(texts) > 0).astype(int)]
+
+    def stats(self) -> Dict:
+        """Get artifact statistics"""
+        return {
+            "path": self.path,
+            "terms": len(self.terms),
+            "bytes": int(self.terms.nbytes + self.idf.nbytes + self.coef.nbytes),
+            "normalize": self.meta["normalize"],
+            "source": self.meta.get("source")
+        }
+
+
+def load_fast_scorer(source: Optional[str] = None, path: str = FAST_MODEL_PATH) -> Optional[FastScorer]:
+    """
+    Load the fast scorer if enabled and present; None otherwise
+
+    With source given, the artifact must have been exported from that exact
+    file - after the pickle is replaced the stale artifact is ignored and the
+    pipeline is used until it is exported again.
+    """
+    if not FAST_MODEL_ENABLED or not os.path.exists(os.path.join(resolve_artifact(path), META_FILE)):
+        return None
+
+    try:
+        scorer = FastScorer(path)
+        expected = scorer.meta.get("source_sha256")
+        if source and expected and os.path.exists(source) and file_sha256(source) != expected:
+            print(f"⚠️ Fast model {path} was exported from a different {os.path.basename(source)}; using the pipeline")
+            return None
+        print(f"✓ Fast model loaded: {len(scorer)} terms from {path}")
+        return scorer
+    except Exception as e:
+        print(f"⚠️ Fast model not loaded: {e}")
+        return None
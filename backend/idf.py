@@ -0,0 +1,202 @@
+"""
+Global IDF model - Corpus-level IDF weights shared by similarity and sentence scoring
+
+The table is built once from the training data (see build_idf.py) and stored
+as two .npy arrays: sorted fixed-width terms and their float32 IDF values.
+Both are memory-mapped, so every worker process shares the same pages and
+request-time vectorization is a lookup (np.searchsorted), never a fit.
+
+The table is off unless GLOBAL_IDF_ENABLED=1. Its IDF values differ from a
+per-call fit, so similarity scores shift against the 0.6 verification
+threshold, which was calibrated with the per-call fit; a table built from a
+small or one-sided corpus makes most terms out-of-vocabulary and inflates
+scores. Enable it only with a table built from the full training corpus,
+after re-checking the threshold (benchmarks/bench_similarity.py --global-idf).
+"""
+
+import json
+import os
+import threading
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# scipy and scikit-learn load with the table (or on the first build), not at import
+if TYPE_CHECKING:
+    from scipy.sparse import csr_matrix
+
+IDF_PATH = os.environ.get("IDF_PATH", os.path.join(os.path.dirname(__file__), "model", "idf"))
+GLOBAL_IDF_ENABLED = os.environ.get("GLOBAL_IDF_ENABLED", "0") == "1"
+
+# build_idf.py refuses smaller corpora: too few documents give an unrepresentative table
+IDF_MIN_DOCS = 10000
+
+TERMS_FILE = "terms.npy"
+VALUES_FILE = "idf.npy"
+META_FILE = "meta.json"
+
+# Same analysis as the per-request vectorizers in utils.py
+ANALYZER_PARAMS = {"stop_words": "english", "ngram_range": (1, 2), "lowercase": True}
+
+
+class GlobalIDF:
+    """
+    Read-only IDF table backed by memory-mapped arrays
+
+    Terms missing from the table get the IDF of a term seen in no document,
+    ln((1 + n) / 1) + 1, i.e. they are treated as maximally rare.
+    """
+
+    def __init__(self, path: str = IDF_PATH):
+        self.path = path
+        self.terms = np.load(os.path.join(path, TERMS_FILE), mmap_mode="r")
+        self.values = np.load(os.path.join(path, VALUES_FILE), mmap_mode="r")
+
+        with open(os.path.join(path, META_FILE)) as f:
+            self.meta = json.load(f)
+
+        self.n_docs = int(self.meta["n_docs"])
+        self.oov_idf = float(np.log(1.0 + self.n_docs) + 1.0)
+
+        from sklearn.feature_extraction.text import CountVectorizer
+        self._analyze = CountVectorizer(**ANALYZER_PARAMS).build_analyzer()
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def lookup(self, terms: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return (column, idf) arrays for terms: known terms map to their table row,
+        unknown terms get columns past the end of the table
+        """
+        if not terms:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+
+        query = np.asarray(terms, dtype=self.terms.dtype)
+        positions = np.searchsorted(self.terms, query)
+        in_range = positions < len(self.terms)
+
+        found = np.zeros(len(terms), dtype=bool)
+        found[in_range] = self.terms[positions[in_range]] == query[in_range]
+
+        # Terms longer than the table's fixed width are truncated by the cast above
+        width = self.terms.dtype.itemsize // 4
+        found &= np.fromiter(map(len, terms), dtype=np.int64, count=len(terms)) <= width
+
+        idf = np.full(len(terms), self.oov_idf, dtype=np.float64)
+        idf[found] = self.values[positions[found]]
+
+        columns = positions.astype(np.int64)
+        columns[~found] = len(self.terms) + np.arange(int((~found).sum()))
+        return columns, idf
+
+    def transform(self, texts: Iterable[str]) -> "csr_matrix":
+        """
+        L2-normalized TF-IDF rows for texts (transform only, no fitting)
+
+        Columns are table rows, so vectors from separate calls are comparable
+        for known terms; unknown terms share no column across calls.
+        """
+        from scipy.sparse import csr_matrix
+        from sklearn.preprocessing import normalize
+
+        doc_counts = [Counter(self._analyze(text or "")) for text in texts]
+
+        vocabulary: Dict[str, int] = {}
+        for counts in doc_counts:
+            for term in counts:
+                vocabulary.setdefault(term, len(vocabulary))
+
+        terms = list(vocabulary)
+        columns, idf = self.lookup(terms)
+
+        rows, cols, data = [], [], []
+        for row, counts in enumerate(doc_counts):
+            for term, count in counts.items():
+                local = vocabulary[term]
+                rows.append(row)
+                cols.append(columns[local])
+                data.append(count * idf[local])
+
+        width = int(columns.max()) + 1 if len(columns) else 1
+        matrix = csr_matrix(
+            (np.asarray(data, dtype=np.float64), (rows, cols)),
+            shape=(len(doc_counts), max(width, len(self.terms)))
+        )
+        return normalize(matrix, norm="l2", copy=False)
+
+    def stats(self) -> Dict:
+        """Get table statistics"""
+        return {
+            "path": self.path,
+            "terms": len(self.terms),
+            "n_docs": self.n_docs,
+            "term_width": self.terms.dtype.itemsize // 4,
+            "bytes": int(self.terms.nbytes + self.values.nbytes),
+            "source": self.meta.get("source")
+        }
+
+
+def build_idf(
+    texts: Iterable[str],
+    path: str = IDF_PATH,
+    min_df: int = 2,
+    max_features: Optional[int] = None,
+    source: str = ""
+) -> Dict:
+    """
+    Fit corpus IDF weights and write the memory-mappable table to path
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    vectorizer = TfidfVectorizer(min_df=min_df, max_features=max_features, **ANALYZER_PARAMS)
+    texts = list(texts)
+    vectorizer.fit(texts)
+
+    vocabulary = vectorizer.vocabulary_
+    terms = sorted(vocabulary)
+    width = max(len(term) for term in terms)
+    values = np.asarray([vectorizer.idf_[vocabulary[term]] for term in terms], dtype=np.float32)
+
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, TERMS_FILE), np.asarray(terms, dtype=f"<U{width}"))
+    np.save(os.path.join(path, VALUES_FILE), values)
+
+    meta = {
+        "n_docs": len(texts),
+        "terms": len(terms),
+        "min_df": min_df,
+        "max_features": max_features,
+        "source": source
+    }
+    with open(os.path.join(path, META_FILE), "w") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+_global_idf: Optional[GlobalIDF] = None
+_load_attempted = False
+_load_lock = threading.Lock()
+
+
+def get_global_idf() -> Optional[GlobalIDF]:
+    """
+    Get the shared IDF table, or None when it is disabled or no artifact
+    exists (callers then fall back to fitting TF-IDF per call)
+
+    Callers arriving while the table is being loaded (e.g. by the startup
+    warm-up) wait for it rather than taking the fallback.
+    """
+    global _global_idf, _load_attempted
+    if not _load_attempted:
+        with _load_lock:
+            if not _load_attempted:
+                if GLOBAL_IDF_ENABLED and os.path.exists(os.path.join(IDF_PATH, META_FILE)):
+                    try:
+                        _global_idf = GlobalIDF(IDF_PATH)
+                        print(f"✓ Global IDF loaded: {len(_global_idf)} terms from {IDF_PATH}")
+                    except Exception as e:
+                        print(f"⚠️ Global IDF not loaded: {e}")
+                _load_attempted = True
+    return _global_idf
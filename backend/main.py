@@ -1,21 +1,53 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-import joblib
+from contextlib import asynccontextmanager
+import asyncio
+import json
 import os
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 import time
 
 # Import custom modules
-from search import verify_with_sources
-from utils import extract_keywords, calculate_similarity, summarize_text, extract_key_sentences
-from summarize import get_summarizer
+from search import (
+    verify_with_sources, iter_source_results, aggregate_results,
+    close_http_session, http_pool_stats, search_cache_stats, coalescing_stats,
+    verification_stats
+)
+from resilience import source_health_stats
+from utils import Document, TextLike, extract_keywords, summarize_with_offsets
+from batching import batcher_from_env
+from executors import run_in_thread, run_in_process, shutdown_executors, executor_stats
+from cache import TTLCache, content_key, MISSING
+from idf import get_global_idf
+from registry import get_model_registry
+from warmup import get_warmup
+from model_server import get_model_server_client
+from cascade import get_cascade
+from embeddings import embedding_cache_stats
 import ai_tasks
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup: /predict is servable already; the IDF table, NLP resources (and
+    # optionally the summarizer/embeddings) load in the background
+    get_warmup().start()
+    model_registry.start_watcher()
+    yield
+    # Shutdown: close pooled HTTP connections, stop worker pools
+    get_warmup().stop()
+    model_registry.stop_watcher()
+    await close_http_session()
+    shutdown_executors()
+
+
 app = FastAPI(
     title="Fake News Verification API",
     description="Real-time fake news detection with multi-source verification + AI assistant",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # Include AI tasks router
@@ -30,33 +62,59 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Load ML model
-MODEL_PATH = os.path.join("model", "model.pkl")
-try:
-    model = joblib.load(MODEL_PATH)
-    print("✓ Model loaded successfully")
-except Exception as e:
-    print(f"✗ Failed to load model: {e}")
-    model = None
+# ML model: loaded once here, hot-swapped by the registry (POST /admin/model/reload)
+model_registry = get_model_registry()
+
+
+# Upper bound on texts accepted by /predict/batch
+MAX_BATCH_SIZE = int(os.environ.get("MAX_BATCH_SIZE", 1000))
+
+# Result caches: model output is stable, verification goes stale quickly
+CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", 2048))
+predict_cache = TTLCache(CACHE_MAX_ENTRIES, float(os.environ.get("CACHE_TTL_PREDICT", 86400)), name="predict")
+verify_cache = TTLCache(CACHE_MAX_ENTRIES, float(os.environ.get("CACHE_TTL_VERIFY", 300)), name="verify")
+full_check_cache = TTLCache(CACHE_MAX_ENTRIES, float(os.environ.get("CACHE_TTL_FULL_CHECK", 300)), name="full_check")
+
+
+def _clear_model_caches(version):
+    """Cached predictions (and full checks that contain one) came from the previous model"""
+    predict_cache.clear()
+    full_check_cache.clear()
+
+
+model_registry.on_swap.append(_clear_model_caches)
 
 
 # Request/Response Models
 class PredictRequest(BaseModel):
     text: str
+    bypass_cache: bool = False
 
 class PredictResponse(BaseModel):
     prediction: str
     confidence: float
     label: int
+    tier: str = "fast"
+
+class BatchPredictRequest(BaseModel):
+    texts: List[str]
+
+class BatchPredictResponse(BaseModel):
+    results: List[PredictResponse]
+    count: int
 
 class VerifyRequest(BaseModel):
     text: str
     headline: Optional[str] = None
+    bypass_cache: bool = False
+    deadline_seconds: Optional[float] = None
+    decisive: Optional[bool] = None
 
 class VerifyResponse(BaseModel):
     verification_status: str
     matching_sources: List[str]
     similarity_scores: Dict[str, float]
+    skipped_sources: Dict[str, str] = {}
     keywords: List[str]
     timestamp: float
 
@@ -66,12 +124,87 @@ class FullCheckResponse(BaseModel):
     verification_status: str
     matching_sources: List[str]
     similarity_scores: Dict[str, float]
+    skipped_sources: Dict[str, str] = {}
     keywords: List[str]
     summary: str
     key_sentences: List[str]
+    key_sentence_offsets: List[Tuple[int, int]] = []
     timestamp: float
 
 
+def score_texts(texts: List[str]) -> List[PredictResponse]:
+    """
+    Score many texts with a single vectorized pass through the pipeline
+
+    Labels are derived from the probability rows, so the pipeline runs
+    once per batch instead of once for predict and again for predict_proba.
+    The exported fast scorer and the pipeline expose the same interface and
+    both normalize raw text themselves (textnorm.with_normalizer). The model is read from the registry once, so a batch in flight during a
+    reload finishes on the version it started with.
+    """
+    model = model_registry.model
+    probabilities = model.predict_proba(texts)
+    best = probabilities.argmax(axis=1)
+    labels = model.classes_[best]
+
+    results = []
+    for row, idx, label in zip(probabilities, best, labels):
+        # 0 = Fake, 1 = Real
+        results.append(PredictResponse(
+            prediction="REAL" if label == 1 else "FAKE",
+            confidence=float(row[idx]),
+            label=int(label)
+        ))
+    return results
+
+
+# Concurrent /predict and /full-check calls share one predict_proba per window
+inference_batcher = batcher_from_env(score_texts, name="model", runner=run_in_thread)
+
+# Second tier for fast-model answers close to 0.5 (CASCADE_ENABLED)
+cascade = get_cascade()
+
+
+async def cascade_results(texts: List[str], results: List[PredictResponse]) -> List[PredictResponse]:
+    """
+    Replace the fast tier's uncertain answers with the transformer's
+    """
+    answers = await cascade.refine(texts, [(r.label, r.confidence) for r in results])
+    
+    refined = []
+    for result, answer in zip(results, answers):
+        if answer is None:
+            refined.append(result)
+        else:
+            label, confidence = answer
+            refined.append(PredictResponse(
+                prediction="REAL" if label == 1 else "FAKE",
+                confidence=float(confidence),
+                label=int(label),
+                tier="transformer"
+            ))
+    return refined
+
+
+async def predict_one(text: str, bypass_cache: bool = False) -> PredictResponse:
+    """
+    Cached single-text prediction through the micro-batcher
+    """
+    key = content_key(text)
+    if not bypass_cache:
+        cached = predict_cache.get(key)
+        if cached is not MISSING:
+            return cached
+    
+    version = model_registry.version
+    result = await inference_batcher.submit(text)
+    result = (await cascade_results([text], [result]))[0]
+    if model_registry.version == version:
+        # Not cached across a model swap: the result may come from either version
+        predict_cache.set(key, result)
+    return result
+
+
 @app.get("/")
 async def root():
     return {
@@ -79,12 +212,14 @@ async def root():
         "version": "2.0.0",
         "status": "active",
         "endpoints": {
-            "core": ["/predict", "/verify", "/full-check", "/sources", "/summarize"],
+            "core": ["/predict", "/predict/batch", "/verify", "/full-check", "/full-check/stream", "/sources", "/summarize"],
+            "probes": ["/health", "/ready"],
             "ai_assistant": [
                 "/ai/ask", "/ai/extract-claims", "/ai/rag-query",
                 "/ai/draft", "/ai/explain", "/ai/feedback",
                 "/ai/admin/health", "/ai/admin/stats"
-            ]
+            ],
+            "admin": ["/admin/stats", "/admin/model/reload"]
         }
     }
 
@@ -94,27 +229,46 @@ async def predict(request: PredictRequest):
     """
     ML-based fake news prediction using trained model
     """
-    if not model:
+    if model_registry.model is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
     
     if not request.text or len(request.text.strip()) < 10:
         raise HTTPException(status_code=400, detail="Text too short")
     
     try:
-        # Predict
-        prediction = model.predict([request.text])[0]
-        probabilities = model.predict_proba([request.text])[0]
-        confidence = float(max(probabilities))
-        
-        # 0 = Fake, 1 = Real
-        label_text = "REAL" if prediction == 1 else "FAKE"
-        
-        return PredictResponse(
-            prediction=label_text,
-            confidence=confidence,
-            label=int(prediction)
+        return await predict_one(request.text, request.bypass_cache)
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
+
+
+@app.post("/predict/batch", response_model=BatchPredictResponse)
+async def predict_batch(request: BatchPredictRequest):
+    """
+    Batch ML prediction - scores all texts in one pipeline pass, results in input order
+    """
+    if model_registry.model is None:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    
+    if not request.texts:
+        raise HTTPException(status_code=400, detail="No texts provided")
+    
+    if len(request.texts) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large (max {MAX_BATCH_SIZE} texts)"
         )
     
+    short = [i for i, text in enumerate(request.texts) if not text or len(text.strip()) < 10]
+    if short:
+        raise HTTPException(status_code=400, detail=f"Text too short at index {short[0]}")
+    
+    try:
+        # Up to MAX_BATCH_SIZE texts: vectorize and score off the event loop
+        results = await run_in_thread(score_texts, request.texts)
+        results = await cascade_results(request.texts, results)
+        return BatchPredictResponse(results=results, count=len(results))
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
@@ -129,70 +283,223 @@ async def verify(request: VerifyRequest):
     if not text or len(text.strip()) < 5:
         raise HTTPException(status_code=400, detail="Text/headline required")
     
+    key = content_key(request.text, request.headline, request.deadline_seconds, request.decisive)
+    if not request.bypass_cache:
+        cached = verify_cache.get(key)
+        if cached is not MISSING:
+            return cached
+    
     try:
         # Extract keywords
-        keywords = extract_keywords(text)
+        keywords = await run_in_process(extract_keywords, text)
         
         # Verify with multiple sources
-        verification_result = await verify_with_sources(text, keywords)
+        verification_result = await verify_with_sources(text, keywords, request.deadline_seconds, request.decisive)
         
-        return VerifyResponse(
-            verification_status=verification_result["status"],
-            matching_sources=verification_result["sources"],
-            similarity_scores=verification_result["scores"],
+        response = VerifyResponse(
+            **_verification_fields(verification_result),
             keywords=keywords,
             timestamp=time.time()
         )
+        verify_cache.set(key, response)
+        return response
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Verification error: {str(e)}")
 
 
+async def _prediction_stage(text: str, bypass_cache: bool = False) -> Dict:
+    """ML prediction (UNKNOWN when no model is loaded)"""
+    if model_registry.model is None:
+        return {"model_prediction": "UNKNOWN", "model_confidence": 0.0}
+    
+    scored = await predict_one(text, bypass_cache)
+    return {"model_prediction": scored.prediction, "model_confidence": scored.confidence}
+
+
+# Views computed in this process before a Document goes to the stages, so
+# the copies sent to the process pool carry them instead of recomputing them
+SHARED_VIEWS = ("cleaned", "tokens", "sentence_spans", "claim_type")
+
+
+def _compute_shared_views(*docs: Document):
+    for doc in dict.fromkeys(docs):
+        doc.compute(*SHARED_VIEWS)
+
+
+async def _summary_stage(doc: Document) -> Dict:
+    """TF-IDF summary and key sentences (with offsets) from one shared sentence split and scoring pass"""
+    return await run_in_process(summarize_with_offsets, doc, 3, 5)
+
+
+async def _verification_stage(
+    doc: TextLike,
+    deadline: Optional[float] = None,
+    decisive: Optional[bool] = None
+) -> Dict:
+    """Keyword extraction followed by multi-source verification"""
+    keywords = await run_in_process(extract_keywords, doc)
+    verification_result = await verify_with_sources(doc, keywords, deadline, decisive)
+    return {"keywords": keywords, **_verification_fields(verification_result)}
+
+
+def _verification_fields(verification_result: Dict) -> Dict:
+    """Map a verify_with_sources result onto response field names"""
+    return {
+        "verification_status": verification_result["status"],
+        "matching_sources": verification_result["sources"],
+        "similarity_scores": verification_result["scores"],
+        "skipped_sources": verification_result.get("skipped", {})
+    }
+
+
 @app.post("/full-check", response_model=FullCheckResponse)
 async def full_check(request: VerifyRequest):
     """
     Complete analysis: ML prediction + multi-source verification + summarization
+    (independent stages run concurrently)
     """
     if not request.text or len(request.text.strip()) < 10:
         raise HTTPException(status_code=400, detail="Text too short")
     
+    key = content_key(request.text, request.headline, request.deadline_seconds, request.decisive)
+    if not request.bypass_cache:
+        cached = full_check_cache.get(key)
+        if cached is not MISSING:
+            return cached
+    
     try:
-        # Step 1: ML Prediction
-        if model:
-            prediction = model.predict([request.text])[0]
-            probabilities = model.predict_proba([request.text])[0]
-            confidence = float(max(probabilities))
-            label_text = "REAL" if prediction == 1 else "FAKE"
-        else:
-            prediction = 0
-            confidence = 0.0
-            label_text = "UNKNOWN"
-        
-        # Step 2: Text Summarization
-        summary = summarize_text(request.text, num_sentences=3)
-        key_sentences = extract_key_sentences(request.text, num_sentences=5)
+        # One analysis object per text, shared by the stages that read it
+        doc = Document(request.text)
+        verify_doc = Document(request.headline) if request.headline else doc
+        version = model_registry.version
+        await run_in_thread(_compute_shared_views, doc, verify_doc)
         
-        # Step 3: Multi-source verification
-        text = request.headline if request.headline else request.text
-        keywords = extract_keywords(text)
-        verification_result = await verify_with_sources(text, keywords)
+        prediction, summaries, verification = await asyncio.gather(
+            _prediction_stage(request.text, request.bypass_cache),
+            _summary_stage(doc),
+            _verification_stage(verify_doc, request.deadline_seconds, request.decisive)
+        )
         
-        return FullCheckResponse(
-            model_prediction=label_text,
-            model_confidence=confidence,
-            verification_status=verification_result["status"],
-            matching_sources=verification_result["sources"],
-            similarity_scores=verification_result["scores"],
-            keywords=keywords,
-            summary=summary,
-            key_sentences=key_sentences,
+        response = FullCheckResponse(
+            **prediction,
+            **summaries,
+            **verification,
             timestamp=time.time()
         )
+        if model_registry.version == version:
+            full_check_cache.set(key, response)
+        return response
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Full check error: {str(e)}")
 
 
+def _ndjson(event: str, **fields) -> str:
+    """One newline-delimited JSON event"""
+    return json.dumps({"event": event, **fields}) + "\n"
+
+
+@app.post("/full-check/stream")
+async def full_check_stream(request: VerifyRequest):
+    """
+    Streaming full check (NDJSON): the model verdict and summary are sent as
+    soon as they are ready, then one "source" event per news site as it answers,
+    then the combined "verification" verdict and a final "done" event.
+    
+    A cached result is replayed without the "source" events (the cache keeps
+    scores and skipped sources, not headlines); "done" then has cached=true.
+    """
+    if not request.text or len(request.text.strip()) < 10:
+        raise HTTPException(status_code=400, detail="Text too short")
+    
+    key = content_key(request.text, request.headline, request.deadline_seconds, request.decisive)
+    cached = MISSING if request.bypass_cache else full_check_cache.get(key)
+    
+    async def replay_cached():
+        data = cached.model_dump()
+        yield _ndjson("prediction", model_prediction=data["model_prediction"],
+                      model_confidence=data["model_confidence"])
+        yield _ndjson("summary", summary=data["summary"], key_sentences=data["key_sentences"],
+                      key_sentence_offsets=data["key_sentence_offsets"])
+        yield _ndjson("keywords", keywords=data["keywords"])
+        yield _ndjson("verification", verification_status=data["verification_status"],
+                      matching_sources=data["matching_sources"],
+                      similarity_scores=data["similarity_scores"],
+                      skipped_sources=data["skipped_sources"])
+        yield _ndjson("done", cached=True, timestamp=data["timestamp"])
+    
+    async def stream():
+        queue: asyncio.Queue = asyncio.Queue()
+        collected: Dict = {}
+        doc = Document(request.text)
+        verify_doc = Document(request.headline) if request.headline else doc
+        version = model_registry.version
+        await run_in_thread(_compute_shared_views, doc, verify_doc)
+        
+        async def run_stage(name, coro):
+            try:
+                fields = await coro
+                collected.update(fields)
+                await queue.put(_ndjson(name, **fields))
+            except Exception as e:
+                await queue.put(_ndjson("error", stage=name, detail=str(e)))
+        
+        async def run_verification():
+            try:
+                keywords = await run_in_process(extract_keywords, verify_doc)
+                collected["keywords"] = keywords
+                await queue.put(_ndjson("keywords", keywords=keywords))
+                
+                results = []
+                async for result in iter_source_results(
+                    verify_doc, keywords, request.deadline_seconds, request.decisive
+                ):
+                    results.append(result)
+                    await queue.put(_ndjson(
+                        "source",
+                        source=result["source"],
+                        similarity=result["max_similarity"],
+                        headlines=result["headlines"],
+                        skipped=result.get("skipped")
+                    ))
+                
+                fields = _verification_fields(aggregate_results(results))
+                collected.update(fields)
+                await queue.put(_ndjson("verification", **fields))
+            except Exception as e:
+                await queue.put(_ndjson("error", stage="verification", detail=str(e)))
+        
+        tasks = [
+            asyncio.ensure_future(run_stage("prediction", _prediction_stage(request.text, request.bypass_cache))),
+            asyncio.ensure_future(run_stage("summary", _summary_stage(doc))),
+            asyncio.ensure_future(run_verification())
+        ]
+        done_marker = asyncio.ensure_future(asyncio.gather(*tasks))
+        
+        try:
+            while not (done_marker.done() and queue.empty()):
+                getter = asyncio.ensure_future(queue.get())
+                await asyncio.wait([getter, done_marker], return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield getter.result()
+                else:
+                    getter.cancel()
+            
+            timestamp = time.time()
+            complete = set(FullCheckResponse.model_fields) - {"timestamp"} <= set(collected)
+            if complete and model_registry.version == version:
+                full_check_cache.set(key, FullCheckResponse(**collected, timestamp=timestamp))
+            yield _ndjson("done", cached=False, timestamp=timestamp)
+        finally:
+            # Client disconnected - stop outstanding work
+            for task in tasks:
+                task.cancel()
+    
+    body = replay_cached() if cached is not MISSING else stream()
+    return StreamingResponse(body, media_type="application/x-ndjson")
+
+
 @app.get("/sources")
 async def get_sources():
     """
@@ -222,12 +529,11 @@ async def summarize_endpoint(text: str, num_sentences: int = 3):
         raise HTTPException(status_code=400, detail="Text too short")
     
     try:
-        summary = summarize_text(text, num_sentences)
-        key_sentences = extract_key_sentences(text, num_sentences=5)
+        summaries = await run_in_process(summarize_with_offsets, text, num_sentences, 5)
+        summary = summaries["summary"]
         
         return {
-            "summary": summary,
-            "key_sentences": key_sentences,
+            **summaries,
             "original_length": len(text),
             "summary_length": len(summary),
             "compression_ratio": round((1 - len(summary) / len(text)) * 100, 2)
@@ -243,9 +549,75 @@ async def health_check():
     """
     return {
         "status": "healthy",
-        "model_loaded": model is not None,
+        "model_loaded": model_registry.model is not None,
+        "model_version": model_registry.active.info() if model_registry.active else None,
+        "timestamp": time.time()
+    }
+
+
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness probe: 200 once the model can serve /predict (503 before that),
+    with the warm-up state of every lazily loaded component
+    """
+    warmup = get_warmup().stats()
+    ready = model_registry.model is not None
+    body = {
+        "ready": ready,
+        "components": {"model": "warm" if ready else "failed", **warmup["components"]},
+        "warmup_seconds": warmup["seconds"],
+        "errors": warmup["errors"],
         "timestamp": time.time()
     }
+    return JSONResponse(status_code=200 if ready else 503, content=body)
+
+
+@app.get("/admin/stats")
+async def admin_stats():
+    """
+    Performance statistics for inference batching, the classifier cascade,
+    worker pools, HTTP pool, request coalescing, per-source health and result caches
+    """
+    return {
+        "batching": inference_batcher.stats(),
+        "executors": executor_stats(),
+        "http_pool": http_pool_stats(),
+        "coalescing": coalescing_stats(),
+        "sources": source_health_stats(),
+        "verification": verification_stats(),
+        "idf": get_global_idf().stats() if get_global_idf() else None,
+        "model": model_registry.stats(),
+        "cascade": cascade.stats(),
+        "model_server": get_model_server_client().stats() if get_model_server_client() else None,
+        "cache": {
+            "predict": predict_cache.stats(),
+            "verify": verify_cache.stats(),
+            "full_check": full_check_cache.stats(),
+            "search": search_cache_stats(),
+            "embeddings": embedding_cache_stats()
+        },
+        "timestamp": time.time()
+    }
+
+
+@app.post("/admin/model/reload")
+async def reload_model():
+    """
+    Load the model on disk in the background, validate it on a canary batch
+    and swap it in; requests already scoring finish on the previous version
+    """
+    previous = model_registry.active.info() if model_registry.active else None
+    try:
+        active = await model_registry.reload()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Model reload failed, previous version still active: {str(e)}")
+    
+    return {
+        "reloaded": True,
+        "previous": previous,
+        "active": active.info()
+    }
 
 
 if __name__ == "__main__":
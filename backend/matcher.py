@@ -0,0 +1,226 @@
+"""
+Multi-pattern matcher - Find every lexicon category in a text in one regex pass
+
+All terms of a lexicon are compiled into a single trie-shaped regex
+(shared prefixes are factored out, so adding terms barely changes the scan
+cost) and matched from every position with a lookahead, which reports
+overlapping hits the way `term in text` checks do.
+
+Lexicons are {category: [terms]} dicts. The built-in ones can be extended or
+replaced from a JSON file named by LEXICON_PATH:
+
+    {"claim_type": {"death": ["deceased", "obituary"]},
+     "claim_sentence": {"indicator": ["disclosed"]}}
+
+Categories listed there add to the defaults; prefix a category with "=" to
+replace its terms instead.
+"""
+
+import json
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set
+
+LEXICON_PATH = os.environ.get("LEXICON_PATH", "")
+
+# Substring lexicons up to this many terms use per-term `in` checks for
+# categories(). benchmarks/bench_matcher.py on the politifact titles: the
+# built-in lexicons (claim_type 20 terms, claim_sentence 33) scan in
+# ~2.7 / 5.7 us per title against ~5.6 / 7.5 us for the regex; the regex
+# only pulls ahead between 48 and 64 terms.
+MATCHER_SCAN_THRESHOLD = int(os.environ.get("MATCHER_SCAN_THRESHOLD", 48))
+
+
+class Hit(NamedTuple):
+    start: int
+    end: int
+    term: str
+    categories: frozenset
+
+
+def _trie_pattern(node: Dict) -> str:
+    """Regex for a trie node; optional groups are greedy so the longest term wins"""
+    is_end = "" in node
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    return f"(?:{body})?" if is_end else body
+
+
+class PatternMatcher:
+    """
+    Compiled matcher for a {category: terms} lexicon
+
+    word_boundary=False matches terms anywhere (substring semantics, like
+    `term in text.lower()`); word_boundary=True only matches whole words.
+
+    For category lookups on small substring lexicons (up to scan_threshold
+    terms, which covers the built-in ones) a loop of `in` checks beats the
+    regex, so categories() uses that there; hit positions always come from
+    the regex.
+    """
+
+    def __init__(
+        self,
+        lexicon: Dict[str, Iterable[str]],
+        word_boundary: bool = False,
+        scan_threshold: int = MATCHER_SCAN_THRESHOLD
+    ):
+        self.word_boundary = word_boundary
+
+        term_categories: Dict[str, Set[str]] = {}
+        for category, terms in lexicon.items():
+            for term in terms:
+                term = term.lower()
+                if term:
+                    term_categories.setdefault(term, set()).add(category)
+
+        self.categories_list = sorted(lexicon)
+        self.term_count = len(term_categories)
+        self._scan = (
+            [(term, frozenset(categories)) for term, categories in term_categories.items()]
+            if not word_boundary and self.term_count <= scan_threshold else None
+        )
+
+        # The regex reports the longest term at each start; shorter terms that
+        # are prefixes of it (and would also match there) contribute their categories
+        self._categories: Dict[str, frozenset] = {}
+        for term in term_categories:
+            merged = set()
+            for end in range(1, len(term) + 1):
+                prefix = term[:end]
+                if prefix not in term_categories:
+                    continue
+                if word_boundary and end < len(term) and not _is_boundary(term, end):
+                    continue
+                merged |= term_categories[prefix]
+            self._categories[term] = frozenset(merged)
+
+        trie: Dict = {}
+        for term in term_categories:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[""] = {}
+
+        # Matched against lowercased text: much faster than re.IGNORECASE and
+        # identical to the `term in text.lower()` checks this replaces
+        body = _trie_pattern(trie)
+        if not body:
+            self._pattern = None
+        elif word_boundary:
+            self._pattern = re.compile(rf"\b(?=({body})\b)")
+        else:
+            self._pattern = re.compile(rf"(?=({body}))")
+        self._pattern_ci = None
+
+    def finditer(self, text: str) -> Iterator[Hit]:
+        """Every hit in text, in order of start position"""
+        if not text or self._pattern is None:
+            return
+
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            pattern, haystack = self._pattern, lowered
+        else:
+            # A few characters change length when lowercased; match case-insensitively
+            # on the original instead so positions stay valid
+            if self._pattern_ci is None:
+                self._pattern_ci = re.compile(self._pattern.pattern, re.IGNORECASE)
+            pattern, haystack = self._pattern_ci, text
+
+        for match in pattern.finditer(haystack):
+            categories = self._categories.get(match.group(1).lower())
+            if categories is not None:
+                yield Hit(match.start(1), match.end(1), text[match.start(1):match.end(1)], categories)
+
+    def find_all(self, text: str) -> List[Hit]:
+        return list(self.finditer(text))
+
+    def categories(self, text: str) -> Set[str]:
+        """Set of categories with at least one hit in text"""
+        found: Set[str] = set()
+        if not text or self._pattern is None:
+            return found
+
+        if self._scan is not None:
+            lowered = text.lower()
+            for term, categories in self._scan:
+                if term in lowered:
+                    found |= categories
+            return found
+
+        # findall keeps the scan in C; only distinct terms are mapped to categories
+        for term in set(self._pattern.findall(text.lower())):
+            found |= self._categories[term]
+        return found
+
+    def first_category(self, text: str, order: Sequence[str]) -> Optional[str]:
+        """Highest-priority category (by order) present in text, or None"""
+        found = self.categories(text)
+        for category in order:
+            if category in found:
+                return category
+        return None
+
+    def stats(self) -> Dict:
+        return {
+            "terms": self.term_count,
+            "categories": self.categories_list,
+            "word_boundary": self.word_boundary,
+            "strategy": "scan" if self._scan is not None else "regex",
+            "pattern_length": len(self._pattern.pattern) if self._pattern is not None else 0
+        }
+
+
+def _is_boundary(term: str, end: int) -> bool:
+    """Whether a \\b falls between term[end - 1] and term[end]"""
+    return _is_word_char(term[end - 1]) != _is_word_char(term[end])
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def load_lexicon(name: str, defaults: Dict[str, Iterable[str]]) -> Dict[str, List[str]]:
+    """
+    The named lexicon: built-in defaults merged with the LEXICON_PATH file (if any)
+    """
+    lexicon = {category: list(terms) for category, terms in defaults.items()}
+    if not LEXICON_PATH:
+        return lexicon
+
+    try:
+        with open(LEXICON_PATH) as f:
+            overrides = json.load(f).get(name, {})
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Lexicon file {LEXICON_PATH} not loaded: {e}")
+        return lexicon
+
+    for category, terms in overrides.items():
+        if category.startswith("="):
+            lexicon[category[1:]] = list(terms)
+        else:
+            lexicon.setdefault(category, []).extend(terms)
+    return lexicon
+
+
+_matchers: Dict[str, PatternMatcher] = {}
+
+
+def get_matcher(
+    name: str,
+    defaults: Dict[str, Iterable[str]],
+    word_boundary: bool = False
+) -> PatternMatcher:
+    """Get or build the shared matcher for a named lexicon"""
+    matcher = _matchers.get(name)
+    if matcher is None:
+        matcher = _matchers[name] = PatternMatcher(load_lexicon(name, defaults), word_boundary)
+    return matcher
+
+
+def matcher_stats() -> Dict:
+    """Size of every compiled matcher"""
+    return {name: matcher.stats() for name, matcher in sorted(_matchers.items())}
@@ -0,0 +1,492 @@
+"""
+Model server - One process owns the transformer summarizer and the embedding model
+
+Every API process would otherwise load distilbart and MiniLM itself, at
+hundreds of MB each. Run `python model_server.py` once per machine and set
+MODEL_SERVER_SOCKET in the API's environment: get_summarizer() and
+get_embedding_generator() then return RemoteSummarizer / RemoteEmbeddingGenerator,
+clients with the same methods that forward calls over a Unix socket.
+
+The server queues requests from all connected workers in a MicroBatcher per
+operation, so concurrent summaries become one pipeline call and concurrent
+embeddings one encode() call, each run on a worker thread.
+
+Wire format, both directions: a 4-byte header length, a 4-byte body length,
+a JSON header, then the body. Requests are {"id", "op", "args"}; responses are
+{"id", "ok", "result"} or {"id", "ok": false, "error"}, and numpy results
+travel as raw bytes in the body with their dtype and shape in the header.
+Each connection carries many requests at once, matched up by id. The socket
+file is created under a 0177 umask (mode 0600), so only the same user can
+connect, with no window in which others could.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from batching import MicroBatcher
+from executors import run_in_thread
+
+# Set in the API's environment to use the server; empty = load models in-process
+MODEL_SERVER_SOCKET = os.environ.get("MODEL_SERVER_SOCKET", "")
+MODEL_SERVER_TIMEOUT = float(os.environ.get("MODEL_SERVER_TIMEOUT", 60))
+
+# Server-side batching (heavier models than the classifier: wider window, smaller batches)
+MODEL_SERVER_BATCH_WINDOW_MS = float(os.environ.get("MODEL_SERVER_BATCH_WINDOW_MS", 10))
+MODEL_SERVER_BATCH_MAX = int(os.environ.get("MODEL_SERVER_BATCH_MAX", 16))
+
+_FRAME = struct.Struct("!II")
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+
+class ModelServerError(RuntimeError):
+    """The server answered with an error"""
+
+
+def encode_message(header: Dict, result: Any = None) -> bytes:
+    """Frame a header (plus a numpy result as raw bytes) for the socket"""
+    body = b""
+    if isinstance(result, np.ndarray):
+        result = np.ascontiguousarray(result)
+        header = {**header, "array": {"dtype": result.dtype.str, "shape": list(result.shape)}}
+        body = result.tobytes()
+    elif result is not None:
+        header = {**header, "result": result}
+    data = json.dumps(header).encode()
+    return _FRAME.pack(len(data), len(body)) + data + body
+
+
+def decode_result(header: Dict, body: bytes) -> Any:
+    array = header.get("array")
+    if array is not None:
+        return np.frombuffer(body, dtype=np.dtype(array["dtype"])).reshape(array["shape"])
+    return header.get("result")
+
+
+def _check_sizes(header_len: int, body_len: int):
+    if header_len + body_len > MAX_MESSAGE_BYTES:
+        raise ValueError(f"message of {header_len + body_len} bytes exceeds {MAX_MESSAGE_BYTES}")
+
+
+async def read_message(reader: asyncio.StreamReader) -> Tuple[Dict, bytes]:
+    header_len, body_len = _FRAME.unpack(await reader.readexactly(_FRAME.size))
+    _check_sizes(header_len, body_len)
+    header = json.loads(await reader.readexactly(header_len))
+    body = await reader.readexactly(body_len) if body_len else b""
+    return header, body
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    chunks = bytearray()
+    while len(chunks) < size:
+        chunk = sock.recv(size - len(chunks))
+        if not chunk:
+            raise ConnectionError("model server closed the connection")
+        chunks += chunk
+    return bytes(chunks)
+
+
+def recv_message(sock: socket.socket) -> Tuple[Dict, bytes]:
+    header_len, body_len = _FRAME.unpack(_recv_exactly(sock, _FRAME.size))
+    _check_sizes(header_len, body_len)
+    header = json.loads(_recv_exactly(sock, header_len))
+    body = _recv_exactly(sock, body_len) if body_len else b""
+    return header, body
+
+
+class ModelServer:
+    """
+    Serves summarize / embed requests from many connections through shared batchers
+    """
+
+    def __init__(self, summarizer: Any, embedder: Optional[Any] = None):
+        self.summarizer = summarizer
+        self.embedder = embedder
+        self.summarize_batcher = MicroBatcher(
+            self._summarize_batch, MODEL_SERVER_BATCH_WINDOW_MS, MODEL_SERVER_BATCH_MAX,
+            name="summarize", runner=run_in_thread
+        )
+        self.embed_batcher = MicroBatcher(
+            self._embed_batch, MODEL_SERVER_BATCH_WINDOW_MS, MODEL_SERVER_BATCH_MAX,
+            name="embed", runner=run_in_thread
+        )
+        self.requests = Counter()
+        self.errors = 0
+        self.connections = 0
+        self.started_at = time.time()
+        self._writers = set()
+
+    def _summarize_batch(self, items: List[Tuple[str, int, int, int]]) -> List[str]:
+        """One batch_summarize call per distinct (max_length, min_length, num_sentences)"""
+        results: List[Optional[str]] = [None] * len(items)
+        groups: Dict[Tuple[int, int, int], List[int]] = {}
+        for i, (_, *params) in enumerate(items):
+            groups.setdefault(tuple(params), []).append(i)
+
+        for (max_length, min_length, num_sentences), indices in groups.items():
+            summaries = self.summarizer.batch_summarize(
+                [items[i][0] for i in indices],
+                max_length=max_length, min_length=min_length, num_sentences=num_sentences
+            )
+            for i, summary in zip(indices, summaries):
+                results[i] = summary
+        return results
+
+    def _embed_batch(self, items: List[List[str]]) -> List[np.ndarray]:
+        """Every request's texts through one embed() call, split back per request"""
+        texts = [text for item in items for text in item]
+        vectors = np.asarray(self.embedder.embed(texts))
+        bounds = np.cumsum([0] + [len(item) for item in items])
+        return [vectors[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+    async def handle(self, op: str, args: Dict) -> Any:
+        self.requests[op] += 1
+        if op == "summarize":
+            return await self.summarize_batcher.submit((
+                args["text"], int(args.get("max_length", 150)), int(args.get("min_length", 40)),
+                int(args.get("num_sentences", 3))
+            ))
+        if op == "embed":
+            if self.embedder is None:
+                raise RuntimeError("No embedding model available on the model server")
+            return await self.embed_batcher.submit(list(args["texts"]))
+        if op == "info":
+            return {
+                "summarizer": getattr(self.summarizer, "method", None),
+                "embeddings": getattr(self.embedder, "method", None),
+                "model_id": getattr(self.embedder, "model_id", None),
+                "dimension": self.embedder.get_dimension() if self.embedder is not None else None,
+                "pid": os.getpid()
+            }
+        if op == "stats":
+            return self.stats()
+        raise ValueError(f"unknown op {op!r}")
+
+    async def _respond(self, writer: asyncio.StreamWriter, header: Dict):
+        request_id = header.get("id")
+        try:
+            result = await self.handle(header.get("op"), header.get("args") or {})
+            message = encode_message({"id": request_id, "ok": True}, result)
+        except Exception as e:
+            self.errors += 1
+            message = encode_message({"id": request_id, "ok": False, "error": f"{type(e).__name__}: {e}"})
+        if not writer.is_closing():
+            writer.write(message)
+            await writer.drain()
+
+    async def serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Answer requests as they complete, in any order"""
+        self.connections += 1
+        self._writers.add(writer)
+        tasks = set()
+        try:
+            while True:
+                try:
+                    header, _ = await read_message(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                task = asyncio.ensure_future(self._respond(writer, header))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+            self._writers.discard(writer)
+            self.connections -= 1
+
+    async def serve(self, path: str):
+        if os.path.exists(path):
+            os.unlink(path)
+        # Created 0600 by bind() itself; a chmod afterwards would leave the socket open until then
+        umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(self.serve_connection, path=path)
+        finally:
+            os.umask(umask)
+        print(f"✓ Model server listening on {path} (pid {os.getpid()})")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            # Clients see the connection close and fail (or fall back) right away
+            for writer in list(self._writers):
+                writer.close()
+
+    def stats(self) -> Dict:
+        """Get request counts and batching statistics"""
+        return {
+            "requests": dict(self.requests),
+            "errors": self.errors,
+            "connections": self.connections,
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "batching": {
+                "summarize": self.summarize_batcher.stats(),
+                "embed": self.embed_batcher.stats()
+            }
+        }
+
+
+class ModelServerClient:
+    """
+    Thread-safe client: callers on any thread send over one connection and wait
+    on their own future; a reader thread resolves them as responses arrive
+    """
+
+    def __init__(self, path: str = MODEL_SERVER_SOCKET, timeout: float = MODEL_SERVER_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._sock: Optional[socket.socket] = None
+        self._pid: Optional[int] = None
+        self._pending: Dict[int, Future] = {}
+        self._ids = itertools.count()
+
+        self.calls = 0
+        self.failures = 0
+        self.connects = 0
+        self._total_seconds = 0.0
+
+    def _connect(self) -> socket.socket:
+        # A connection inherited across fork (serve.py) belongs to the parent
+        if self._sock is not None and self._pid == os.getpid():
+            return self._sock
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(self.path)
+        self._sock, self._pid = sock, os.getpid()
+        self._pending = {}
+        self.connects += 1
+        threading.Thread(target=self._read, args=(sock, self._pending), name="model-server-client",
+                         daemon=True).start()
+        return sock
+
+    def _read(self, sock: socket.socket, pending: Dict[int, Future]):
+        """Resolve this connection's futures until it closes, then fail the rest"""
+        try:
+            while True:
+                header, body = recv_message(sock)
+                future = pending.pop(header.get("id"), None)
+                if future is None:
+                    continue
+                if header.get("ok"):
+                    future.set_result(decode_result(header, body))
+                else:
+                    future.set_exception(ModelServerError(header.get("error", "model server error")))
+        except Exception as e:
+            with self._lock:
+                if self._sock is sock:
+                    self._sock = None
+                failed = list(pending.values())
+                pending.clear()
+            for future in failed:
+                if not future.done():
+                    future.set_exception(ConnectionError(f"model server connection lost: {e}"))
+            sock.close()
+
+    def submit(self, op: str, **args) -> Future:
+        """Send one request; the future resolves with the result"""
+        future: Future = Future()
+        with self._lock:
+            sock = self._connect()
+            request_id = next(self._ids)
+            future.request_id = request_id
+            self._pending[request_id] = future
+            try:
+                sock.sendall(encode_message({"id": request_id, "op": op, "args": args}))
+            except OSError:
+                self._pending.pop(request_id, None)
+                self._sock = None
+                raise
+        return future
+
+    def wait(self, future: Future, timeout: Optional[float] = None) -> Any:
+        """Result of a submitted request; on timeout the request is forgotten (a late answer is dropped)"""
+        try:
+            return future.result(self.timeout if timeout is None else timeout)
+        except FutureTimeout:
+            with self._lock:
+                self._pending.pop(future.request_id, None)
+            future.cancel()
+            raise
+
+    def call(self, op: str, timeout: Optional[float] = None, **args) -> Any:
+        """Send one request and wait for its result"""
+        started = time.perf_counter()
+        self.calls += 1
+        try:
+            return self.wait(self.submit(op, **args), timeout)
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            self._total_seconds += time.perf_counter() - started
+
+    def stats(self) -> Dict:
+        """Get client-side call statistics"""
+        return {
+            "socket": self.path,
+            "connected": self._sock is not None and self._pid == os.getpid(),
+            "calls": self.calls,
+            "failures": self.failures,
+            "connects": self.connects,
+            "mean_call_ms": round(self._total_seconds / self.calls * 1000, 3) if self.calls else 0.0
+        }
+
+
+class RemoteSummarizer:
+    """
+    AdvancedSummarizer interface backed by the model server; falls back to
+    TF-IDF summaries (like AdvancedSummarizer) when the server is unavailable
+    """
+
+    method = "model-server"
+
+    def __init__(self, client: Optional[ModelServerClient] = None):
+        self.client = client or get_model_server_client()
+
+    def summarize(self, text: str, max_length: int = 150, min_length: int = 40, num_sentences: int = 3) -> str:
+        if not text or len(text.strip()) < 100:
+            return text
+        try:
+            return self.client.call("summarize", text=text, max_length=max_length,
+                                    min_length=min_length, num_sentences=num_sentences)
+        except Exception as e:
+            return self._fallback(text, num_sentences, e)
+
+    @staticmethod
+    def _fallback(text: str, num_sentences: int, error: Exception) -> str:
+        print(f"⚠️ Model server summarization failed, using TF-IDF: {error}")
+        from utils import summarize_text
+        return summarize_text(text, num_sentences)
+
+    def batch_summarize(self, texts: list, **kwargs) -> list:
+        """
+        All texts are sent before waiting, so the server can batch them. The
+        batch shares one timeout, and only texts whose request failed fall
+        back to TF-IDF.
+        """
+        deadline = time.monotonic() + self.client.timeout
+        requests = []
+        for text in texts:
+            if not text or len(text.strip()) < 100:
+                requests.append(None)
+                continue
+            try:
+                requests.append(self.client.submit("summarize", text=text, **kwargs))
+            except Exception as e:
+                requests.append(e)
+
+        summaries = []
+        for request, text in zip(requests, texts):
+            if request is None:
+                summaries.append(text)
+                continue
+            try:
+                if isinstance(request, Exception):
+                    raise request
+                summaries.append(self.client.wait(request, max(0.0, deadline - time.monotonic())))
+            except Exception as e:
+                summaries.append(self._fallback(text, kwargs.get("num_sentences", 3), e))
+        return summaries
+
+
+class RemoteEmbeddingGenerator:
+    """
+    EmbeddingGenerator interface backed by the model server; falls back to a
+    local EmbeddingGenerator for the same model when a call fails
+    """
+
+    def __init__(self, client: Optional[ModelServerClient] = None):
+        self.client = client or get_model_server_client()
+        self._local = None
+        self._local_lock = threading.Lock()
+        try:
+            info = self.client.call("info")
+        except Exception as e:
+            raise RuntimeError(f"Model server not reachable at {self.client.path}: {e}")
+        if not info.get("embeddings"):
+            raise RuntimeError("No embedding model available on the model server")
+        self.method = info["embeddings"]
+        self.model_id = info.get("model_id") or self.method
+        self.dimension = int(info["dimension"])
+        print(f"✓ Embeddings served by model server {self.client.path} ({self.method})")
+
+    def embed(self, text) -> np.ndarray:
+        texts = [text] if isinstance(text, str) else list(text)
+        try:
+            return self.client.call("embed", texts=texts)
+        except Exception as e:
+            return self._fallback(texts, e)
+
+    def _fallback(self, texts: List[str], error: Exception) -> np.ndarray:
+        print(f"⚠️ Model server embedding failed, embedding in-process: {error}")
+        with self._local_lock:
+            if self._local is None:
+                from embeddings import EmbeddingGenerator
+                self._local = EmbeddingGenerator(method="auto")
+        # Vectors from another model would not match the index or the cache keys
+        if self._local.model_id != self.model_id:
+            raise error
+        return self._local.embed(texts)
+
+    def get_dimension(self) -> int:
+        return self.dimension
+
+
+_client: Optional[ModelServerClient] = None
+
+
+def get_model_server_client() -> Optional[ModelServerClient]:
+    """Get the shared client, or None when MODEL_SERVER_SOCKET is not set"""
+    global _client
+    if _client is None and MODEL_SERVER_SOCKET:
+        _client = ModelServerClient(MODEL_SERVER_SOCKET)
+    return _client
+
+
+def load_models() -> Tuple[Any, Optional[Any]]:
+    """The in-process models the server owns (embeddings are optional)"""
+    from summarize import AdvancedSummarizer
+    from embeddings import EmbeddingGenerator
+
+    summarizer = AdvancedSummarizer()
+    try:
+        embedder = EmbeddingGenerator(method="auto")
+    except RuntimeError as e:
+        print(f"⚠️ Model server running without embeddings: {e}")
+        embedder = None
+    return summarizer, embedder
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--socket', default=MODEL_SERVER_SOCKET or "/tmp/fakenews-models.sock")
+    args = parser.parse_args()
+
+    summarizer, embedder = load_models()
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        asyncio.run(ModelServer(summarizer, embedder).serve(args.socket))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+Model registry - Hot reload of the classifier behind an atomic reference swap
+
+The registry owns the model used by /predict and /full-check. reload() loads
+the artifact in a worker thread (the memory-mapped fast scorer when it was
+exported from the current MODEL_PATH, otherwise the pickled pipeline), scores
+a canary batch with it and only then replaces the active ModelVersion with a
+single assignment. Callers take the version once per batch, so a batch that
+started on the old model finishes on it and the old model is freed with its
+last reference. A load or canary failure leaves the active model untouched.
+That holds for the memory-mapped fast scorer too: every export is a new,
+immutable version directory, so re-exporting never touches the files the
+active scorer maps.
+
+With MODEL_WATCH_INTERVAL > 0 a background task polls the model files and
+reloads once a change has stayed put for one interval, so a pickle that is
+still being written is never picked up.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+
+from executors import run_in_thread
+from fastmodel import (
+    CURRENT_FILE, FAST_MODEL_PATH, META_FILE, FastScorer, file_sha256, load_fast_scorer, resolve_artifact
+)
+from textnorm import with_normalizer
+
+MODEL_PATH = os.environ.get("MODEL_PATH", os.path.join(os.path.dirname(__file__), "model", "model.pkl"))
+
+# Seconds between checks of the model files for changes (0 = no watcher, reload via /admin/model/reload)
+MODEL_WATCH_INTERVAL = float(os.environ.get("MODEL_WATCH_INTERVAL", 0))
+
+# Scored by every candidate before it is swapped in
+CANARY_TEXTS = [
+    "The government announced a new economic policy on Monday after months of debate",
+    "SHOCKING: scientists HATE this one weird trick, share before it gets deleted!!!",
+    "Officials confirmed the results of the election in a statement to reporters",
+    "Aliens secretly control the world's banks, insiders reveal",
+    ""
+]
+
+
+class ModelVersion:
+    """One loaded model plus what identifies it"""
+
+    def __init__(self, model: Any, kind: str, version: str, path: str):
+        self.model = model
+        self.kind = kind
+        self.version = version
+        self.path = path
+        self.loaded_at = time.time()
+
+    def info(self) -> Dict:
+        return {
+            "version": self.version,
+            "kind": self.kind,
+            "path": self.path,
+            "loaded_at": self.loaded_at
+        }
+
+
+def validate_model(model: Any, texts: List[str] = CANARY_TEXTS):
+    """
+    Score the canary batch and raise ValueError unless the output looks like
+    a binary classifier main.score_texts can use
+    """
+    classes = np.asarray(model.classes_)
+    if len(classes) != 2 or not set(classes.tolist()) <= {0, 1}:
+        raise ValueError(f"expected classes [0, 1], got {classes.tolist()}")
+
+    probabilities = np.asarray(model.predict_proba(texts))
+    if probabilities.shape != (len(texts), 2):
+        raise ValueError(f"canary batch returned shape {probabilities.shape}, expected ({len(texts)}, 2)")
+    if not np.all(np.isfinite(probabilities)) or not np.allclose(probabilities.sum(axis=1), 1.0):
+        raise ValueError("canary batch returned invalid probabilities")
+
+
+class ModelRegistry:
+    """
+    Holds the active ModelVersion; reload() swaps in a validated new one
+
+    on_swap callbacks run after every successful swap (main.py clears the
+    prediction caches there).
+    """
+
+    def __init__(self, model_path: str = MODEL_PATH, fast_path: str = FAST_MODEL_PATH):
+        self.model_path = model_path
+        self.fast_path = fast_path
+        self.active: Optional[ModelVersion] = None
+        self.on_swap: List[Callable[[ModelVersion], None]] = []
+
+        self._reload_lock: Optional[asyncio.Lock] = None
+        self._watcher: Optional[asyncio.Task] = None
+        self._signature = self._file_signature()
+
+        self.reloads = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def model(self) -> Any:
+        active = self.active
+        return active.model if active else None
+
+    @property
+    def version(self) -> Optional[str]:
+        active = self.active
+        return active.version if active else None
+
+    def _file_signature(self) -> Tuple:
+        """
+        (mtime, size, inode) of the pickle, the fast artifact's CURRENT pointer
+        (replaced last on export) and the meta.json of the version it names
+        """
+        signature = []
+        for path in (
+            self.model_path,
+            os.path.join(self.fast_path, CURRENT_FILE),
+            os.path.join(resolve_artifact(self.fast_path), META_FILE)
+        ):
+            try:
+                st = os.stat(path)
+                signature.append((st.st_mtime_ns, st.st_size, st.st_ino))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _load(self) -> ModelVersion:
+        """Load and validate a candidate from disk (blocking)"""
+        digest = file_sha256(self.model_path) if os.path.exists(self.model_path) else None
+
+        model = load_fast_scorer(self.model_path, self.fast_path)
+        if model is not None:
+            kind = "fast"
+            digest = digest or model.meta.get("source_sha256")
+        else:
+            model = with_normalizer(joblib.load(self.model_path))
+            kind = "pipeline"
+
+        validate_model(model)
+        path = model.path if kind == "fast" else self.model_path
+        return ModelVersion(model, kind, (digest or "unknown")[:12], path)
+
+    def _swap(self, candidate: ModelVersion):
+        self.active = candidate
+        for callback in self.on_swap:
+            callback(candidate)
+
+    def load(self) -> Optional[ModelVersion]:
+        """Synchronous initial load at import time; None (and no model) on failure"""
+        self._signature = self._file_signature()
+        try:
+            self._swap(self._load())
+            print(f"✓ Model loaded successfully ({self.active.kind}, version {self.version})")
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            print(f"✗ Failed to load model: {e}")
+        return self.active
+
+    async def reload(self) -> ModelVersion:
+        """
+        Load, validate and swap in the model currently on disk
+
+        Concurrent calls are serialized. Raises on failure, leaving the
+        previous model active.
+        """
+        if self._reload_lock is None:
+            self._reload_lock = asyncio.Lock()
+
+        async with self._reload_lock:
+            self._signature = self._file_signature()
+            try:
+                candidate = await run_in_thread(self._load)
+            except Exception as e:
+                self.failures += 1
+                self.last_error = str(e)
+                print(f"⚠️ Model reload failed, keeping version {self.version}: {e}")
+                raise
+
+            previous = self.version
+            self._swap(candidate)
+            self.reloads += 1
+            self.last_error = None
+            print(f"✓ Model reloaded: {previous} -> {candidate.version} ({candidate.kind})")
+            return candidate
+
+    async def _watch(self, interval: float):
+        pending = None
+        while True:
+            await asyncio.sleep(interval)
+            signature = self._file_signature()
+            if signature == self._signature:
+                pending = None
+            elif signature != pending:
+                # Changed since the last check: wait one more interval for the write to settle
+                pending = signature
+            else:
+                pending = None
+                try:
+                    await self.reload()
+                except Exception:
+                    pass
+
+    def start_watcher(self, interval: float = MODEL_WATCH_INTERVAL):
+        """Start polling the model files (call from the running event loop)"""
+        if interval > 0 and self._watcher is None:
+            self._watcher = asyncio.ensure_future(self._watch(interval))
+
+    def stop_watcher(self):
+        if self._watcher is not None:
+            self._watcher.cancel()
+            self._watcher = None
+
+    def stats(self) -> Dict:
+        """Get registry statistics"""
+        active = self.active
+        return {
+            "active": active.info() if active else None,
+            "fast_model": active.model.stats() if active and isinstance(active.model, FastScorer) else None,
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "watching": self._watcher is not None
+        }
+
+
+_registry: Optional[ModelRegistry] = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get the shared registry, loading the model on first use"""
+    global _registry
+    if _registry is None:
+        _registry = ModelRegistry()
+        _registry.load()
+    return _registry
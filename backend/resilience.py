@@ -0,0 +1,166 @@
+"""
+Per-source resilience - Latency tracking, adaptive timeouts and circuit breakers
+"""
+
+import os
+import time
+from collections import deque
+from typing import Dict, Optional
+
+
+# Adaptive timeout: percentile of recent latencies x multiplier, clamped. Requests
+# that hit their deadline count as a sample of the deadline, so it grows with a slowing source
+SOURCE_TIMEOUT_DEFAULT = float(os.environ.get("SOURCE_TIMEOUT_DEFAULT", 8))
+SOURCE_TIMEOUT_MIN = float(os.environ.get("SOURCE_TIMEOUT_MIN", 1.5))
+SOURCE_TIMEOUT_MAX = float(os.environ.get("SOURCE_TIMEOUT_MAX", 8))
+SOURCE_TIMEOUT_PERCENTILE = float(os.environ.get("SOURCE_TIMEOUT_PERCENTILE", 95))
+SOURCE_TIMEOUT_MULTIPLIER = float(os.environ.get("SOURCE_TIMEOUT_MULTIPLIER", 1.5))
+SOURCE_LATENCY_WINDOW = int(os.environ.get("SOURCE_LATENCY_WINDOW", 50))
+SOURCE_MIN_SAMPLES = int(os.environ.get("SOURCE_MIN_SAMPLES", 5))
+
+# Hedging: send a duplicate request once the first is slower than this percentile
+SEARCH_HEDGE_ENABLED = os.environ.get("SEARCH_HEDGE_ENABLED", "0") == "1"
+SEARCH_HEDGE_PERCENTILE = float(os.environ.get("SEARCH_HEDGE_PERCENTILE", 90))
+
+# Circuit breaker
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get("BREAKER_FAILURE_THRESHOLD", 5))
+BREAKER_RESET_SECONDS = float(os.environ.get("BREAKER_RESET_SECONDS", 30))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile of a non-empty sequence"""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+class SourceHealth:
+    """
+    Rolling latency/error statistics and a circuit breaker for one source
+
+    closed    -> requests flow; BREAKER_FAILURE_THRESHOLD consecutive failures open it
+    open      -> requests are skipped until BREAKER_RESET_SECONDS have passed
+    half_open -> one probe request is let through; success closes, failure re-opens
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies = deque(maxlen=SOURCE_LATENCY_WINDOW)
+        self.outcomes = deque(maxlen=SOURCE_LATENCY_WINDOW)
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+
+        self.total_requests = 0
+        self.total_failures = 0
+        self.total_skipped = 0
+        self.total_hedges = 0
+        self.times_opened = 0
+
+    def allow_request(self) -> bool:
+        """Whether a request to this source may be sent now"""
+        if self.state == CLOSED:
+            return True
+
+        if self.state == OPEN and time.monotonic() - self.opened_at >= BREAKER_RESET_SECONDS:
+            self.state = HALF_OPEN
+            self.probe_in_flight = False
+
+        if self.state == HALF_OPEN and not self.probe_in_flight:
+            self.probe_in_flight = True
+            return True
+
+        self.total_skipped += 1
+        return False
+
+    def record_success(self, latency: float):
+        self.total_requests += 1
+        self.latencies.append(latency)
+        self.outcomes.append(True)
+        self.consecutive_failures = 0
+        self.probe_in_flight = False
+        self.state = CLOSED
+
+    def record_failure(self, latency: Optional[float] = None):
+        """
+        Args:
+            latency: Elapsed time of a request that ran into its deadline. It is
+                a lower bound of the real latency and goes into the window, so
+                the deadline backs off instead of staying below a source that
+                slowed down (every timeout would otherwise add no sample)
+        """
+        if latency is not None:
+            self.latencies.append(latency)
+        self.total_requests += 1
+        self.total_failures += 1
+        self.outcomes.append(False)
+        self.consecutive_failures += 1
+        self.probe_in_flight = False
+
+        if self.state == HALF_OPEN or self.consecutive_failures >= BREAKER_FAILURE_THRESHOLD:
+            if self.state != OPEN:
+                self.times_opened += 1
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def release_probe(self):
+        """Clear the half-open probe slot when a request ends without an outcome (cancelled)"""
+        self.probe_in_flight = False
+
+    def timeout(self) -> float:
+        """Adaptive request deadline from observed latencies"""
+        # A half-open probe gets the full default: the short deadline may be why the breaker opened
+        if self.state == HALF_OPEN or len(self.latencies) < SOURCE_MIN_SAMPLES:
+            return SOURCE_TIMEOUT_DEFAULT
+        observed = percentile(self.latencies, SOURCE_TIMEOUT_PERCENTILE) * SOURCE_TIMEOUT_MULTIPLIER
+        return max(SOURCE_TIMEOUT_MIN, min(SOURCE_TIMEOUT_MAX, observed))
+
+    def hedge_delay(self) -> Optional[float]:
+        """How long to wait before sending a hedged duplicate (None = don't hedge)"""
+        if not SEARCH_HEDGE_ENABLED or len(self.latencies) < SOURCE_MIN_SAMPLES:
+            return None
+        return percentile(self.latencies, SEARCH_HEDGE_PERCENTILE)
+
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return 1.0 - sum(self.outcomes) / len(self.outcomes)
+
+    def stats(self) -> Dict:
+        """Get health statistics for this source"""
+        has_samples = bool(self.latencies)
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "error_rate": round(self.error_rate(), 4),
+            "p50_latency": round(percentile(self.latencies, 50), 4) if has_samples else None,
+            "p95_latency": round(percentile(self.latencies, 95), 4) if has_samples else None,
+            "timeout": round(self.timeout(), 3),
+            "total_requests": self.total_requests,
+            "total_failures": self.total_failures,
+            "total_skipped": self.total_skipped,
+            "total_hedges": self.total_hedges,
+            "times_opened": self.times_opened
+        }
+
+
+_health: Dict[str, SourceHealth] = {}
+
+
+def get_source_health(name: str) -> SourceHealth:
+    """Get or create the health tracker for a source"""
+    health = _health.get(name)
+    if health is None:
+        health = _health[name] = SourceHealth(name)
+    return health
+
+
+def source_health_stats() -> Dict:
+    """Health and breaker state for every tracked source"""
+    return {name: health.stats() for name, health in sorted(_health.items())}
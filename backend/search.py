@@ -1,9 +1,17 @@
 import asyncio
 import aiohttp
-from typing import List, Dict
+import os
+import time
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 from bs4 import BeautifulSoup
 import re
-from utils import calculate_similarity, build_search_query, determine_verification_status
+from utils import (
+    TextLike, as_text, batch_similarity, build_search_query,
+    determine_verification_status, settled_verification_status
+)
+from executors import run_in_process
+from cache import TTLCache, SingleFlight, MISSING, content_key
+from resilience import SourceHealth, get_source_health
 
 
 # Trusted news sources
@@ -21,19 +29,263 @@ HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 }
 
+# Shared connection pool tuning
+HTTP_POOL_LIMIT = int(os.environ.get("HTTP_POOL_LIMIT", 100))
+HTTP_POOL_LIMIT_PER_HOST = int(os.environ.get("HTTP_POOL_LIMIT_PER_HOST", 8))
+HTTP_DNS_CACHE_TTL = int(os.environ.get("HTTP_DNS_CACHE_TTL", 300))
+HTTP_KEEPALIVE_TIMEOUT = float(os.environ.get("HTTP_KEEPALIVE_TIMEOUT", 60))
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+pool_stats = {
+    "sessions_created": 0,
+    "requests": 0,
+    "in_flight": 0,
+    "peak_in_flight": 0,
+    "connections_created": 0,
+    "connections_reused": 0,
+    "queued_for_connection": 0,
+    "queue_wait_seconds": 0.0,
+    "dns_cache_hits": 0,
+    "dns_cache_misses": 0,
+    "request_errors": 0
+}
+
+
+def _build_trace_config() -> aiohttp.TraceConfig:
+    """Trace hooks feeding the pool utilization counters"""
+    trace = aiohttp.TraceConfig()
+    
+    async def on_request_start(session, ctx, params):
+        pool_stats["requests"] += 1
+        pool_stats["in_flight"] += 1
+        pool_stats["peak_in_flight"] = max(pool_stats["peak_in_flight"], pool_stats["in_flight"])
+    
+    async def on_request_end(session, ctx, params):
+        pool_stats["in_flight"] -= 1
+    
+    async def on_request_exception(session, ctx, params):
+        pool_stats["in_flight"] -= 1
+        pool_stats["request_errors"] += 1
+    
+    async def on_connection_create_end(session, ctx, params):
+        pool_stats["connections_created"] += 1
+    
+    async def on_connection_reuseconn(session, ctx, params):
+        pool_stats["connections_reused"] += 1
+    
+    async def on_connection_queued_start(session, ctx, params):
+        pool_stats["queued_for_connection"] += 1
+        ctx.queued_at = time.perf_counter()
+    
+    async def on_connection_queued_end(session, ctx, params):
+        pool_stats["queue_wait_seconds"] += time.perf_counter() - ctx.queued_at
+    
+    async def on_dns_cache_hit(session, ctx, params):
+        pool_stats["dns_cache_hits"] += 1
+    
+    async def on_dns_cache_miss(session, ctx, params):
+        pool_stats["dns_cache_misses"] += 1
+    
+    trace.on_request_start.append(on_request_start)
+    trace.on_request_end.append(on_request_end)
+    trace.on_request_exception.append(on_request_exception)
+    trace.on_connection_create_end.append(on_connection_create_end)
+    trace.on_connection_reuseconn.append(on_connection_reuseconn)
+    trace.on_connection_queued_start.append(on_connection_queued_start)
+    trace.on_connection_queued_end.append(on_connection_queued_end)
+    trace.on_dns_cache_hit.append(on_dns_cache_hit)
+    trace.on_dns_cache_miss.append(on_dns_cache_miss)
+    return trace
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """
+    Get or create the application-wide client session
+    (keep-alive connections and DNS cache are shared across requests)
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    
+    if _session is None or _session.closed or _session_loop is not loop:
+        if _session is not None and not _session.closed and _session_loop is not loop:
+            # Created on an event loop that is gone - release it without awaiting
+            _session.detach()
+        
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_LIMIT,
+            limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+            use_dns_cache=True,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+            ssl=False
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            headers=HEADERS,
+            trace_configs=[_build_trace_config()]
+        )
+        _session_loop = loop
+        pool_stats["sessions_created"] += 1
+    
+    return _session
+
+
+async def close_http_session():
+    """Close the shared session (called on application shutdown)"""
+    global _session, _session_loop
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _session_loop = None
+
+
+def http_pool_stats() -> Dict:
+    """Get connection pool configuration and utilization counters"""
+    opened = pool_stats["connections_created"]
+    reused = pool_stats["connections_reused"]
+    
+    return {
+        "limit": HTTP_POOL_LIMIT,
+        "limit_per_host": HTTP_POOL_LIMIT_PER_HOST,
+        "dns_cache_ttl": HTTP_DNS_CACHE_TTL,
+        "keepalive_timeout": HTTP_KEEPALIVE_TIMEOUT,
+        "session_open": _session is not None and not _session.closed,
+        "connection_reuse_rate": round(reused / (opened + reused), 4) if opened + reused else 0.0,
+        **pool_stats
+    }
+
+
+# (source, query) -> extracted headlines, served stale while one task revalidates
+SEARCH_CACHE_TTL = float(os.environ.get("SEARCH_CACHE_TTL", 600))
+SEARCH_CACHE_STALE_TTL = float(os.environ.get("SEARCH_CACHE_STALE_TTL", 3600))
+SEARCH_CACHE_NEGATIVE_TTL = float(os.environ.get("SEARCH_CACHE_NEGATIVE_TTL", 60))
+
+search_cache = TTLCache(
+    max_entries=int(os.environ.get("SEARCH_CACHE_MAX_ENTRIES", 4096)),
+    ttl=SEARCH_CACHE_TTL,
+    stale_ttl=SEARCH_CACHE_STALE_TTL,
+    name="search"
+)
+_refreshing: Dict[str, asyncio.Task] = {}
+
+# Overall verification budget in seconds (0 = wait for every source)
+VERIFY_DEADLINE = float(os.environ.get("VERIFY_DEADLINE", 0))
+# Return as soon as the outstanding sources can no longer change the verdict
+VERIFY_DECISIVE = os.environ.get("VERIFY_DECISIVE", "0") == "1"
+
+# Concurrent identical work shares one in-flight task
+fetch_flight = SingleFlight(name="source_fetch")
+verify_flight = SingleFlight(name="verification")
+
+search_stats = {
+    "fetches": 0,
+    "refreshes": 0,
+    "refresh_errors": 0,
+    "refresh_skipped": 0,
+    "refresh_kept_stale": 0,
+    "negative_cached": 0
+}
+
+
+verify_stats = {
+    "runs": 0,
+    "decided_early": 0,
+    "deadline_exceeded": 0,
+    "sources_cancelled": 0
+}
+
+
+def verification_stats() -> Dict:
+    """Get early-exit / deadline counters for verification runs"""
+    return {
+        "decisive_default": VERIFY_DECISIVE,
+        "deadline_default": VERIFY_DEADLINE,
+        **verify_stats
+    }
+
+
+def coalescing_stats() -> Dict:
+    """Get request coalescing counters"""
+    return {
+        "source_fetch": fetch_flight.stats(),
+        "verification": verify_flight.stats()
+    }
+
+
+def search_cache_stats() -> Dict:
+    """Get search cache statistics"""
+    return {
+        **search_cache.stats(),
+        "negative_ttl_seconds": SEARCH_CACHE_NEGATIVE_TTL,
+        "refreshing": len(_refreshing),
+        **search_stats
+    }
+
+
+class SourceUnavailable(Exception):
+    """Raised when a source is skipped because its circuit breaker is open"""
+
 
 async def fetch_url(session: aiohttp.ClientSession, url: str, timeout: int = 5) -> str:
     """
     Fetch URL content asynchronously
     """
+    html, _ = await fetch_url_status(session, url, timeout)
+    return html
+
+
+async def fetch_url_status(session: aiohttp.ClientSession, url: str, timeout: float = 5) -> Tuple[str, bool]:
+    """
+    Fetch URL content, returning (html, ok) so callers can tell failures from empty pages
+    """
     try:
         async with session.get(url, headers=HEADERS, timeout=timeout, ssl=False) as response:
             if response.status == 200:
-                return await response.text()
-            return ""
+                return await response.text(), True
+            return "", False
+    except asyncio.CancelledError:
+        raise
     except Exception as e:
         print(f"Error fetching {url}: {e}")
-        return ""
+        return "", False
+
+
+async def _hedged_fetch(
+    session: aiohttp.ClientSession,
+    url: str,
+    timeout: float,
+    hedge_after: Optional[float],
+    health: SourceHealth
+) -> Tuple[str, bool]:
+    """
+    Fetch with an optional hedge: if the first request is still running after
+    hedge_after seconds, send a duplicate and take whichever succeeds first
+    """
+    primary = asyncio.ensure_future(fetch_url_status(session, url, timeout))
+    pending = {primary}
+    try:
+        if hedge_after is None:
+            return await primary
+        
+        done, _ = await asyncio.wait(pending, timeout=hedge_after)
+        if done:
+            return primary.result()
+        
+        health.total_hedges += 1
+        pending = {primary, asyncio.ensure_future(fetch_url_status(session, url, timeout))}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                html, ok = task.result()
+                if ok:
+                    return html, ok
+        return "", False
+    finally:
+        # Also reached when the caller is cancelled: stop both requests
+        for task in pending:
+            task.cancel()
 
 
 def extract_headlines(html: str, source: str) -> List[str]:
@@ -84,6 +336,141 @@ def extract_headlines(html: str, source: str) -> List[str]:
     return headlines[:5]
 
 
+def score_source_results(user_text: str, results: List[Dict]) -> List[Dict]:
+    """
+    Score every source's headlines against the user text in one vectorization
+    pass, adding each source's max_similarity
+    (module-level so it can run in the process pool)
+    """
+    headlines = [headline for result in results for headline in result["headlines"]]
+    similarities = batch_similarity(user_text, headlines)
+    
+    scored = []
+    offset = 0
+    for result in results:
+        count = len(result["headlines"])
+        source_scores = similarities[offset:offset + count]
+        offset += count
+        scored.append({**result, "max_similarity": max(source_scores) if source_scores else 0.0})
+    return scored
+
+
+def _search_key(source_name: str, query: str) -> str:
+    return f"{source_name}|{query}"
+
+
+async def _fetch_headlines(
+    session: aiohttp.ClientSession,
+    source_name: str,
+    query: str,
+    refresh: bool = False
+) -> List[str]:
+    """
+    Fetch and parse one source search page, storing the result in the search cache
+
+    Empty or failed fetches are negatively cached for a short time on an
+    inline miss. A background refresh that comes back empty leaves the stale
+    entry in place (stale-if-error), so it keeps being served until its
+    stale window runs out.
+    """
+    health = get_source_health(source_name)
+    if not health.allow_request():
+        raise SourceUnavailable(source_name)
+    
+    base_url = TRUSTED_SOURCES[source_name]
+    search_url = f"{base_url}{query.replace(' ', '+')}"
+    
+    # Adaptive deadline from this source's recent latencies
+    deadline = health.timeout()
+    started = time.perf_counter()
+    try:
+        html, ok = await _hedged_fetch(
+            session, search_url, deadline, health.hedge_delay(), health
+        )
+    finally:
+        health.release_probe()
+    
+    elapsed = time.perf_counter() - started
+    if ok:
+        health.record_success(elapsed)
+    elif elapsed >= deadline * 0.95:
+        # Ran into the deadline: the elapsed time is a latency sample too
+        health.record_failure(elapsed)
+    else:
+        health.record_failure()
+    
+    headlines = await run_in_process(extract_headlines, html, source_name)
+    
+    key = _search_key(source_name, query)
+    if headlines:
+        search_cache.set(key, headlines)
+    elif refresh:
+        search_stats["refresh_kept_stale"] += 1
+    else:
+        search_stats["negative_cached"] += 1
+        search_cache.set(key, headlines, ttl=SEARCH_CACHE_NEGATIVE_TTL, stale_ttl=0)
+    
+    return headlines
+
+
+async def _refresh_headlines(source_name: str, query: str):
+    """Background revalidation of a stale search cache entry"""
+    key = _search_key(source_name, query)
+    try:
+        session = await get_http_session()
+        await fetch_flight.do(key, lambda: _fetch_headlines(session, source_name, query, refresh=True))
+        search_stats["refreshes"] += 1
+    except SourceUnavailable:
+        search_stats["refresh_skipped"] += 1
+    except Exception as e:
+        search_stats["refresh_errors"] += 1
+        print(f"Background refresh failed for {key}: {e}")
+    finally:
+        if _refreshing.get(key) is asyncio.current_task():
+            del _refreshing[key]
+
+
+async def get_headlines(session: aiohttp.ClientSession, source_name: str, query: str) -> List[str]:
+    """
+    Headlines for (source, query) through the stale-while-revalidate cache
+
+    Fresh hits return immediately. Stale hits also return immediately while a
+    single background task refreshes the entry. Misses fetch inline.
+    """
+    key = _search_key(source_name, query)
+    headlines, fresh = search_cache.lookup(key)
+    
+    if headlines is MISSING:
+        search_stats["fetches"] += 1
+        return await fetch_flight.do(key, lambda: _fetch_headlines(session, source_name, query))
+    
+    if not fresh:
+        pending = _refreshing.get(key)
+        if pending is None or pending.done() or pending.get_loop() is not asyncio.get_running_loop():
+            _refreshing[key] = asyncio.ensure_future(_refresh_headlines(source_name, query))
+    
+    return headlines
+
+
+async def fetch_source(
+    session: aiohttp.ClientSession,
+    source_name: str,
+    query: str
+) -> Dict:
+    """
+    Fetch (or reuse cached) headlines for a single source, without scoring them
+    """
+    if source_name not in TRUSTED_SOURCES:
+        return {"source": source_name, "headlines": []}
+    
+    try:
+        headlines = await get_headlines(session, source_name, query)
+    except SourceUnavailable:
+        return {"source": source_name, "headlines": [], "skipped": "circuit_open"}
+    
+    return {"source": source_name, "headlines": headlines}
+
+
 async def search_source(
     session: aiohttp.ClientSession,
     source_name: str,
@@ -93,78 +480,223 @@ async def search_source(
     """
     Search a single source and return similarity scores
     """
-    if source_name not in TRUSTED_SOURCES:
-        return {"source": source_name, "headlines": [], "max_similarity": 0.0}
+    result = await fetch_source(session, source_name, query)
+    if not result["headlines"]:
+        return {**result, "max_similarity": 0.0}
     
-    # Build search URL
-    base_url = TRUSTED_SOURCES[source_name]
-    search_url = f"{base_url}{query.replace(' ', '+')}"
-    
-    # Fetch content
-    html = await fetch_url(session, search_url, timeout=8)
+    # Calculate similarity scores off the event loop
+    scored = await run_in_process(score_source_results, user_text, [result])
+    return scored[0]
+
+
+def aggregate_results(results: List[Dict], threshold: float = 0.6) -> Dict:
+    """
+    Combine per-source search results into a verification verdict
+    (sources are reported in TRUSTED_SOURCES order regardless of arrival order)
+    """
+    by_source = {result["source"]: result for result in results}
     
-    # Extract headlines
-    headlines = extract_headlines(html, source_name)
+    similarity_scores = {}
+    matching_sources = []
+    skipped = {}
     
-    # Calculate similarity scores
-    similarities = []
-    for headline in headlines:
-        score = calculate_similarity(user_text, headline)
-        similarities.append(score)
+    for source in TRUSTED_SOURCES:
+        if source not in by_source:
+            continue
+        if by_source[source].get("skipped"):
+            # Unreachable/short-circuited sources don't count as "no match"
+            skipped[source] = by_source[source]["skipped"]
+            continue
+        max_sim = by_source[source]["max_similarity"]
+        
+        similarity_scores[source] = max_sim
+        
+        if max_sim >= threshold:  # High confidence threshold
+            matching_sources.append(source)
     
-    max_similarity = max(similarities) if similarities else 0.0
+    # Determine verification status
+    status = determine_verification_status(similarity_scores, threshold=threshold)
     
     return {
-        "source": source_name,
-        "headlines": headlines,
-        "max_similarity": max_similarity
+        "status": status,
+        "sources": matching_sources,
+        "scores": similarity_scores,
+        "skipped": skipped
+    }
+
+
+async def iter_source_results(
+    text: TextLike,
+    keywords: List[str],
+    deadline: Optional[float] = None,
+    decisive: Optional[bool] = None
+) -> AsyncIterator[Dict]:
+    """
+    Search all sources concurrently, yielding each source's result as soon as it arrives
+
+    Sources still pending at the deadline, or (decisive) once the remaining
+    ones can no longer change the status, are cancelled and yielded as
+    skipped, like in verify_with_sources. text may be a utils.Document, whose
+    memoized claim type is reused for the search query.
+    """
+    if deadline is None:
+        deadline = VERIFY_DEADLINE
+    deadline = deadline if deadline and deadline > 0 else None
+    if decisive is None:
+        decisive = VERIFY_DECISIVE
+    
+    # Build search query
+    search_query = build_search_query(text, keywords)
+    text = as_text(text)
+    
+    session = await get_http_session()
+    tasks = {
+        asyncio.ensure_future(search_source(session, source, search_query, text)): source
+        for source in TRUSTED_SOURCES.keys()
     }
+    
+    loop = asyncio.get_running_loop()
+    stop_at = loop.time() + deadline if deadline else None
+    
+    results = []
+    pending = set(tasks)
+    reason = "deadline"
+    try:
+        while pending:
+            timeout = None if stop_at is None else max(0.0, stop_at - loop.time())
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                results.append(task.result())
+                yield results[-1]
+            
+            if decisive and pending and settled_verification_status(_reported_scores(results), len(pending)):
+                reason = "decided"
+                break
+            if stop_at is not None and loop.time() >= stop_at:
+                break
+        
+        verify_stats["runs"] += 1
+        if pending:
+            verify_stats["decided_early" if reason == "decided" else "deadline_exceeded"] += 1
+            verify_stats["sources_cancelled"] += len(pending)
+        for task in pending:
+            task.cancel()
+            yield {"source": tasks[task], "headlines": [], "max_similarity": 0.0, "skipped": reason}
+    finally:
+        # Consumer stopped early - don't leave fetches running
+        for task in tasks:
+            task.cancel()
 
 
-async def verify_with_sources(text: str, keywords: List[str]) -> Dict:
+async def verify_with_sources(
+    text: TextLike,
+    keywords: List[str],
+    deadline: Optional[float] = None,
+    decisive: Optional[bool] = None
+) -> Dict:
     """
     Verify text across multiple trusted sources
     
+    Concurrent calls for the same text, keywords and options share one verification run.
+    text may be a utils.Document, whose memoized claim type is reused for the search query.
+    
+    Args:
+        deadline: Overall time budget in seconds; sources still pending when it
+            expires are cancelled and reported as skipped (default VERIFY_DEADLINE, 0 = none)
+        decisive: Stop as soon as the remaining sources can no longer change the
+            status, cancelling them (default VERIFY_DECISIVE)
+    
     Returns:
         {
             "status": "Verified | Unverified | Contradictory | Breaking News",
             "sources": [list of sources that confirmed],
-            "scores": {source: similarity_score}
+            "scores": {source: similarity_score},
+            "skipped": {source: "circuit_open" | "deadline" | "decided"}
         }
     """
+    if deadline is None:
+        deadline = VERIFY_DEADLINE
+    deadline = deadline if deadline and deadline > 0 else None
+    if decisive is None:
+        decisive = VERIFY_DECISIVE
+    
+    key = content_key(as_text(text), None, tuple(keywords), deadline, decisive)
+    return await verify_flight.do(key, lambda: _verify_with_sources(text, keywords, deadline, decisive))
+
+
+def _reported_scores(results: List[Dict]) -> Dict[str, float]:
+    """Scores of the sources that actually answered"""
+    return {
+        result["source"]: result["max_similarity"]
+        for result in results
+        if not result.get("skipped")
+    }
+
+
+async def _verify_with_sources(
+    text: TextLike,
+    keywords: List[str],
+    deadline: Optional[float] = None,
+    decisive: bool = False
+) -> Dict:
+    """Run one verification across all trusted sources"""
     # Build search query
     search_query = build_search_query(text, keywords)
+    text = as_text(text)
     
-    # Search all sources concurrently
-    async with aiohttp.ClientSession() as session:
-        tasks = [
-            search_source(session, source, search_query, text)
+    # Search all sources concurrently over the shared connection pool. Decisive
+    # mode scores each source as it arrives; otherwise every headline from every
+    # source is scored together in one pass once the fetches finish.
+    session = await get_http_session()
+    if decisive:
+        tasks = {
+            asyncio.ensure_future(search_source(session, source, search_query, text)): source
             for source in TRUSTED_SOURCES.keys()
-        ]
-        
-        results = await asyncio.gather(*tasks)
+        }
+    else:
+        tasks = {
+            asyncio.ensure_future(fetch_source(session, source, search_query)): source
+            for source in TRUSTED_SOURCES.keys()
+        }
     
-    # Aggregate results
-    similarity_scores = {}
-    matching_sources = []
+    loop = asyncio.get_running_loop()
+    stop_at = loop.time() + deadline if deadline else None
+    return_when = asyncio.FIRST_COMPLETED if decisive else asyncio.ALL_COMPLETED
     
-    for result in results:
-        source = result["source"]
-        max_sim = result["max_similarity"]
-        
-        similarity_scores[source] = max_sim
+    results = []
+    pending = set(tasks)
+    reason = "deadline"
+    while pending:
+        timeout = None if stop_at is None else max(0.0, stop_at - loop.time())
+        done, pending = await asyncio.wait(pending, timeout=timeout, return_when=return_when)
+        results.extend(task.result() for task in done)
+        if not done:
+            break
         
-        if max_sim >= 0.6:  # High confidence threshold
-            matching_sources.append(source)
+        # Decisive mode: stop once no combination of the outstanding sources can change the verdict
+        if decisive and pending and settled_verification_status(_reported_scores(results), len(pending)):
+            reason = "decided"
+            break
+        if stop_at is not None and loop.time() >= stop_at:
+            break
     
-    # Determine verification status
-    status = determine_verification_status(similarity_scores, threshold=0.6)
+    verify_stats["runs"] += 1
+    if pending:
+        verify_stats["decided_early" if reason == "decided" else "deadline_exceeded"] += 1
+        verify_stats["sources_cancelled"] += len(pending)
     
-    return {
-        "status": status,
-        "sources": matching_sources,
-        "scores": similarity_scores
-    }
+    for task in pending:
+        task.cancel()
+    if not decisive:
+        results = await run_in_process(score_source_results, text, results)
+    results.extend(
+        {"source": tasks[task], "headlines": [], "max_similarity": 0.0, "skipped": reason}
+        for task in pending
+    )
+    
+    return aggregate_results(results)
 
 
 async def verify_government_source(claim: str, country: str = "US") -> bool:
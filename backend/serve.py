@@ -0,0 +1,179 @@
+"""
+Pre-fork server - Several uvicorn workers sharing the models loaded once in the parent
+
+`uvicorn main:app --workers N` spawns N fresh interpreters, and each one loads
+the classifier, IDF table, NLP resources and (when used) the summarizer,
+embeddings and FAISS index on its own, so memory grows with every worker.
+Here the parent imports main, loads PRELOAD_COMPONENTS, binds the listening
+socket and only then forks: the workers start with every read-only model
+already in memory, shared with the parent copy-on-write.
+
+Before forking the parent runs gc.freeze(). Objects that exist at that point
+move to a permanent generation the workers' collector never scans, so a
+collection doesn't write to (and un-share) the pages holding the models.
+Reference counting still dirties the pages of objects a worker touches; large
+numpy buffers, the memory-mapped artifacts and torch tensors stay shared.
+
+The parent restarts workers that die and forwards SIGTERM/SIGINT for a
+graceful shutdown. Linux/macOS only (needs os.fork).
+
+Usage (from backend/):
+    python serve.py [--workers 4] [--host 0.0.0.0] [--port 8000]
+"""
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict, List
+
+SERVE_WORKERS = int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+
+# Components loaded in the parent before forking (see warmup.COMPONENTS);
+# ones that can't load here are skipped and stay lazy in the workers
+PRELOAD_COMPONENTS = [
+    name.strip()
+    for name in os.environ.get("PRELOAD_COMPONENTS", "idf,nlp,summarizer,embeddings,vectorstore").split(",")
+    if name.strip()
+]
+
+# Move everything loaded before the fork out of the collector's reach (see above)
+SERVE_GC_FREEZE = os.environ.get("SERVE_GC_FREEZE", "1") == "1"
+
+# A worker that exits within this many seconds of starting counts as a crash loop
+RESTART_BACKOFF_SECONDS = float(os.environ.get("SERVE_RESTART_BACKOFF", 1))
+
+
+def preload(components: List[str]):
+    """Import the app and load the shared models (runs once, in the parent)"""
+    # No collections while loading: objects created now are frozen below anyway
+    gc.disable()
+
+    import main
+    from warmup import get_warmup
+
+    warmup = get_warmup()
+    for name in components:
+        if name in warmup.components:
+            warmup.warm(name)
+        else:
+            print(f"⚠️ Unknown preload component: {name}")
+
+    if main.model_registry.model is None:
+        print("⚠️ No model loaded; workers will answer /predict with 503")
+
+    gc.collect()
+    if SERVE_GC_FREEZE:
+        gc.freeze()
+    print(f"✓ Preloaded {', '.join(components) or 'the app'}; {gc.get_freeze_count()} objects frozen")
+    return main.app
+
+
+def bind(host: str, port: int) -> socket.socket:
+    """The listening socket every worker accepts on"""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(app, sock: socket.socket, log_level: str):
+    """Serve in a forked child until told to stop"""
+    import uvicorn
+
+    # Default signal handling back (uvicorn installs its own) and collection on
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    gc.enable()
+
+    config = uvicorn.Config(app, log_level=log_level, lifespan="on")
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class Arbiter:
+    """Forks the workers and keeps the configured number running"""
+
+    def __init__(self, app, sock: socket.socket, workers: int, log_level: str = "info"):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.log_level = log_level
+        self.children: Dict[int, float] = {}
+        self.stopping = False
+
+    def spawn(self):
+        sys.stdout.flush()
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                run_worker(self.app, self.sock, self.log_level)
+            except BaseException as e:
+                print(f"✗ Worker {os.getpid()} failed: {e}")
+                code = 1
+            finally:
+                os._exit(code)
+        self.children[pid] = time.monotonic()
+
+    def stop(self, signum, frame):
+        self.stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        for _ in range(self.workers):
+            self.spawn()
+        print(f"✓ Serving on {self.sock.getsockname()[:2]} with {self.workers} workers (parent {os.getpid()})")
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+
+            started = self.children.pop(pid, None)
+            if self.stopping or started is None:
+                continue
+
+            print(f"⚠️ Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}; restarting")
+            if time.monotonic() - started < RESTART_BACKOFF_SECONDS:
+                time.sleep(RESTART_BACKOFF_SECONDS)
+            if not self.stopping:
+                self.spawn()
+
+        self.sock.close()
+        print("✓ All workers stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workers', type=int, default=SERVE_WORKERS)
+    parser.add_argument('--host', default=os.environ.get("HOST", "0.0.0.0"))
+    parser.add_argument('--port', type=int, default=int(os.environ.get("PORT", 8000)))
+    parser.add_argument('--log-level', default=os.environ.get("LOG_LEVEL", "info").lower())
+    args = parser.parse_args()
+
+    if not hasattr(os, "fork"):
+        sys.exit("✗ Pre-fork mode needs os.fork; use uvicorn main:app --workers N instead")
+
+    app = preload(PRELOAD_COMPONENTS)
+    sock = bind(args.host, args.port)
+    Arbiter(app, sock, args.workers, args.log_level).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
-from typing import List
+from typing import List, Tuple
 
 app = FastAPI()
 
@@ -11,6 +11,7 @@ class SummarizeRequest(BaseModel):
 class SummarizeResponse(BaseModel):
     summary: str
     key_sentences: List[str]
+    key_sentence_offsets: List[Tuple[int, int]] = []
     original_length: int
     summary_length: int
     compression_ratio: float
@@ -20,14 +21,15 @@ async def summarize_endpoint(request: SummarizeRequest):
     """
     Standalone text summarization endpoint
     """
-    from utils import summarize_text, extract_key_sentences
+    from utils import summarize_with_offsets
+    from executors import run_in_process
     
     if not request.text or len(request.text.strip()) < 50:
         raise HTTPException(status_code=400, detail="Text too short for summarization")
     
     try:
-        summary = summarize_text(request.text, request.num_sentences)
-        key_sentences = extract_key_sentences(request.text, num_sentences=5)
+        summaries = await run_in_process(summarize_with_offsets, request.text, request.num_sentences, 5)
+        summary = summaries["summary"]
         
         original_len = len(request.text)
         summary_len = len(summary)
@@ -35,7 +37,8 @@ async def summarize_endpoint(request: SummarizeRequest):
         
         return SummarizeResponse(
             summary=summary,
-            key_sentences=key_sentences,
+            key_sentences=summaries["key_sentences"],
+            key_sentence_offsets=summaries["key_sentence_offsets"],
             original_length=original_len,
             summary_length=summary_len,
             compression_ratio=compression
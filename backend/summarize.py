@@ -3,16 +3,15 @@ Advanced summarization using HuggingFace transformers
 Supports multiple models with fallback
 """
 
+import importlib.util
+import threading
 from typing import Optional
 import warnings
 warnings.filterwarnings('ignore')
 
-# Try to import transformers
-try:
-    from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
-    TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    TRANSFORMERS_AVAILABLE = False
+# transformers (and torch) are imported when the summarizer is created, not at startup
+TRANSFORMERS_AVAILABLE = importlib.util.find_spec("transformers") is not None
+if not TRANSFORMERS_AVAILABLE:
     print("⚠️ Transformers not available. Using TF-IDF fallback.")
 
 from utils import summarize_text as tfidf_summarize
@@ -35,6 +34,7 @@ class AdvancedSummarizer:
         if TRANSFORMERS_AVAILABLE:
             try:
                 print(f"Loading summarization model: {model_name}...")
+                from transformers import pipeline
                 self.summarizer = pipeline(
                     "summarization",
                     model=model_name,
@@ -70,13 +70,8 @@ class AdvancedSummarizer:
         
         if self.method == "transformers" and self.summarizer:
             try:
-                # Truncate if too long (BART has 1024 token limit)
-                max_input_length = 1024
-                if len(text.split()) > max_input_length:
-                    text = ' '.join(text.split()[:max_input_length])
-                
                 result = self.summarizer(
-                    text,
+                    _truncate(text),
                     max_length=max_length,
                     min_length=min_length,
                     do_sample=False
@@ -93,19 +88,66 @@ class AdvancedSummarizer:
             # TF-IDF fallback
             return tfidf_summarize(text, num_sentences)
     
-    def batch_summarize(self, texts: list, **kwargs) -> list:
-        """Summarize multiple texts"""
-        return [self.summarize(text, **kwargs) for text in texts]
+    def batch_summarize(
+        self,
+        texts: list,
+        max_length: int = 150,
+        min_length: int = 40,
+        num_sentences: int = 3
+    ) -> list:
+        """
+        Summarize multiple texts
+        
+        With transformers, every text long enough to summarize goes through
+        the pipeline in one call (the model server batches requests this way).
+        """
+        if self.method != "transformers" or not self.summarizer:
+            return [self.summarize(text, max_length, min_length, num_sentences) for text in texts]
+        
+        results = list(texts)
+        long = [i for i, text in enumerate(texts) if text and len(text.strip()) >= 100]
+        if not long:
+            return results
+        
+        try:
+            outputs = self.summarizer(
+                [_truncate(texts[i]) for i in long],
+                max_length=max_length,
+                min_length=min_length,
+                do_sample=False
+            )
+            for i, output in zip(long, outputs):
+                results[i] = output['summary_text']
+        
+        except Exception as e:
+            print(f"Transformer summarization failed: {e}")
+            for i in long:
+                results[i] = tfidf_summarize(texts[i], num_sentences)
+        
+        return results
+
+
+def _truncate(text: str, max_input_length: int = 1024) -> str:
+    """Truncate if too long (BART has 1024 token limit)"""
+    words = text.split()
+    if len(words) > max_input_length:
+        return ' '.join(words[:max_input_length])
+    return text
 
 
 # Global instance
 _summarizer = None
+_summarizer_lock = threading.Lock()
 
 def get_summarizer() -> AdvancedSummarizer:
-    """Get or create global summarizer"""
+    """Get or create global summarizer (once, even when warm-up and a request race)"""
     global _summarizer
     if _summarizer is None:
-        _summarizer = AdvancedSummarizer()
+        with _summarizer_lock:
+            if _summarizer is None:
+                from model_server import MODEL_SERVER_SOCKET, RemoteSummarizer
+                # With a model server the distilbart pipeline lives there, not in every worker
+                _summarizer = RemoteSummarizer() if MODEL_SERVER_SOCKET else AdvancedSummarizer()
     return _summarizer
 
 
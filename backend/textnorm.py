@@ -0,0 +1,127 @@
+"""
+Model-input text normalizer - One compiled normalizer for training and serving
+
+Produces exactly what the Flask demo's `wordpre` chain produced (lowercase,
+drop [bracketed] spans, drop words containing digits, drop underscores, turn
+every other non-word character into a space), with a few precompiled
+passes instead of eight `re.sub` calls (one translate and one regex for
+ASCII text). Steps of the old chain that could never match after `\\W` had
+already been replaced (URLs, HTML tags, newlines) fall away.
+
+Training scripts put normalize_batch at the front of the model pipeline, so a
+trained model carries its own normalization and every app that loads it
+(Flask demo, FastAPI backend) feeds it identical input. Older pickles get
+the same step from with_normalizer() when they are loaded.
+"""
+
+import re
+from typing import Iterable, List
+
+# [bracketed] spans (non-greedy, single line) go first, as in the old chain, so
+# "ab[x]1" becomes "ab1" and is then dropped as a word containing a digit
+_BRACKET = re.compile(r'\[[^\]\n]*\]')
+
+# General path, one pass each: whole words containing a digit (anchored at the
+# word start, no backtracking) and underscores (string.punctuation includes
+# "_", \W does not) are removed; every other non-word character becomes a space
+_REMOVE = re.compile(r'\b[^\W\d]*\d\w*|_')
+_NON_WORD = re.compile(r'\W')
+
+# ASCII fast path: non-ASCII punctuation (curly quotes, dashes) is mapped to
+# spaces first; if nothing non-ASCII is left, one bytes.translate maps \W to
+# spaces and deletes underscores, and a bytes regex drops the digit words
+# (\x00 is kept so batches can be split again afterwards)
+_NON_ASCII_NON_WORD = re.compile(r'[^\w\x00-\x7f]')
+_ASCII_TABLE = bytes(
+    byte if chr(byte).isalnum() or byte == 0 else ord(" ")
+    for byte in range(128)
+) + b" " * 128
+_ASCII_DIGIT_WORD = re.compile(rb'\b[a-z]*[0-9][a-z0-9]*')
+
+# Texts joined per normalize_batch chunk
+BATCH_CHUNK = 1000
+
+
+def normalize(text: str) -> str:
+    """Normalize one text for the classifier"""
+    if not text:
+        return ""
+    lowered = _prepare(text)
+    if lowered.isascii():
+        return _normalize_ascii(lowered)
+    return _NON_WORD.sub(" ", _REMOVE.sub("", lowered))
+
+
+def _prepare(text: str) -> str:
+    """Lowercase, drop [bracketed] spans, map non-ASCII punctuation to spaces"""
+    # \x00 is the normalize_batch separator; as a non-word character it would become a space anyway
+    if "\x00" in text:
+        text = text.replace("\x00", " ")
+    lowered = text.lower()
+    if "[" in lowered:
+        lowered = _BRACKET.sub("", lowered)
+    if not lowered.isascii():
+        lowered = _NON_ASCII_NON_WORD.sub(" ", lowered)
+    return lowered
+
+
+def _normalize_ascii(lowered: str) -> str:
+    data = lowered.encode("ascii").translate(_ASCII_TABLE, b"_")
+    return _ASCII_DIGIT_WORD.sub(b"", data).decode("ascii")
+
+
+def normalize_batch(texts: Iterable[str]) -> List[str]:
+    """
+    Normalize many texts, same output as [normalize(t) for t in texts]
+
+    Texts that are plain ASCII after preparation (most news text) are joined
+    with \x00 - a non-word byte, so it also ends any word - and go through
+    the translate and digit-word passes once per chunk instead of once per
+    text. Accepts lists, tuples or a pandas Series (NaN becomes "").
+    """
+    normalized: List[str] = []
+    ascii_rows: List[int] = []
+    ascii_texts: List[str] = []
+
+    for text in texts:
+        if not isinstance(text, str) or not text:
+            normalized.append("")
+            continue
+        lowered = _prepare(text)
+        if lowered.isascii():
+            ascii_rows.append(len(normalized))
+            ascii_texts.append(lowered)
+            normalized.append("")
+        else:
+            normalized.append(_NON_WORD.sub(" ", _REMOVE.sub("", lowered)))
+
+    for i in range(0, len(ascii_texts), BATCH_CHUNK):
+        chunk = _normalize_ascii("\x00".join(ascii_texts[i:i + BATCH_CHUNK])).split("\x00")
+        for row, value in zip(ascii_rows[i:i + BATCH_CHUNK], chunk):
+            normalized[row] = value
+    return normalized
+
+
+def has_normalizer(model) -> bool:
+    """Whether a model is a Pipeline whose first step is normalize_batch"""
+    steps = getattr(model, "steps", None)
+    return bool(steps) and getattr(steps[0][1], "func", None) is normalize_batch
+
+
+def with_normalizer(model):
+    """
+    The model with normalize_batch in front of it
+
+    Pipelines trained by the current scripts already start with the step and
+    are returned as is; older pickles (trained on pre-normalized text) get it
+    prepended, so every app can feed raw text and nothing normalizes twice.
+    """
+    if has_normalizer(model):
+        return model
+
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import FunctionTransformer
+
+    norm = FunctionTransformer(normalize_batch).fit([""])
+    steps = list(model.steps) if isinstance(model, Pipeline) else [("model", model)]
+    return Pipeline([("norm", norm)] + steps)
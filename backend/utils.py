@@ -1,72 +1,303 @@
 import re
-from typing import List, Dict
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import nltk
+import sys
+import threading
+import numpy as np
+from typing import Any, Callable, Iterable, Iterator, List, Dict, Optional, Tuple, Union
 from collections import Counter
 
-# Download required NLTK data (run once)
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords', quiet=True)
+from idf import get_global_idf
+from matcher import get_matcher
 
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt', quiet=True)
+# scikit-learn and NLTK are imported on first use (or by the startup warm-up),
+# so importing this module stays cheap for processes that only serve /predict
+_stop_words: Optional[frozenset] = None
+_stop_words_lock = threading.Lock()
 
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 
-STOP_WORDS = set(stopwords.words('english'))
+def _load_stop_words() -> Iterable[str]:
+    """NLTK's English stop words, downloading the corpus if missing"""
+    import nltk
+    try:
+        nltk.data.find('corpora/stopwords')
+    except LookupError:
+        nltk.download('stopwords', quiet=True)
+    
+    try:
+        from nltk.corpus import stopwords
+        return stopwords.words('english')
+    except LookupError:
+        # No corpus and no network: scikit-learn's list keeps keywords working
+        from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+        print("⚠️ NLTK stopwords not available, using scikit-learn's English list")
+        return ENGLISH_STOP_WORDS
+
+
+def get_stop_words() -> frozenset:
+    """Shared stop word set, loaded once"""
+    global _stop_words
+    if _stop_words is None:
+        with _stop_words_lock:
+            if _stop_words is None:
+                _stop_words = frozenset(map(sys.intern, _load_stop_words()))
+    return _stop_words
+
+
+def __getattr__(name: str) -> Any:
+    # utils.STOP_WORDS is still available, loaded on first access
+    if name == "STOP_WORDS":
+        return get_stop_words()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
 
 
-def clean_text(text: str) -> str:
+class Document:
+    """
+    Text plus lazily computed, memoized analysis views
+
+    Build one per request and pass it to the utils/claims functions instead of
+    the raw string: cleaning, tokenization, sentence splitting, sentence
+    TF-IDF scores, keywords and claims are then computed at most once no
+    matter how many stages ask for them. Views are computed under a lock, so
+    stages running on different threads share the work. Sharing across stages
+    only happens in-process: a Document sent to the process pool is a copy,
+    and views computed there do not come back. Views needed by several stages
+    are computed with compute() before the Document is dispatched, so every
+    copy carries them.
+    """
+    
+    def __init__(self, text: Optional[str]):
+        self.text = text or ""
+        self._views: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+    
+    def __getstate__(self):
+        return {"text": self.text, "_views": dict(self._views)}
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+    
+    def __repr__(self) -> str:
+        return f"Document({self.text[:40]!r}, views={sorted(self._views)})"
+    
+    def memo(self, name: str, compute: Callable[[], Any]) -> Any:
+        """Return the view called name, computing it on first use"""
+        try:
+            return self._views[name]
+        except KeyError:
+            pass
+        with self._lock:
+            if name not in self._views:
+                self._views[name] = compute()
+            return self._views[name]
+    
+    @property
+    def cleaned(self) -> str:
+        return self.memo("cleaned", lambda: _clean(self.text))
+    
+    @property
+    def tokens(self) -> List[str]:
+        return self.memo("tokens", lambda: list(iter_tokens(self.cleaned)))
+    
+    @property
+    def keyword_counts(self) -> Counter:
+        """Frequency of non-stopword tokens longer than 3 characters"""
+        return self.memo("keyword_counts", lambda: _keyword_counts(self.tokens))
+    
+    @property
+    def sentence_spans(self) -> np.ndarray:
+        """(start, end) offsets of each sentence in text, shape (n, 2)"""
+        return self.memo("sentence_spans", lambda: sentence_spans(self.text))
+    
+    @property
+    def sentences(self) -> List[str]:
+        """Sentence strings (prefer sentence_spans + sentence() to avoid the copies)"""
+        return self.memo("sentences", lambda: list(iter_span_text(self.text, self.sentence_spans)))
+    
+    def compute(self, *names: str) -> "Document":
+        """Compute the named views now (before the Document is copied to the process pool)"""
+        for name in names:
+            getattr(self, name)
+        return self
+    
+    def sentence(self, i: int) -> str:
+        start, end = self.sentence_spans[i]
+        return self.text[start:end]
+    
+    @property
+    def sentence_scores(self) -> np.ndarray:
+        """Sum of TF-IDF weights per sentence"""
+        return self.memo("sentence_scores", lambda: sentence_tfidf_scores(
+            iter_span_text(self.text, self.sentence_spans), max_features=100
+        ))
+    
+    @property
+    def claim_type(self) -> str:
+        return self.memo("claim_type", lambda: _claim_type(self.text))
+
+
+TextLike = Union[str, Document]
+
+
+def as_document(text: TextLike) -> Document:
+    """Wrap a string in a Document (Documents are returned unchanged)"""
+    return text if isinstance(text, Document) else Document(text)
+
+
+def as_text(text: TextLike) -> str:
+    """The raw text of a string or Document"""
+    return text.text if isinstance(text, Document) else text
+
+
+def sentence_spans(text: str) -> np.ndarray:
+    """
+    Sentence boundaries as an (n, 2) array of (start, end) offsets into text
+    
+    Same segmentation as SENTENCE_SPLIT.split(text) - text[start:end] gives
+    each piece, including the empty one split() returns for empty text or
+    trailing whitespace after the final punctuation - without copying any text.
+    """
+    bounds = [0]
+    for match in SENTENCE_SPLIT.finditer(text):
+        bounds.append(match.start())
+        bounds.append(match.end())
+    bounds.append(len(text))
+    return np.asarray(bounds, dtype=np.int64).reshape(-1, 2)
+
+
+def iter_span_text(text: str, spans: np.ndarray) -> Iterator[str]:
+    """Slice each (start, end) span out of text, one at a time"""
+    for start, end in spans.tolist():
+        yield text[start:end]
+
+
+def clean_text(text: TextLike) -> str:
     """
     Clean and normalize text
     """
-    # Remove special characters, URLs, extra spaces
-    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
-    text = re.sub(r'\@\w+|\#', '', text)
-    text = re.sub(r'[^A-Za-z0-9\s]+', ' ', text)
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text.lower()
+    if isinstance(text, Document):
+        return text.cleaned
+    return _clean(text)
+
+
+# One left-to-right pass equivalent to the original four substitutions
+# (URLs removed, then @mentions and '#', then other symbols -> space, then whitespace collapsed):
+#   url     - tried first, so it wins at every position where the first pass would start
+#   mention - stops before an embedded URL, which the first pass would have removed already
+#   hash    - removed, joining its neighbours
+#   at      - an '@' that doesn't start a mention is just another symbol
+#   punct   - any other run of non-alphanumerics
+_CLEAN_PATTERN = re.compile(
+    r'(?P<url>(?:http|www)\S+)'
+    r'|(?P<mention>@(?:(?!http\S|www\S)\w)+)'
+    r'|(?P<hash>\#)'
+    r'|(?P<at>@)'
+    r'|(?P<punct>[^A-Za-z0-9\s@#]+)'
+)
+
+
+def _clean_sub(match) -> str:
+    return '' if match.lastgroup in ('url', 'mention', 'hash') else ' '
+
+
+def _clean(text: str) -> str:
+    return ' '.join(_CLEAN_PATTERN.sub(_clean_sub, text).split()).lower()
+
+
+# Words NLTK's Treebank tokenizer splits even without punctuation (its
+# CONTRACTIONS2 rules). Cleaned text has no apostrophes or periods, so these
+# are the only places word_tokenize differs from a whitespace split.
+_TREEBANK_SPLITS = {
+    'cannot': ('can', 'not'),
+    'gimme': ('gim', 'me'),
+    'gonna': ('gon', 'na'),
+    'gotta': ('got', 'ta'),
+    'lemme': ('lem', 'me'),
+    'wanna': ('wan', 'na')
+}
+_TOKEN = re.compile(r'\S+')
 
 
-def extract_keywords(text: str, top_n: int = 10) -> List[str]:
+def iter_tokens(cleaned: str) -> Iterator[str]:
+    """
+    Stream tokens from clean_text() output, matching NLTK word_tokenize
+    without loading Punkt or running the Treebank regex cascade
+    """
+    for match in _TOKEN.finditer(cleaned):
+        token = match.group()
+        split = _TREEBANK_SPLITS.get(token)
+        if split is None:
+            yield token
+        else:
+            yield from split
+
+
+def tokenize(text: TextLike) -> List[str]:
+    """Clean and tokenize text"""
+    if isinstance(text, Document):
+        return text.tokens
+    return list(iter_tokens(_clean(text)))
+
+
+def _keyword_counts(tokens: Iterable[str]) -> Counter:
+    """Frequency of non-stopword tokens longer than 3 characters"""
+    stop_words = get_stop_words()
+    return Counter(
+        word for word in tokens
+        if len(word) > 3 and word not in stop_words
+    )
+
+
+def extract_keywords(text: TextLike, top_n: int = 10) -> List[str]:
     """
     Extract top keywords from text using TF-IDF and frequency
     """
-    cleaned = clean_text(text)
-    
-    # Tokenize
-    tokens = word_tokenize(cleaned)
-    
-    # Remove stopwords and short words
-    keywords = [
-        word for word in tokens 
-        if word not in STOP_WORDS and len(word) > 3
-    ]
+    if isinstance(text, Document):
+        # Tokenized, stopword-filtered counts (memoized on the Document)
+        word_freq = text.keyword_counts
+    else:
+        # Stream tokens straight into the counter, no intermediate lists
+        word_freq = _keyword_counts(iter_tokens(_clean(text)))
     
     # Get most frequent keywords
-    word_freq = Counter(keywords)
     top_keywords = [word for word, _ in word_freq.most_common(top_n)]
     
     return top_keywords
 
 
-def calculate_similarity(text1: str, text2: str) -> float:
+def extract_keywords_batch(texts: Iterable[TextLike], top_n: int = 10) -> List[List[str]]:
+    """
+    Keywords for many documents in one call (one process-pool round trip)
+    """
+    return [extract_keywords(text, top_n) for text in texts]
+
+
+PAIR_MAX_FEATURES = 1000
+# Smoothed idf for a term in one of the two documents of a pair: ln((1 + 2) / (1 + 1)) + 1
+_PAIR_IDF_ONE_DOC = float(np.log(1.5) + 1.0)
+
+
+def calculate_similarity(text1: TextLike, text2: TextLike) -> float:
     """
     Calculate cosine similarity between two texts using TF-IDF
     """
+    text1, text2 = as_text(text1), as_text(text2)
     if not text1 or not text2:
         return 0.0
     
+    global_idf = get_global_idf()
+    if global_idf is not None:
+        vectors = global_idf.transform([text1, text2])
+        return float(vectors[0].multiply(vectors[1]).sum())
+    
     try:
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.metrics.pairwise import cosine_similarity
+        
         vectorizer = TfidfVectorizer(
             stop_words='english',
-            max_features=1000,
+            max_features=PAIR_MAX_FEATURES,
             ngram_range=(1, 2)
         )
         
@@ -80,28 +311,100 @@ def calculate_similarity(text1: str, text2: str) -> float:
         return 0.0
 
 
-def detect_claim_type(text: str) -> str:
+def batch_similarity(text: TextLike, headlines: List[str]) -> List[float]:
     """
-    Detect type of claim (death, policy, law, etc.)
+    Similarity of one text against many headlines in a single vectorization pass
+    
+    Returns exactly what calculate_similarity(text, headline) would for each
+    headline. With the global IDF table that is one transform and one sparse
+    product. Without it, the per-pair TF-IDF fit only ever sees two documents, so a
+    term's idf is 1 when both documents contain it and ln(1.5) + 1 otherwise;
+    with raw counts from one shared vocabulary, every pair's dot product and
+    norms follow from a few sparse matrix products.
     """
-    text_lower = text.lower()
+    text = as_text(text)
+    if not headlines:
+        return []
+    if not text:
+        return [0.0] * len(headlines)
+    
+    global_idf = get_global_idf()
+    if global_idf is not None:
+        # Rows are already L2-normalized, so cosine is a plain dot product
+        vectors = global_idf.transform([text] + list(headlines))
+        scores = np.asarray((vectors[1:] @ vectors[0].T).todense()).ravel()
+        return [float(score) if headline else 0.0 for score, headline in zip(scores, headlines)]
+    
+    from sklearn.feature_extraction.text import CountVectorizer
+    
+    try:
+        counts = CountVectorizer(
+            stop_words='english',
+            ngram_range=(1, 2)
+        ).fit_transform([text] + list(headlines)).astype(np.float64)
+    except ValueError:
+        # No usable terms anywhere (e.g. only stop words)
+        return [0.0] * len(headlines)
+    
+    user = counts[0]
+    heads = counts[1:]
+    user_present = (user > 0).astype(np.float64)
+    head_present = (heads > 0).astype(np.float64)
+    
+    # Terms shared by the user text and each headline (idf 1 in that pair)
+    dot = np.asarray((heads @ user.T).todense()).ravel()
+    shared_user_sq = np.asarray((head_present @ user.multiply(user).T).todense()).ravel()
+    shared_head_sq = np.asarray((heads.multiply(heads) @ user_present.T).todense()).ravel()
+    shared_terms = np.asarray((head_present @ user_present.T).todense()).ravel()
     
-    if any(word in text_lower for word in ['died', 'death', 'dead', 'passed away', 'killed']):
-        return 'death'
+    idf_sq = _PAIR_IDF_ONE_DOC ** 2
+    user_sq = user.multiply(user).sum()
+    head_sq = np.asarray(heads.multiply(heads).sum(axis=1)).ravel()
     
-    if any(word in text_lower for word in ['law', 'legislation', 'bill', 'act', 'regulation']):
-        return 'law'
+    user_norm_sq = idf_sq * user_sq - (idf_sq - 1.0) * shared_user_sq
+    head_norm_sq = idf_sq * head_sq - (idf_sq - 1.0) * shared_head_sq
+    denom = np.sqrt(user_norm_sq * head_norm_sq)
     
-    if any(word in text_lower for word in ['policy', 'government', 'minister', 'president', 'prime minister']):
-        return 'policy'
+    scores = np.divide(dot, denom, out=np.zeros_like(dot), where=denom > 0)
     
-    if any(word in text_lower for word in ['celebrity', 'actor', 'actress', 'star', 'famous']):
-        return 'celebrity'
+    # Pairs whose joint vocabulary exceeds max_features are truncated by the
+    # per-pair vectorizer; score those the slow way to keep results identical
+    pair_terms = user_present.sum() + np.asarray(head_present.sum(axis=1)).ravel() - shared_terms
+    results = [float(score) for score in scores]
+    for i in np.flatnonzero(pair_terms > PAIR_MAX_FEATURES):
+        results[i] = calculate_similarity(text, headlines[i])
+    for i, headline in enumerate(headlines):
+        if not headline:
+            results[i] = 0.0
     
-    return 'general'
+    return results
 
 
-def build_search_query(text: str, keywords: List[str]) -> str:
+def detect_claim_type(text: TextLike) -> str:
+    """
+    Detect type of claim (death, policy, law, etc.)
+    """
+    if isinstance(text, Document):
+        return text.claim_type
+    return _claim_type(text)
+
+
+# Checked in this order; the first category found in the text wins
+CLAIM_TYPE_LEXICON = {
+    'death': ['died', 'death', 'dead', 'passed away', 'killed'],
+    'law': ['law', 'legislation', 'bill', 'act', 'regulation'],
+    'policy': ['policy', 'government', 'minister', 'president', 'prime minister'],
+    'celebrity': ['celebrity', 'actor', 'actress', 'star', 'famous']
+}
+CLAIM_TYPE_ORDER = ('death', 'law', 'policy', 'celebrity')
+
+
+def _claim_type(text: str) -> str:
+    matcher = get_matcher("claim_type", CLAIM_TYPE_LEXICON)
+    return matcher.first_category(text, CLAIM_TYPE_ORDER) or 'general'
+
+
+def build_search_query(text: TextLike, keywords: List[str]) -> str:
     """
     Build optimized search query from text and keywords
     """
@@ -148,7 +451,54 @@ def determine_verification_status(
         return "Unverified"
 
 
-def summarize_text(text: str, num_sentences: int = 3) -> str:
+def settled_verification_status(
+    similarity_scores: Dict[str, float],
+    remaining: int,
+    threshold: float = 0.6
+) -> Optional[str]:
+    """
+    Return the verification status if `remaining` unreported sources can no
+    longer change it, else None
+    
+    Each remaining source can only add one high, medium or low score, so every
+    possible outcome is checked against determine_verification_status.
+    """
+    outcomes = set()
+    for high in range(remaining + 1):
+        for medium in range(remaining - high + 1):
+            low = remaining - high - medium
+            scores = dict(similarity_scores)
+            scores.update({f"_high{i}": threshold for i in range(high)})
+            scores.update({f"_medium{i}": 0.4 for i in range(medium)})
+            scores.update({f"_low{i}": 0.0 for i in range(low)})
+            outcomes.add(determine_verification_status(scores, threshold=threshold))
+            if len(outcomes) > 1:
+                return None
+    return outcomes.pop()
+
+
+def sentence_tfidf_scores(sentences: Iterable[str], max_features: int = 100) -> np.ndarray:
+    """
+    Sum of each sentence's TF-IDF weights
+    
+    Uses the corpus-level IDF table when available (transform only);
+    otherwise fits a TF-IDF on the sentences themselves.
+    """
+    global_idf = get_global_idf()
+    if global_idf is not None:
+        return global_idf.transform(sentences).sum(axis=1).A1
+    
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    
+    vectorizer = TfidfVectorizer(
+        stop_words='english',
+        max_features=max_features,
+        lowercase=True
+    )
+    return vectorizer.fit_transform(sentences).sum(axis=1).A1
+
+
+def summarize_text(text: TextLike, num_sentences: int = 3) -> str:
     """
     Extractive text summarization using TF-IDF sentence scoring
     
@@ -159,27 +509,21 @@ def summarize_text(text: str, num_sentences: int = 3) -> str:
     Returns:
         Summarized text
     """
+    doc = as_document(text)
+    text = doc.text
+    
     if not text or len(text.strip()) < 100:
         return text
     
-    # Split into sentences
-    sentences = re.split(r'(?<=[.!?])\s+', text)
+    # Split into sentence spans (offsets only, no copies)
+    spans = doc.sentence_spans
     
-    if len(sentences) <= num_sentences:
+    if len(spans) <= num_sentences:
         return text
     
     try:
-        # Create TF-IDF matrix for sentences
-        vectorizer = TfidfVectorizer(
-            stop_words='english',
-            max_features=100,
-            lowercase=True
-        )
-        
-        tfidf_matrix = vectorizer.fit_transform(sentences)
-        
         # Calculate sentence scores (sum of TF-IDF values)
-        sentence_scores = tfidf_matrix.sum(axis=1).A1
+        sentence_scores = doc.sentence_scores
         
         # Get top N sentence indices
         top_indices = sentence_scores.argsort()[-num_sentences:][::-1]
@@ -187,47 +531,80 @@ def summarize_text(text: str, num_sentences: int = 3) -> str:
         # Sort indices to maintain original order
         top_indices_sorted = sorted(top_indices)
         
-        # Build summary
-        summary_sentences = [sentences[i] for i in top_indices_sorted]
-        summary = ' '.join(summary_sentences)
+        # Build summary (only the chosen sentences are sliced out)
+        summary = ' '.join(iter_span_text(text, spans[top_indices_sorted]))
         
         return summary
     
     except Exception as e:
         print(f"Summarization error: {e}")
         # Fallback: return first N sentences
-        return ' '.join(sentences[:num_sentences])
+        return ' '.join(iter_span_text(text, spans[:num_sentences]))
 
 
-def extract_key_sentences(text: str, num_sentences: int = 5) -> List[str]:
+def extract_key_sentences(text: TextLike, num_sentences: int = 5) -> List[str]:
     """
     Extract most important sentences from text using TF-IDF
     
     Returns:
         List of key sentences
     """
-    if not text:
-        return []
+    doc = as_document(text)
+    return list(iter_span_text(doc.text, key_sentence_spans(doc, num_sentences)))
+
+
+def key_sentence_spans(text: TextLike, num_sentences: int = 5) -> np.ndarray:
+    """
+    (start, end) offsets of the most important sentences, in text order
+    """
+    doc = as_document(text)
+    if not doc.text:
+        return np.zeros((0, 2), dtype=np.int64)
     
-    sentences = re.split(r'(?<=[.!?])\s+', text)
+    spans = doc.sentence_spans
     
-    if len(sentences) <= num_sentences:
-        return sentences
+    if len(spans) <= num_sentences:
+        return spans
     
     try:
-        vectorizer = TfidfVectorizer(
-            stop_words='english',
-            max_features=100
-        )
-        
-        tfidf_matrix = vectorizer.fit_transform(sentences)
-        sentence_scores = tfidf_matrix.sum(axis=1).A1
+        sentence_scores = doc.sentence_scores
         
         top_indices = sentence_scores.argsort()[-num_sentences:][::-1]
         top_indices_sorted = sorted(top_indices)
         
-        return [sentences[i] for i in top_indices_sorted]
+        return spans[top_indices_sorted]
     
     except Exception as e:
         print(f"Key sentence extraction error: {e}")
-        return sentences[:num_sentences]
+        return spans[:num_sentences]
+
+
+def summarize_document(
+    text: TextLike,
+    num_sentences: int = 3,
+    num_key_sentences: int = 5
+) -> Tuple[str, List[str]]:
+    """
+    Summary and key sentences together, sharing one sentence split and one
+    TF-IDF scoring pass (one process-pool round trip instead of two)
+    """
+    doc = as_document(text)
+    return summarize_text(doc, num_sentences), extract_key_sentences(doc, num_key_sentences)
+
+
+def summarize_with_offsets(
+    text: TextLike,
+    num_sentences: int = 3,
+    num_key_sentences: int = 5
+) -> Dict:
+    """
+    summarize_document plus the [start, end] character offsets of each key
+    sentence in the original text (for highlighting)
+    """
+    doc = as_document(text)
+    spans = key_sentence_spans(doc, num_key_sentences)
+    return {
+        "summary": summarize_text(doc, num_sentences),
+        "key_sentences": list(iter_span_text(doc.text, spans)),
+        "key_sentence_offsets": spans.tolist()
+    }
@@ -2,21 +2,26 @@
 Vector store using FAISS for similarity search
 """
 
+import importlib.util
 import os
 import pickle
+import threading
 from typing import List, Tuple, Dict
 import numpy as np
 
-try:
-    import faiss
-    FAISS_AVAILABLE = True
-except ImportError:
-    FAISS_AVAILABLE = False
+# faiss itself is imported on first use, not when the API starts
+FAISS_AVAILABLE = importlib.util.find_spec("faiss") is not None
+if not FAISS_AVAILABLE:
     print("⚠️ FAISS not available. Install with: pip install faiss-cpu")
 
 from embeddings import get_embedding_generator
 
 
+def _faiss():
+    import faiss
+    return faiss
+
+
 class VectorStore:
     """
     FAISS-based vector store for evidence retrieval
@@ -39,11 +44,14 @@ class VectorStore:
         self.embedding_gen = get_embedding_generator()
         self.dimension = self.embedding_gen.get_dimension()
         
+        # Guards index/metadata when add and search run on worker threads
+        self._lock = threading.Lock()
+        
         # Initialize or load index
         if os.path.exists(self.index_file):
             self.load()
         else:
-            self.index = faiss.IndexFlatL2(self.dimension)
+            self.index = _faiss().IndexFlatL2(self.dimension)
             self.metadata = []
         
         print(f"✓ VectorStore initialized with {self.index.ntotal} vectors")
@@ -62,14 +70,14 @@ class VectorStore:
         # Generate embeddings
         embeddings = self.embedding_gen.embed(texts)
         
-        # Add to FAISS index
-        self.index.add(embeddings.astype('float32'))
-        
         # Store metadata
         if metadata is None:
             metadata = [{"text": text} for text in texts]
         
-        self.metadata.extend(metadata)
+        # Add to FAISS index
+        with self._lock:
+            self.index.add(embeddings.astype('float32'))
+            self.metadata.extend(metadata)
         
         print(f"✓ Added {len(texts)} vectors. Total: {self.index.ntotal}")
     
@@ -91,10 +99,11 @@ class VectorStore:
         query_embedding = self.embedding_gen.embed(query)
         
         # Search
-        distances, indices = self.index.search(
-            query_embedding.astype('float32'), 
-            min(k, self.index.ntotal)
-        )
+        with self._lock:
+            distances, indices = self.index.search(
+                query_embedding.astype('float32'), 
+                min(k, self.index.ntotal)
+            )
         
         # Build results
         results = []
@@ -109,7 +118,7 @@ class VectorStore:
     
     def save(self):
         """Save index and metadata to disk"""
-        faiss.write_index(self.index, self.index_file)
+        _faiss().write_index(self.index, self.index_file)
         
         with open(self.metadata_file, 'wb') as f:
             pickle.dump(self.metadata, f)
@@ -121,7 +130,7 @@ class VectorStore:
         if not os.path.exists(self.index_file):
             raise FileNotFoundError(f"Index not found: {self.index_file}")
         
-        self.index = faiss.read_index(self.index_file)
+        self.index = _faiss().read_index(self.index_file)
         
         with open(self.metadata_file, 'rb') as f:
             self.metadata = pickle.load(f)
@@ -130,7 +139,7 @@ class VectorStore:
     
     def clear(self):
         """Clear all vectors"""
-        self.index = faiss.IndexFlatL2(self.dimension)
+        self.index = _faiss().IndexFlatL2(self.dimension)
         self.metadata = []
         print("✓ VectorStore cleared")
     
@@ -146,10 +155,13 @@ class VectorStore:
 
 # Global instance
 _vector_store = None
+_vector_store_lock = threading.Lock()
 
 def get_vector_store() -> VectorStore:
-    """Get or create global vector store"""
+    """Get or create global vector store (once, even when warm-up and a request race)"""
     global _vector_store
     if _vector_store is None:
-        _vector_store = VectorStore()
+        with _vector_store_lock:
+            if _vector_store is None:
+                _vector_store = VectorStore()
     return _vector_store
@@ -0,0 +1,170 @@
+"""
+Startup warm-up - Background loading of heavy components and readiness state
+
+Importing main loads only what /predict needs: the model registry and its
+memory-mapped scorer. scikit-learn, NLTK, the IDF table, the transformers
+summarizer, embeddings, the FAISS store and the cascade classifier are
+imported on first use instead. The lifespan hook starts warm_up(), which
+loads the WARMUP_COMPONENTS one by one on a worker thread so the first
+requests that need them don't pay for it; /ready reports each component as
+cold, warming, warm or failed.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from executors import run_in_thread
+
+# Loaded in the background at startup, in this order; the rest stay lazy
+WARMUP_COMPONENTS = [
+    name.strip()
+    for name in os.environ.get("WARMUP_COMPONENTS", "idf,nlp").split(",")
+    if name.strip()
+]
+
+
+def _load_idf():
+    from idf import get_global_idf
+    get_global_idf()
+
+
+def _load_nlp():
+    # scikit-learn's text module (per-call TF-IDF fallbacks), stop words, claim patterns
+    import sklearn.feature_extraction.text  # noqa: F401
+    from utils import get_stop_words, CLAIM_TYPE_LEXICON
+    from claims import CLAIM_SENTENCE_LEXICON
+    from matcher import get_matcher
+    get_stop_words()
+    get_matcher("claim_type", CLAIM_TYPE_LEXICON)
+    get_matcher("claim_sentence", CLAIM_SENTENCE_LEXICON)
+
+
+def _load_summarizer():
+    from summarize import get_summarizer
+    get_summarizer()
+
+
+def _load_embeddings():
+    from embeddings import get_embedding_generator
+    get_embedding_generator()
+
+
+def _load_vectorstore():
+    from vectorstore import get_vector_store
+    get_vector_store()
+
+
+def _load_cascade():
+    from cascade import get_cascade
+    cascade = get_cascade()
+    if not cascade.enabled:
+        raise RuntimeError("cascade disabled (CASCADE_ENABLED=0)")
+    if cascade.load() is None:
+        raise RuntimeError(cascade.error)
+
+
+def _loaded(module: str, attribute: str) -> bool:
+    """Whether a lazily created singleton exists (however it got loaded)"""
+    return bool(getattr(sys.modules.get(module), attribute, None))
+
+
+# name -> (loader, is it loaded already)
+COMPONENTS: Dict[str, Tuple[Callable[[], None], Callable[[], bool]]] = {
+    "idf": (_load_idf, lambda: _loaded("idf", "_load_attempted")),
+    "nlp": (_load_nlp, lambda: _loaded("utils", "_stop_words")),
+    "summarizer": (_load_summarizer, lambda: _loaded("summarize", "_summarizer")),
+    "embeddings": (_load_embeddings, lambda: _loaded("embeddings", "_embedding_generator")),
+    "vectorstore": (_load_vectorstore, lambda: _loaded("vectorstore", "_vector_store")),
+    "cascade": (_load_cascade, lambda: bool(getattr(getattr(sys.modules.get("cascade"), "_cascade", None),
+                                                     "classifier", None)))
+}
+
+
+class Warmup:
+    """
+    Runs component loaders and remembers how each one went
+    """
+
+    def __init__(self, components: Dict[str, Tuple[Callable, Callable]] = COMPONENTS):
+        self.components = components
+        self.warming: Optional[str] = None
+        self.seconds: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def warm(self, name: str) -> bool:
+        """Load one component (blocking); False if its loader raised"""
+        loader, _ = self.components[name]
+        self.warming = name
+        started = time.perf_counter()
+        try:
+            loader()
+            self.errors.pop(name, None)
+            return True
+        except Exception as e:
+            self.errors[name] = str(e)
+            print(f"⚠️ Warm-up of {name} failed: {e}")
+            return False
+        finally:
+            self.seconds[name] = round(time.perf_counter() - started, 3)
+            self.warming = None
+
+    async def warm_up(self, names: List[str]):
+        """Load the named components one after another off the event loop"""
+        self.started_at = time.time()
+        for name in names:
+            if name not in self.components:
+                print(f"⚠️ Unknown warm-up component: {name}")
+                continue
+            if self.state(name) == "warm":
+                # Already loaded, e.g. by serve.py's parent before forking
+                continue
+            await run_in_thread(self.warm, name)
+        self.finished_at = time.time()
+        print(f"✓ Warm-up finished: {', '.join(names) or 'nothing to load'}")
+
+    def start(self, names: List[str] = WARMUP_COMPONENTS):
+        """Schedule warm_up() on the running loop (called from the lifespan hook)"""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self.warm_up(names))
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def state(self, name: str) -> str:
+        _, is_loaded = self.components[name]
+        if is_loaded():
+            return "warm"
+        if self.warming == name:
+            return "warming"
+        if name in self.errors:
+            return "failed"
+        return "cold"
+
+    def stats(self) -> Dict:
+        """Get per-component state and warm-up timings"""
+        return {
+            "components": {name: self.state(name) for name in self.components},
+            "seconds": dict(self.seconds),
+            "errors": dict(self.errors),
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+
+_warmup: Optional[Warmup] = None
+
+
+def get_warmup() -> Warmup:
+    """Get or create the shared warm-up state"""
+    global _warmup
+    if _warmup is None:
+        _warmup = Warmup()
+    return _warmup
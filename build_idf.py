@@ -0,0 +1,65 @@
+"""
+Build the global IDF table used by the backend for similarity and sentence scoring
+
+Reads the same training data as train_model_fast.py (Dataset/Fake.csv and
+Dataset/True.csv) when present, plus the politifact CSV, and writes
+memory-mappable arrays to backend/model/idf/. A corpus smaller than
+--min-docs (e.g. the politifact headlines alone) is refused: most real-world
+terms would be missing from the table. The backend only uses the table with
+GLOBAL_IDF_ENABLED=1.
+
+Usage:
+    python build_idf.py [--min-df 2] [--max-features 200000] [--min-docs 10000]
+"""
+
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+from idf import build_idf, IDF_PATH, IDF_MIN_DOCS
+
+parser = argparse.ArgumentParser(description="Build the global IDF table")
+parser.add_argument('--min-df', type=int, default=2)
+parser.add_argument('--max-features', type=int, default=200000)
+parser.add_argument('--out', default=IDF_PATH)
+parser.add_argument('--min-docs', type=int, default=IDF_MIN_DOCS)
+args = parser.parse_args()
+
+texts = []
+sources = []
+
+# Training articles (title + body, as in train_model_fast.py)
+for name in ('Fake.csv', 'True.csv'):
+    path = os.path.join(ROOT, 'Dataset', name)
+    if os.path.exists(path):
+        df = pd.read_csv(path)
+        texts.extend((df['title'].fillna('') + ' ' + df['text'].fillna('')).tolist())
+        sources.append(f"Dataset/{name}")
+
+# Politifact headlines
+politifact = os.path.join(ROOT, 'politifact', 'politifact_fake.csv')
+if os.path.exists(politifact):
+    df = pd.read_csv(politifact)
+    texts.extend(df['title'].dropna().tolist())
+    sources.append("politifact/politifact_fake.csv")
+
+if not texts:
+    sys.exit("No training data found (Dataset/*.csv or politifact/*.csv)")
+if len(texts) < args.min_docs:
+    sys.exit(f"Only {len(texts)} documents ({', '.join(sources)}); need at least {args.min_docs} "
+             "for a representative IDF table (add Dataset/Fake.csv and Dataset/True.csv)")
+
+print(f"Fitting IDF on {len(texts)} documents from: {', '.join(sources)}")
+meta = build_idf(
+    texts,
+    path=args.out,
+    min_df=args.min_df,
+    max_features=args.max_features,
+    source=', '.join(sources)
+)
+print(f"✓ {meta['terms']} terms written to {args.out}")
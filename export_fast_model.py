@@ -0,0 +1,47 @@
+"""
+Export the trained pipeline to the compact fast-scorer artifact used by the backend
+
+Reads backend/model/model.pkl, writes backend/model/fast/ (sorted
+vocabulary, IDF and coefficient arrays) and checks the exported scorer
+against the pipeline's predict_proba.
+
+Usage:
+    python export_fast_model.py [--model backend/model/model.pkl] [--out backend/model/fast]
+"""
+
+import argparse
+import os
+import sys
+
+import joblib
+import numpy as np
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+from fastmodel import FastScorer, export_pipeline, FAST_MODEL_PATH
+from textnorm import with_normalizer
+
+parser = argparse.ArgumentParser(description="Export the fast-scorer artifact")
+parser.add_argument('--model', default=os.path.join(ROOT, 'backend', 'model', 'model.pkl'))
+parser.add_argument('--out', default=FAST_MODEL_PATH)
+args = parser.parse_args()
+
+# Pickles trained before the normalize step get it here, as the backend does on load
+pipe = with_normalizer(joblib.load(args.model))
+meta = export_pipeline(pipe, path=args.out, source=args.model)
+
+# Parity check on a few texts
+samples = [
+    "President announces new economic policy",
+    "SHOCKING secret revealed! Click NOW!",
+    "Study shows climate change effects",
+    ""
+]
+expected = pipe.predict_proba(samples)
+actual = FastScorer(args.out).predict_proba(samples)
+max_diff = float(np.abs(expected - actual).max())
+if max_diff > 1e-9:
+    sys.exit(f"✗ Exported scorer differs from the pipeline (max diff {max_diff:.2e})")
+
+print(f"✓ {meta['terms']} terms exported to {args.out} (max diff vs pipeline {max_diff:.1e})")
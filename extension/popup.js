@@ -118,8 +118,8 @@ async function analyzeText(text, headline) {
       throw new Error('Text is too short to analyze');
     }
     
-    // Call full-check endpoint
-    const response = await fetch(`${API_URL}/full-check`, {
+    // Call streaming full-check endpoint so the verdict shows before slow sources answer
+    const response = await fetch(`${API_URL}/full-check/stream`, {
       method: 'POST',
       headers: {
         'Content-Type': 'application/json',
@@ -135,14 +135,76 @@ async function analyzeText(text, headline) {
       throw new Error(error.detail || 'API request failed');
     }
     
-    const data = await response.json();
-    displayResults(data);
+    const data = {
+      model_prediction: 'PENDING',
+      model_confidence: 0,
+      verification_status: 'Checking sources...',
+      matching_sources: [],
+      similarity_scores: {},
+      keywords: [],
+      summary: '',
+      key_sentences: []
+    };
+    
+    await readEventStream(response, (event) => {
+      applyStreamEvent(data, event);
+      displayResults(data);
+    });
     
   } catch (error) {
     throw error;
   }
 }
 
+/**
+ * Read a newline-delimited JSON stream, calling onEvent for each parsed line
+ */
+async function readEventStream(response, onEvent) {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split('\n');
+    buffer = lines.pop();
+    
+    lines.filter(line => line.trim()).forEach(line => onEvent(JSON.parse(line)));
+  }
+  
+  if (buffer.trim()) {
+    onEvent(JSON.parse(buffer));
+  }
+}
+
+/**
+ * Merge one streamed event into the accumulated result
+ */
+function applyStreamEvent(data, event) {
+  const { event: type, ...fields } = event;
+  
+  switch (type) {
+    case 'prediction':
+    case 'summary':
+    case 'keywords':
+    case 'verification':
+      Object.assign(data, fields);
+      break;
+    case 'source':
+      data.similarity_scores[fields.source] = fields.similarity;
+      if (fields.similarity >= 0.6 && !data.matching_sources.includes(fields.source)) {
+        data.matching_sources.push(fields.source);
+      }
+      break;
+    case 'error':
+      console.warn(`Stage ${fields.stage} failed: ${fields.detail}`);
+      break;
+  }
+}
+
 /**
  * Display analysis results
  */
@@ -1,9 +1,17 @@
 import pandas as pd
 import joblib
 from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
+from sklearn.preprocessing import FunctionTransformer
 from sklearn.linear_model import LogisticRegression
 from sklearn.pipeline import Pipeline
 from sklearn.model_selection import train_test_split
+import os
+import sys
+
+# The shared normalizer lives in backend/; the pipeline pickles a reference to it
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+from textnorm import normalize_batch
+from fastmodel import export_pipeline
 
 # Load data
 df = pd.read_csv('data.csv')
@@ -18,6 +26,7 @@ X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_
 
 # Create pipeline
 pipe = Pipeline([
+    ('norm', FunctionTransformer(normalize_batch)),
     ('vect', CountVectorizer()),
     ('tfidf', TfidfTransformer()),
     ('clf', LogisticRegression(max_iter=1000))
@@ -29,6 +38,7 @@ pipe.fit(X_train, y_train)
 
 # Save
 joblib.dump(pipe, 'model/model.pkl')
+export_pipeline(pipe, 'model/fast', source='model/model.pkl')
 
 # Test
 score = pipe.score(X_test, y_test)
@@ -15,6 +15,9 @@ from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_sc
 import joblib
 import warnings
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+from textnorm import normalize, normalize_batch
+
 warnings.filterwarnings('ignore')
 
 # Set working directory
@@ -49,10 +52,10 @@ print("=" * 70)
 df['Body'].fillna("", inplace=True)
 df['Headline'].fillna("", inplace=True)
 
-# Combine Headline and Body
-df['Content'] = df['Headline'] + " " + df['Body']
+# Combine Headline and Body, then normalize (same normalizer the apps use)
+df['Content'] = normalize_batch(df['Headline'] + " " + df['Body'])
 
-print(f"✓ Missing values filled")
+print(f"✓ Missing values filled, text normalized")
 print(f"  - Sample content (first article):")
 print(f"    {df['Content'].iloc[0][:150]}...\n")
 
@@ -154,7 +157,7 @@ sample_texts = [
 ]
 
 for i, text in enumerate(sample_texts, 1):
-    text_vec = vectorizer.transform([text])
+    text_vec = vectorizer.transform([normalize(text)])
     pred = model.predict(text_vec)[0]
     prob = model.predict_proba(text_vec)[0]
     label = "REAL" if pred == 1 else "FAKE"
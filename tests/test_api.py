@@ -7,6 +7,7 @@ import pytest
 from fastapi.testclient import TestClient
 import sys
 import os
+import json
 
 # Add backend to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
@@ -26,8 +27,28 @@ class TestHealthEndpoints:
         data = response.json()
         assert data["status"] == "healthy"
         assert "model_loaded" in data
+        assert "model_version" in data
         assert "timestamp" in data
     
+    def test_ready_endpoint(self):
+        """Test /ready reports readiness and per-component warm-up state"""
+        response = client.get("/ready")
+        data = response.json()
+        assert response.status_code == (200 if data["ready"] else 503)
+        assert data["components"]["model"] in ("warm", "failed")
+        assert {"idf", "nlp", "summarizer"} <= set(data["components"])
+    
+    def test_model_reload(self):
+        """Test /admin/model/reload swaps in the model on disk"""
+        response = client.post("/admin/model/reload")
+        if not client.get("/health").json()["model_loaded"]:
+            assert response.status_code == 500
+            return
+        assert response.status_code == 200
+        data = response.json()
+        assert data["reloaded"] is True
+        assert client.get("/health").json()["model_version"] == data["active"]
+    
     def test_sources_endpoint(self):
         """Test /sources endpoint"""
         response = client.get("/sources")
@@ -64,6 +85,30 @@ class TestPredictionEndpoint:
         assert "prediction" in data
         assert "confidence" in data
     
+    def test_predict_cached(self):
+        """Repeat prediction is served from the cache unless bypassed"""
+        payload = {"text": "Officials confirmed the bridge will reopen to traffic next week"}
+        first = client.post("/predict", json=payload).json()
+        
+        before = client.get("/admin/stats").json()["cache"]["predict"]["hits"]
+        assert client.post("/predict", json=payload).json() == first
+        after = client.get("/admin/stats").json()["cache"]["predict"]["hits"]
+        assert after == before + 1
+        
+        payload["bypass_cache"] = True
+        assert client.post("/predict", json=payload).json() == first
+        assert client.get("/admin/stats").json()["cache"]["predict"]["hits"] == after
+    
+    def test_predict_reports_tier(self):
+        """Every answer names the cascade tier that produced it"""
+        payload = {"text": "Officials said the river crossing will stay closed for repairs", "bypass_cache": True}
+        data = client.post("/predict", json=payload).json()
+        assert data["tier"] in ("fast", "transformer")
+        
+        cascade = client.get("/admin/stats").json()["cascade"]
+        assert cascade["scored"] >= 1
+        assert 0 <= cascade["escalation_rate"] <= 1
+    
     def test_predict_empty_text(self):
         """Test prediction with empty text"""
         payload = {"text": ""}
@@ -71,6 +116,78 @@ class TestPredictionEndpoint:
         assert response.status_code == 422  # Validation error
 
 
+class TestBatchPredictionEndpoint:
+    """Test batch ML prediction endpoint"""
+    
+    def test_predict_batch_matches_single(self):
+        """Batch results come back in order and agree with /predict"""
+        texts = [
+            "BREAKING: Aliens landed in New York City today and met with the President",
+            "The Supreme Court announced a new ruling on constitutional matters after careful deliberation",
+            "SHOCKING secret revealed! Doctors hate this one weird trick"
+        ]
+        response = client.post("/predict/batch", json={"texts": texts})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == len(texts)
+        
+        for text, result in zip(texts, data["results"]):
+            single = client.post("/predict", json={"text": text}).json()
+            assert result["prediction"] == single["prediction"]
+            assert result["label"] == single["label"]
+            assert abs(result["confidence"] - single["confidence"]) < 1e-9
+    
+    def test_predict_batch_keeps_loop_responsive(self, monkeypatch):
+        """A large batch is scored off the event loop, so other coroutines keep running"""
+        import asyncio
+        import time
+        import httpx
+        import main
+
+        score_texts = main.score_texts
+
+        def slow_score(texts):
+            time.sleep(0.5)
+            return score_texts(texts)
+
+        monkeypatch.setattr(main, "score_texts", slow_score)
+        texts = [f"Article number {i} about the new national climate bill" for i in range(1000)]
+
+        async def run():
+            gaps = []
+
+            async def ticker():
+                last = time.perf_counter()
+                while True:
+                    await asyncio.sleep(0.01)
+                    now = time.perf_counter()
+                    gaps.append(now - last)
+                    last = now
+
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+                ticks = asyncio.ensure_future(ticker())
+                response = await async_client.post("/predict/batch", json={"texts": texts})
+                ticks.cancel()
+            return response, gaps
+
+        response, gaps = asyncio.run(run())
+        if response.status_code == 503:
+            pytest.skip("Model not loaded")
+        assert response.status_code == 200 and response.json()["count"] == 1000
+        assert max(gaps) < 0.25
+    
+    def test_predict_batch_empty(self):
+        """Test batch prediction with no texts"""
+        response = client.post("/predict/batch", json={"texts": []})
+        assert response.status_code == 400
+    
+    def test_predict_batch_short_text(self):
+        """Test batch prediction rejects short items"""
+        response = client.post("/predict/batch", json={"texts": ["valid article text here", "short"]})
+        assert response.status_code == 400
+
+
 class TestAIEndpoints:
     """Test AI assistant endpoints"""
     
@@ -106,6 +223,48 @@ class TestAIEndpoints:
         assert "explanation" in data
 
 
+class TestFullCheckStream:
+    """Test streaming full-check endpoint"""
+    
+    def test_stream_events(self):
+        """Verdict and summary are streamed as NDJSON and the stream ends with done"""
+        payload = {
+            "text": "The President announced a new climate policy today. Scientists say temperatures rose 1.5 degrees. "
+                    "Critics argued the bill would hurt jobs. The plan was approved by Congress."
+        }
+        with client.stream("POST", "/full-check/stream", json=payload) as response:
+            assert response.status_code == 200
+            events = [json.loads(line) for line in response.iter_lines() if line]
+        
+        names = [e["event"] for e in events]
+        assert "prediction" in names
+        assert "summary" in names
+        assert names[-1] == "done"
+        
+        prediction = next(e for e in events if e["event"] == "prediction")
+        assert prediction["model_prediction"] in ["FAKE", "REAL"]
+    
+    def test_cached_replay_matches_live(self, monkeypatch):
+        """A replayed stream carries the same verification event, skipped sources included"""
+        import search
+        monkeypatch.setattr(search, "TRUSTED_SOURCES", {})
+        payload = {
+            "text": "Replay check: the council approved the transit budget on Monday after a long debate.",
+            "deadline_seconds": 3
+        }
+        
+        def run():
+            with client.stream("POST", "/full-check/stream", json=payload) as response:
+                return [json.loads(line) for line in response.iter_lines() if line]
+        
+        live, replay = run(), run()
+        assert live[-1]["cached"] is False and replay[-1]["cached"] is True
+        verification = [next(e for e in events if e["event"] == "verification") for events in (live, replay)]
+        assert verification[0] == verification[1]
+        assert "skipped_sources" in verification[1]
+        assert not any(e["event"] == "source" for e in replay)
+
+
 class TestVerificationEndpoint:
     """Test multi-source verification (requires network)"""
     
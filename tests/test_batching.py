@@ -0,0 +1,74 @@
+"""
+Unit Tests for the micro-batching scheduler
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from batching import MicroBatcher
+
+
+class TestMicroBatcher:
+    """Test request coalescing and result routing"""
+
+    def test_concurrent_submits_share_one_batch(self):
+        """Items submitted within the window are processed together, in order"""
+        calls = []
+
+        def process(items):
+            calls.append(list(items))
+            return [item * 2 for item in items]
+
+        batcher = MicroBatcher(process, window_ms=20, max_batch=64)
+
+        async def run():
+            return await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+
+        results = asyncio.run(run())
+        assert results == [i * 2 for i in range(10)]
+        assert calls == [list(range(10))]
+
+        stats = batcher.stats()
+        assert stats["total_batches"] == 1
+        assert stats["total_items"] == 10
+        assert stats["batch_size_histogram"] == {"8-15": 1}
+
+    def test_max_batch_splits(self):
+        """A full batch flushes immediately and the remainder runs separately"""
+        sizes = []
+
+        def process(items):
+            sizes.append(len(items))
+            return items
+
+        batcher = MicroBatcher(process, window_ms=20, max_batch=4)
+
+        async def run():
+            return await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+
+        assert asyncio.run(run()) == list(range(10))
+        assert sizes == [4, 4, 2]
+
+    def test_errors_reach_every_caller(self):
+        """A failing batch raises in each waiting caller"""
+        def process(items):
+            raise ValueError("boom")
+
+        batcher = MicroBatcher(process, window_ms=1, max_batch=8)
+
+        async def run():
+            return await asyncio.gather(
+                *(batcher.submit(i) for i in range(3)),
+                return_exceptions=True
+            )
+
+        results = asyncio.run(run())
+        assert all(isinstance(r, ValueError) for r in results)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,134 @@
+"""
+Unit Tests for the result cache
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from cache import TTLCache, SingleFlight, content_key, MISSING
+
+
+class TestContentKey:
+    """Test cache key normalization"""
+
+    def test_whitespace_insensitive(self):
+        """Re-sent page text with different spacing maps to the same key"""
+        assert content_key("Breaking  news\n today ") == content_key("Breaking news today")
+
+    def test_headline_changes_key(self):
+        """Same text with a different headline is a different entry"""
+        assert content_key("Article body", "Headline A") != content_key("Article body", "Headline B")
+        assert content_key("Article body", None) == content_key("Article body", "")
+
+
+class TestTTLCache:
+    """Test LRU bounds, expiry and counters"""
+
+    def test_lru_eviction(self):
+        """Least recently used entry is evicted when full"""
+        cache = TTLCache(max_entries=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1  # "b" is now least recently used
+        cache.set("c", 3)
+
+        assert cache.get("b") is MISSING
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    def test_expiry(self):
+        """Entries expire after their TTL"""
+        cache = TTLCache(max_entries=10, ttl=0.01)
+        cache.set("a", 1)
+        time.sleep(0.02)
+        assert cache.get("a") is MISSING
+        assert cache.stats()["expirations"] == 1
+
+    def test_hit_miss_counters(self):
+        """Hits and misses are counted, None is a valid cached value"""
+        cache = TTLCache(max_entries=10, ttl=60)
+        cache.set("none", None)
+        assert cache.get("none") is None
+        assert cache.get("absent") is MISSING
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+
+class TestSingleFlight:
+    """Test coalescing of identical in-flight calls"""
+
+    def test_concurrent_calls_collapse(self):
+        """Callers with the same key share one execution"""
+        flight = SingleFlight()
+        calls = {"count": 0}
+
+        async def work():
+            calls["count"] += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        async def run():
+            same = [flight.do("key", work) for _ in range(10)]
+            other = flight.do("other", work)
+            return await asyncio.gather(*same, other)
+
+        assert asyncio.run(run()) == ["result"] * 11
+        assert calls["count"] == 2
+        assert flight.stats()["collapsed"] == 9
+        assert flight.stats()["in_flight"] == 0
+
+    def test_errors_shared(self):
+        """A failure reaches every coalesced caller"""
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        async def run():
+            return await asyncio.gather(
+                *(flight.do("key", work) for _ in range(3)),
+                return_exceptions=True
+            )
+
+        assert all(isinstance(r, RuntimeError) for r in asyncio.run(run()))
+
+    def test_last_waiter_cancels_the_work(self):
+        """Cancelling one of two callers leaves the work running; cancelling both stops it"""
+        flight = SingleFlight()
+        stopped = []
+
+        async def work():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                stopped.append(True)
+                raise
+
+        async def run():
+            first = asyncio.ensure_future(flight.do("key", work))
+            second = asyncio.ensure_future(flight.do("key", work))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            await asyncio.sleep(0.01)
+            assert stopped == [] and flight.stats()["in_flight"] == 1
+            second.cancel()
+            await asyncio.sleep(0.01)
+            assert second.cancelled()
+
+        asyncio.run(run())
+        assert stopped == [True]
+        assert flight.stats()["cancelled"] == 1 and flight.stats()["in_flight"] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,83 @@
+"""
+Unit Tests for the cascade classifier
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from cascade import Cascade, p_real
+
+
+class KeywordClassifier:
+    """Stand-in second tier: REAL unless the text says 'hoax'"""
+
+    model_name = "keyword"
+
+    def __init__(self):
+        self.batches = []
+
+    def classify(self, texts):
+        self.batches.append(list(texts))
+        return [(0, 0.9) if "hoax" in text else (1, 0.8) for text in texts]
+
+
+def refine(cascade, texts, scores):
+    async def run():
+        return await cascade.refine(texts, scores)
+    return asyncio.run(run())
+
+
+class TestCascade:
+    """Test escalation of uncertain fast-tier answers"""
+
+    def test_band(self):
+        """Only answers with P(REAL) inside the band are uncertain"""
+        cascade = Cascade(KeywordClassifier, low=0.35, high=0.65, enabled=True)
+        assert p_real(0, 0.9) == pytest.approx(0.1)
+        assert cascade.uncertain(1, 0.6)
+        assert cascade.uncertain(0, 0.55)
+        assert not cascade.uncertain(1, 0.9)
+        assert not cascade.uncertain(0, 0.7)
+        assert not Cascade(KeywordClassifier, enabled=False).uncertain(1, 0.5)
+
+    def test_escalates_uncertain_in_one_batch(self):
+        """Uncertain texts go to the second tier together, confident ones keep the fast answer"""
+        cascade = Cascade(KeywordClassifier, low=0.35, high=0.65, enabled=True)
+        texts = ["a confident one", "a moon landing hoax", "an unsure one", "another confident one"]
+        answers = refine(cascade, texts, [(1, 0.95), (1, 0.55), (0, 0.6), (0, 0.99)])
+
+        assert answers == [None, (0, 0.9), (1, 0.8), None]
+        assert cascade.classifier.batches == [["a moon landing hoax", "an unsure one"]]
+
+        stats = cascade.stats()
+        assert stats["scored"] == 4 and stats["escalated"] == 2
+        assert stats["escalation_rate"] == 0.5
+        assert stats["answered_by"] == {"fast": 2, "transformer": 2}
+
+    def test_disabled(self):
+        """A disabled cascade never loads or calls the second tier"""
+        cascade = Cascade(KeywordClassifier, enabled=False)
+        assert refine(cascade, ["unsure"], [(1, 0.5)]) == [None]
+        assert cascade.classifier is None
+        assert cascade.stats()["escalation_rate"] == 0.0
+
+    def test_unavailable_second_tier(self):
+        """If the second tier can't load, escalated texts keep the fast answer and count as fallbacks"""
+        def broken():
+            raise OSError("model not found")
+
+        cascade = Cascade(broken, enabled=True)
+        assert refine(cascade, ["unsure", "also unsure"], [(1, 0.5), (0, 0.5)]) == [None, None]
+
+        stats = cascade.stats()
+        assert stats["error"] == "model not found"
+        assert stats["fallbacks"] == 2
+        assert stats["answered_by"] == {"fast": 2, "transformer": 0}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
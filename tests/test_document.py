@@ -0,0 +1,125 @@
+"""
+Unit Tests for the shared Document analysis object
+"""
+
+import pickle
+import random
+import re
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import utils
+from utils import (
+    Document, summarize_text, extract_key_sentences, summarize_document,
+    summarize_with_offsets, sentence_spans
+)
+from claims import extract_claims
+
+ARTICLE = (
+    "The government announced a new climate bill on Monday. "
+    "Officials said the bill would cut emissions by 40 percent by 2030. "
+    "Critics claimed the plan was too expensive for rural families. "
+    "The minister confirmed that a vote is expected next week. "
+    "Markets reacted calmly to the announcement. "
+    "Environmental groups welcomed the proposal but asked for faster action. "
+    "The opposition leader said the party would study the details."
+)
+
+
+class TestDocument:
+    """Test memoized views and equivalence with plain-string inputs"""
+
+    def test_same_results_as_strings(self):
+        """Functions return the same output for a Document as for the raw text"""
+        doc = Document(ARTICLE)
+        assert summarize_text(doc, 3) == summarize_text(ARTICLE, 3)
+        assert extract_key_sentences(doc, 5) == extract_key_sentences(ARTICLE, 5)
+        assert extract_claims(doc) == extract_claims(ARTICLE)
+        assert summarize_document(ARTICLE, 3, 5) == (summarize_text(ARTICLE, 3), extract_key_sentences(ARTICLE, 5))
+
+    def test_views_computed_once(self, monkeypatch):
+        """Sentence scoring runs once however many stages ask for it"""
+        calls = {"count": 0}
+        original = utils.sentence_tfidf_scores
+
+        def counting(sentences, max_features=100):
+            calls["count"] += 1
+            return original(sentences, max_features)
+
+        monkeypatch.setattr(utils, "sentence_tfidf_scores", counting)
+        doc = Document(ARTICLE)
+        summarize_text(doc, 3)
+        extract_key_sentences(doc, 5)
+        summarize_document(doc)
+        assert calls["count"] == 1
+        assert doc.sentences is doc.sentences
+
+    def test_memoized_claims_are_copied(self):
+        """Callers can't mutate the memoized claims view"""
+        doc = Document(ARTICLE)
+        first = extract_claims(doc)
+        first[0]["priority"] = 99
+        assert "priority" not in extract_claims(doc)[0]
+
+    def test_pickles_with_views(self):
+        """Documents can be sent to the process pool along with computed views"""
+        doc = Document(ARTICLE)
+        doc.sentences
+        clone = pickle.loads(pickle.dumps(doc))
+        assert clone.text == ARTICLE
+        assert clone.sentences == doc.sentences
+        assert summarize_text(clone, 3) == summarize_text(doc, 3)
+
+    def test_views_computed_before_dispatch(self, monkeypatch):
+        """Views computed in the parent travel with every copy, and the query reuses the claim type"""
+        keywords = utils.extract_keywords(ARTICLE)
+        query = utils.build_search_query(ARTICLE, keywords)
+        spans = sentence_spans(ARTICLE).tolist()
+
+        doc = Document(ARTICLE).compute("cleaned", "tokens", "sentence_spans", "claim_type")
+        copies = [pickle.loads(pickle.dumps(doc)) for _ in range(2)]
+
+        def fail(*args, **kwargs):
+            raise AssertionError("view recomputed")
+
+        for name in ("_clean", "sentence_spans", "_claim_type"):
+            monkeypatch.setattr(utils, name, fail)
+        assert utils.extract_keywords(copies[0]) == keywords
+        assert copies[1].sentence_spans.tolist() == spans
+        assert utils.build_search_query(doc, keywords) == query
+
+
+class TestSentenceSpans:
+    """Test offset-based sentence segmentation"""
+
+    def test_matches_regex_split(self):
+        """Spans slice out exactly what re.split returns, empty pieces included"""
+        cases = ["", " ", "One.", "One. ", " Lead space. Two!  Three?\nFour", "a.b. c!!  d?\t\te...", "No punctuation"]
+        random.seed(5)
+        pieces = ["word", " ", ".", "!", "?", "\n", "\t", "x.y", "  "]
+        cases += [''.join(random.choices(pieces, k=random.randint(0, 15))) for _ in range(500)]
+        for text in cases:
+            expected = re.split(r'(?<=[.!?])\s+', text)
+            assert [text[s:e] for s, e in sentence_spans(text)] == expected, repr(text)
+
+    def test_key_sentence_offsets(self):
+        """Offsets point at the key sentences in the original text"""
+        result = summarize_with_offsets(ARTICLE, 3, 5)
+        assert result["summary"] == summarize_text(ARTICLE, 3)
+        assert result["key_sentences"] == extract_key_sentences(ARTICLE, 5)
+        assert [ARTICLE[s:e] for s, e in result["key_sentence_offsets"]] == result["key_sentences"]
+
+    def test_claim_offsets(self):
+        """Each claim carries the character range it was taken from"""
+        text = "  " + ARTICLE + "  "
+        claims = extract_claims(text)
+        assert claims
+        for claim in claims:
+            assert text[claim["start"]:claim["end"]] == claim["claim"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,157 @@
+"""
+Unit Tests for the persistent embedding cache
+"""
+
+import hashlib
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from embedcache import CachedEmbeddingGenerator, DiskEmbeddingStore, EmbeddingCache, embedding_key
+
+
+class HashEmbedder:
+    """Deterministic stand-in for a sentence-transformer that records what it encodes"""
+
+    method = "hash"
+    model_id = "hash:8"
+
+    def __init__(self):
+        self.encoded = []
+
+    def embed(self, texts):
+        self.encoded.append(list(texts))
+        return np.array([
+            np.frombuffer(hashlib.sha256(text.encode()).digest()[:8], dtype=np.uint8) / 255.0
+            for text in texts
+        ]).reshape(len(texts), 8)
+
+    def get_dimension(self):
+        return 8
+
+
+def cached(path, memory_entries=64, max_rows=1000):
+    embedder = HashEmbedder()
+    cache = EmbeddingCache(embedder.model_id, str(path) if path else None, memory_entries, max_rows)
+    return CachedEmbeddingGenerator(embedder, cache), embedder
+
+
+class TestEmbeddingCache:
+    """Test the memory and disk tiers"""
+
+    def test_repeats_skip_the_encoder(self, tmp_path):
+        """Only texts never seen are encoded, each once, in one call"""
+        generator, embedder = cached(tmp_path)
+        first = generator.embed(["alpha", "beta", "alpha"])
+        np.testing.assert_allclose(first, HashEmbedder().embed(["alpha", "beta", "alpha"]), rtol=1e-6)
+        assert embedder.encoded == [["alpha", "beta"]]
+
+        again = generator.embed(["beta", "gamma"])
+        assert embedder.encoded[-1] == ["gamma"]
+        np.testing.assert_array_equal(again[0], first[1])
+        assert generator.embed("alpha").shape == (1, 8)
+        assert len(embedder.encoded) == 2
+
+        stats = generator.stats()
+        assert stats["lookups"] == 6 and stats["encoded"] == 3
+        assert stats["memory_hits"] == 2 and stats["hit_rate"] == 0.5
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """A new process re-ingesting the same corpus reads every vector from disk"""
+        corpus = [f"article {i}" for i in range(20)]
+        generator, _ = cached(tmp_path)
+        expected = generator.embed(corpus)
+
+        restarted, embedder = cached(tmp_path)
+        np.testing.assert_array_equal(restarted.embed(corpus), expected)
+        assert embedder.encoded == []
+        stats = restarted.stats()
+        assert stats["disk_hits"] == 20 and stats["hit_rate"] == 1.0
+        assert stats["disk"]["rows"] == 20
+
+    def test_keys_include_the_model(self, tmp_path):
+        """Vectors of one embedding model are never served for another"""
+        assert embedding_key("a", "text") != embedding_key("b", "text")
+        assert embedding_key("a", "some  text ") == embedding_key("a", "some text")
+
+        generator, _ = cached(tmp_path)
+        generator.embed(["shared text"])
+        other = EmbeddingCache("other:8", str(tmp_path))
+        assert other.get_many(["shared text"]) == [None]
+
+    def test_memory_only(self):
+        """Without a path only the LRU tier is used"""
+        generator, embedder = cached(None, memory_entries=2)
+        generator.embed(["a", "b", "c"])
+        generator.embed(["a"])
+        assert embedder.encoded == [["a", "b", "c"], ["a"]]
+        assert generator.stats()["disk"] is None
+
+    def test_unusable_disk_falls_back_to_memory(self, tmp_path):
+        """A path that can't be opened, or holds another model's files, leaves only the memory tier"""
+        blocker = tmp_path / "not-a-dir"
+        blocker.write_text("")
+        generator, embedder = cached(blocker / "cache")
+        generator.embed(["a", "a"])
+        generator.embed(["a"])
+        assert embedder.encoded == [["a"]]
+        assert generator.stats()["disk"] is None
+
+        # "a/b" and "a_b" map to the same directory name
+        EmbeddingCache("a/b", str(tmp_path)).put_many(["text"], np.zeros((1, 4)))
+        assert EmbeddingCache("a_b", str(tmp_path)).disk is None
+
+
+class TestDiskEmbeddingStore:
+    """Test the memory-mapped matrix and key index"""
+
+    def rows(self, start, count):
+        keys = [embedding_key("m", f"text {i}") for i in range(start, start + count)]
+        vectors = np.arange(start, start + count, dtype=np.float32)[:, None].repeat(4, axis=1)
+        return keys, vectors
+
+    def test_size_cap_keeps_newest(self, tmp_path):
+        """Past max_rows the store is compacted to its newest rows"""
+        store = DiskEmbeddingStore(str(tmp_path), "m", max_rows=10)
+        for start in range(0, 12, 3):
+            store.put_many(*self.rows(start, 3))
+
+        assert store.rows <= 10 and store.compactions == 1
+        keys, vectors = self.rows(0, 12)
+        found = store.get_many(keys)
+        assert keys[0] not in found and keys[11] in found
+        for key, vector in zip(keys, vectors):
+            if key in found:
+                np.testing.assert_array_equal(found[key], vector)
+        assert os.path.getsize(os.path.join(store.path, "vectors.f32")) == store.rows * 4 * 4
+
+    def test_shared_between_processes(self, tmp_path):
+        """A second store on the same files sees appends and compactions made by the first"""
+        writer = DiskEmbeddingStore(str(tmp_path), "m", max_rows=10)
+        reader = DiskEmbeddingStore(str(tmp_path), "m", max_rows=10)
+
+        keys, vectors = self.rows(0, 4)
+        writer.put_many(keys, vectors)
+        np.testing.assert_array_equal(reader.get_many(keys)[keys[3]], vectors[3])
+
+        writer.put_many(*self.rows(4, 8))
+        keys, vectors = self.rows(0, 12)
+        found = reader.get_many(keys)
+        assert found.keys() == writer.get_many(keys).keys()
+        for i, key in enumerate(keys):
+            if key in found:
+                np.testing.assert_array_equal(found[key], vectors[i])
+
+    def test_rejects_other_dimension(self, tmp_path):
+        """Vectors of a different width are refused"""
+        store = DiskEmbeddingStore(str(tmp_path), "m")
+        store.put_many(*self.rows(0, 2))
+        with pytest.raises(ValueError):
+            store.put_many([embedding_key("m", "wide")], np.zeros((1, 5), dtype=np.float32))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
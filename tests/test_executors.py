@@ -0,0 +1,50 @@
+"""
+Unit Tests for the thread / process executor layer
+"""
+
+import asyncio
+import multiprocessing
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import executors
+
+
+def _die_in_worker():
+    """Kills a pool worker; returns normally on the thread-pool fallback"""
+    if multiprocessing.parent_process() is not None:
+        os._exit(1)
+    return "thread"
+
+
+class TestProcessPool:
+    """Test recovery from a broken process pool"""
+
+    def test_broken_pool_is_shut_down_and_replaced(self, monkeypatch):
+        """A dead worker falls back to the thread pool and the old pool is shut down"""
+        monkeypatch.setattr(executors, "PROCESS_POOL_WORKERS", 1)
+        monkeypatch.setattr(executors, "_process_pool", None)
+        fallbacks = executors._stats["process_fallbacks"]
+
+        try:
+            broken = executors.get_process_pool()
+            shutdowns = []
+            shutdown = broken.shutdown
+            monkeypatch.setattr(broken, "shutdown", lambda **kwargs: shutdowns.append(kwargs) or shutdown(**kwargs))
+            assert asyncio.run(executors.run_in_process(_die_in_worker)) == "thread"
+            assert executors._stats["process_fallbacks"] == fallbacks + 1
+            assert executors._process_pool is None
+            assert shutdowns == [{"wait": False, "cancel_futures": True}]
+
+            fresh = executors.get_process_pool()
+            assert fresh is not broken
+            assert asyncio.run(executors.run_in_process(pow, 2, 10)) == 1024
+        finally:
+            executors.shutdown_executors()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
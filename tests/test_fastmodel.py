@@ -0,0 +1,134 @@
+"""
+Unit Tests for the pipeline-free fast scorer
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import FunctionTransformer
+
+from fastmodel import FastScorer, export_pipeline, load_fast_scorer
+from textnorm import normalize_batch
+
+MODEL_PATH = os.path.join(os.path.dirname(__file__), '..', 'backend', 'model', 'model.pkl')
+
+TRAIN = [
+    "Parliament approves the new national climate bill",
+    "Senate rejects climate bill after long debate",
+    "SHOCKING: celebrity secretly replaced by clone, insiders say",
+    "You won't BELIEVE what this doctor found in 2019!!!",
+    "President signs national budget into law",
+    "Miracle cure the government doesn't want you to know about",
+    "Stock markets rally as national budget is approved",
+    "Aliens spotted over New York, cover-up confirmed"
+]
+LABELS = [1, 1, 0, 0, 1, 0, 1, 0]
+
+TEXTS = TRAIN + [
+    "", "x", "zzzz qqqq", "The budget bill budget bill budget",
+    "Café owners say the climate bill is a SHOCKING cover-up [video] 2020",
+    "national " * 50
+]
+
+
+def check_parity(pipe, tmp_path):
+    path = str(tmp_path / "fast")
+    export_pipeline(pipe, path)
+    scorer = FastScorer(path)
+    assert isinstance(scorer.coef, np.memmap) and isinstance(scorer.terms, np.memmap)
+    np.testing.assert_allclose(scorer.predict_proba(TEXTS), pipe.predict_proba(TEXTS), rtol=0, atol=1e-12)
+    assert scorer.predict(TEXTS).tolist() == pipe.predict(TEXTS).tolist()
+    return scorer
+
+
+class TestFastScorer:
+    """Test exported scorers against predict_proba"""
+
+    @pytest.mark.parametrize("vect, tfidf", [
+        ({}, {}),
+        ({"max_features": 20}, {}),
+        ({"binary": True}, {"norm": None}),
+        ({"lowercase": False, "stop_words": "english"}, {"sublinear_tf": True, "use_idf": False}),
+    ])
+    def test_parity_with_pipeline(self, tmp_path, vect, tfidf):
+        """Same probabilities as the sklearn pipeline across vectorizer settings"""
+        pipe = Pipeline([
+            ('vect', CountVectorizer(**vect)),
+            ('tfidf', TfidfTransformer(**tfidf)),
+            ('clf', LogisticRegression())
+        ]).fit(TRAIN, LABELS)
+        check_parity(pipe, tmp_path)
+
+    def test_parity_with_normalizer_and_tfidf_vectorizer(self, tmp_path):
+        """The textnorm step and a combined TfidfVectorizer are reproduced too"""
+        pipe = Pipeline([
+            ('norm', FunctionTransformer(normalize_batch)),
+            ('vect', TfidfVectorizer()),
+            ('clf', LogisticRegression(C=10))
+        ]).fit(TRAIN, LABELS)
+        assert check_parity(pipe, tmp_path).meta["normalize"] is True
+
+    def test_rejects_unsupported_pipelines(self, tmp_path):
+        """Pipelines the scorer can't reproduce exactly are refused at export"""
+        pipe = Pipeline([
+            ('vect', CountVectorizer(ngram_range=(1, 2))),
+            ('tfidf', TfidfTransformer()),
+            ('clf', LogisticRegression())
+        ]).fit(TRAIN, LABELS)
+        with pytest.raises(ValueError):
+            export_pipeline(pipe, str(tmp_path / "fast"))
+
+    def test_stale_artifact_ignored(self, tmp_path):
+        """An artifact exported from a different pickle is not used"""
+        pipe = Pipeline([
+            ('vect', CountVectorizer()),
+            ('tfidf', TfidfTransformer()),
+            ('clf', LogisticRegression())
+        ]).fit(TRAIN, LABELS)
+        source = tmp_path / "model.pkl"
+        joblib.dump(pipe, source)
+        path = str(tmp_path / "fast")
+        export_pipeline(pipe, path, source=str(source))
+
+        assert load_fast_scorer(str(source), path) is not None
+        source.write_bytes(source.read_bytes() + b"\0")
+        assert load_fast_scorer(str(source), path) is None
+
+    def test_reexport_leaves_mapped_artifact_alone(self, tmp_path):
+        """A new export goes to a fresh version; a scorer holding the old one keeps its arrays"""
+        path = str(tmp_path / "fast")
+        first = Pipeline([('vect', CountVectorizer()), ('tfidf', TfidfTransformer()),
+                          ('clf', LogisticRegression())]).fit(TRAIN, LABELS)
+        export_pipeline(first, path)
+        old = FastScorer(path)
+        expected = old.predict_proba(TEXTS)
+
+        for C in (100.0, 0.01, 10.0):
+            second = Pipeline([('vect', CountVectorizer(max_features=15)), ('tfidf', TfidfTransformer()),
+                               ('clf', LogisticRegression(C=C))]).fit(TRAIN, LABELS)
+            export_pipeline(second, path)
+
+        np.testing.assert_array_equal(old.predict_proba(TEXTS), expected)
+        new = FastScorer(path)
+        assert new.path != old.path
+        np.testing.assert_allclose(new.predict_proba(TEXTS), second.predict_proba(TEXTS), atol=1e-12)
+        # The two newest versions are kept, nothing is left staged
+        assert {name for name in os.listdir(path) if not name.startswith("v")} == {"CURRENT"}
+        assert len([name for name in os.listdir(path) if name.startswith("v")]) == 2
+
+    @pytest.mark.skipif(not os.path.exists(MODEL_PATH), reason="trained model not available")
+    def test_parity_with_shipped_model(self, tmp_path):
+        """The production model exports and scores identically"""
+        check_parity(joblib.load(MODEL_PATH), tmp_path)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
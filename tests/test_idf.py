@@ -0,0 +1,79 @@
+"""
+Unit Tests for the global IDF table
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+import idf
+from idf import GlobalIDF, build_idf, ANALYZER_PARAMS
+
+CORPUS = [
+    "Parliament approves the new national climate bill",
+    "Senate rejects climate bill after long debate",
+    "President signs national budget into law",
+    "Stock markets rally as national budget is approved",
+    "Climate protesters gather outside parliament"
+]
+
+
+@pytest.fixture
+def table(tmp_path):
+    build_idf(CORPUS, path=str(tmp_path), min_df=1, source="test")
+    return GlobalIDF(str(tmp_path))
+
+
+class TestGlobalIDF:
+    """Test building, memory-mapping and transforming with the IDF table"""
+
+    def test_memory_mapped(self, table):
+        """Both arrays are read-only memory maps"""
+        assert isinstance(table.terms, np.memmap)
+        assert isinstance(table.values, np.memmap)
+        assert list(table.terms) == sorted(table.terms)
+
+    def test_transform_matches_fitted_vectorizer(self, table):
+        """In-vocabulary text transforms exactly like the vectorizer fitted on the corpus"""
+        fitted = TfidfVectorizer(**ANALYZER_PARAMS).fit(CORPUS)
+        text = "new national climate bill"
+        expected = fitted.transform([text]).toarray()[0]
+        actual = table.transform([text])
+
+        by_term = {term: actual[0, i] for i, term in enumerate(table.terms) if actual[0, i]}
+        for term, column in fitted.vocabulary_.items():
+            assert by_term.get(term, 0.0) == pytest.approx(expected[column], rel=1e-6)
+
+    def test_unknown_terms_get_max_idf(self, table):
+        """Terms outside the table are weighted as unseen, and longer-than-width terms never match"""
+        columns, idf = table.lookup(["climate", "zeppelin", "climate" + "x" * 100])
+        assert idf[0] < idf[1] == idf[2] == pytest.approx(np.log(1 + len(CORPUS)) + 1)
+        assert columns[1] >= len(table) and columns[2] >= len(table)
+        assert columns[1] != columns[2]
+
+    def test_similarity_is_stable(self, table):
+        """Identical texts score 1 and unrelated texts 0, independent of batch"""
+        vectors = table.transform([
+            "climate bill", "climate bill", "budget law", ""
+        ])
+        scores = (vectors @ vectors[0].T).toarray().ravel()
+        assert scores[:2] == pytest.approx([1.0, 1.0])
+        assert scores[2:] == pytest.approx([0.0, 0.0])
+
+
+    def test_table_only_used_when_enabled(self, table, monkeypatch):
+        """An artifact on disk is ignored unless GLOBAL_IDF_ENABLED is set"""
+        monkeypatch.setattr(idf, "IDF_PATH", table.path)
+        for enabled in (False, True):
+            monkeypatch.setattr(idf, "GLOBAL_IDF_ENABLED", enabled)
+            monkeypatch.setattr(idf, "_global_idf", None)
+            monkeypatch.setattr(idf, "_load_attempted", False)
+            assert (idf.get_global_idf() is not None) == enabled
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
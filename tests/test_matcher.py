@@ -0,0 +1,95 @@
+"""
+Unit Tests for the multi-pattern matcher
+"""
+
+import json
+import random
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import matcher
+from matcher import PatternMatcher, load_lexicon
+
+LEXICON = {
+    'death': ['died', 'death', 'dead', 'passed away', 'killed'],
+    'law': ['law', 'legislation', 'bill', 'act', 'regulation'],
+    'policy': ['policy', 'government', 'minister', 'president', 'prime minister'],
+    'celebrity': ['celebrity', 'actor', 'actress', 'star', 'famous']
+}
+
+
+def naive_categories(text, lexicon):
+    text_lower = text.lower()
+    return {c for c, terms in lexicon.items() if any(t in text_lower for t in terms)}
+
+
+class TestPatternMatcher:
+    """Test single-pass matching against per-term substring scans"""
+
+    def test_substring_semantics(self):
+        """Same categories as `any(term in text.lower())` for every category"""
+        scan = PatternMatcher(LEXICON)
+        regex = PatternMatcher(LEXICON, scan_threshold=0)
+        assert scan.stats()["strategy"] == "scan" and regex.stats()["strategy"] == "regex"
+
+        words = ['the', 'actor', 'actress', 'Dead', 'lawyer', 'PRIME', 'minister', 'fact',
+                 'passed', 'away', 'stardom', 'bill', 'killed', 'x']
+        random.seed(3)
+        for _ in range(3000):
+            text = ' '.join(random.choices(words, k=random.randint(0, 8)))
+            expected = naive_categories(text, LEXICON)
+            assert scan.categories(text) == expected, text
+            assert regex.categories(text) == expected, text
+
+    def test_hit_positions(self):
+        """Every hit reports where it starts and ends in the original text, overlaps included"""
+        m = PatternMatcher(LEXICON)
+        text = "The Actress said the Prime Minister died"
+        hits = m.find_all(text)
+        assert [(text[h.start:h.end], sorted(h.categories)) for h in hits] == [
+            ("Actress", ["celebrity", "law"]),
+            ("Prime Minister", ["policy"]),
+            ("Minister", ["policy"]),
+            ("died", ["death"])
+        ]
+
+    def test_word_boundary_mode(self):
+        """Whole-word mode ignores terms embedded in longer words"""
+        m = PatternMatcher(LEXICON, word_boundary=True)
+        assert m.categories("a matter of fact about lawyers") == set()
+        assert m.categories("the act and the prime minister") == {"law", "policy"}
+        assert [h.term for h in m.find_all("prime minister")] == ["prime minister", "minister"]
+
+    def test_first_category_and_empty(self):
+        m = PatternMatcher(LEXICON)
+        assert m.first_category("famous actor dead", ("death", "law", "celebrity")) == "death"
+        assert m.first_category("nothing here", ("death",)) is None
+        assert PatternMatcher({}).categories("anything") == set()
+
+    def test_large_lexicon(self):
+        """Thousands of terms compile into one pattern and still match exactly"""
+        random.seed(5)
+        terms = {f"c{i}": [''.join(random.choices('abcdefgh', k=random.randint(3, 8))) for _ in range(500)]
+                 for i in range(6)}
+        m = PatternMatcher(terms)
+        for _ in range(200):
+            text = ''.join(random.choices('abcdefgh ', k=200))
+            assert m.categories(text) == naive_categories(text, terms)
+
+    def test_lexicon_file(self, tmp_path, monkeypatch):
+        """LEXICON_PATH extends categories, and '=' replaces them"""
+        path = tmp_path / "lexicon.json"
+        path.write_text(json.dumps({"claim_type": {"death": ["obituary"], "=law": ["statute"], "sports": ["goal"]}}))
+        monkeypatch.setattr(matcher, "LEXICON_PATH", str(path))
+        lexicon = load_lexicon("claim_type", LEXICON)
+        assert lexicon["death"][-1] == "obituary"
+        assert lexicon["law"] == ["statute"]
+        assert lexicon["sports"] == ["goal"]
+        assert load_lexicon("other", {"a": ["b"]}) == {"a": ["b"]}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,192 @@
+"""
+Unit Tests for the model-server sidecar and its clients
+"""
+
+import asyncio
+import shutil
+import stat
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import numpy as np
+
+from model_server import (
+    ModelServer, ModelServerClient, ModelServerError, RemoteEmbeddingGenerator, RemoteSummarizer
+)
+from summarize import AdvancedSummarizer
+
+ARTICLE = (
+    "The city council approved the new transit budget on Monday. "
+    "Officials said the plan adds twelve bus routes by next spring. "
+    "Critics argued the budget ignores road repairs in older districts. "
+    "The mayor promised a separate vote on repairs before the summer. "
+    "Residents will be able to comment on the routes at public hearings."
+)
+
+
+class HashEmbedder:
+    """Deterministic stand-in for a sentence-transformer: one batch per embed() call"""
+
+    method = "hash"
+    model_id = "hash"
+
+    def __init__(self, method="auto"):
+        self.calls = 0
+
+    def get_dimension(self):
+        return 8
+
+    def embed(self, texts):
+        self.calls += 1
+        return np.asarray([[hash((text, i)) % 1000 / 1000 for i in range(8)] for text in texts], dtype=np.float32)
+
+
+@pytest.fixture
+def server():
+    """A ModelServer on a private Unix socket, run on its own event loop thread"""
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "models.sock")
+    instance = ModelServer(AdvancedSummarizer(), HashEmbedder())
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    serving = asyncio.run_coroutine_threadsafe(instance.serve(path), loop)
+    while not os.path.exists(path):
+        pass
+
+    yield instance, path
+
+    serving.cancel()
+    # Let the connection handlers see their sockets close before the loop stops
+    asyncio.run_coroutine_threadsafe(asyncio.sleep(0.1), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+    shutil.rmtree(directory)
+
+
+class TestModelServer:
+    """Test remote summaries and embeddings against the in-process models"""
+
+    def test_remote_matches_local(self, server):
+        """Remote clients return what the local models would"""
+        instance, path = server
+        client = ModelServerClient(path)
+
+        assert RemoteSummarizer(client).summarize(ARTICLE) == AdvancedSummarizer().summarize(ARTICLE)
+        assert RemoteSummarizer(client).summarize("short") == "short"
+
+        embedder = RemoteEmbeddingGenerator(client)
+        assert embedder.get_dimension() == 8 and embedder.method == "hash"
+        np.testing.assert_array_equal(embedder.embed(["a", "b"]), HashEmbedder().embed(["a", "b"]))
+        assert embedder.embed("a").shape == (1, 8)
+
+    def test_concurrent_requests_are_batched(self, server):
+        """Concurrent callers on many threads share embed() calls"""
+        instance, path = server
+        embedder = RemoteEmbeddingGenerator(ModelServerClient(path))
+        texts = [f"text {i}" for i in range(64)]
+
+        with ThreadPoolExecutor(16) as pool:
+            results = list(pool.map(lambda text: embedder.embed(text), texts))
+
+        expected = HashEmbedder().embed(texts)
+        for i, result in enumerate(results):
+            np.testing.assert_array_equal(result[0], expected[i])
+        assert instance.embedder.calls < len(texts)
+        assert instance.stats()["batching"]["embed"]["total_items"] == 64
+
+    def test_errors(self, server):
+        """Server-side errors are raised in the caller; a dead server falls back to TF-IDF"""
+        instance, path = server
+        client = ModelServerClient(path)
+        with pytest.raises(ModelServerError):
+            client.call("no-such-op")
+
+        instance.embedder = None
+        with pytest.raises(RuntimeError):
+            RemoteEmbeddingGenerator(client)
+
+        offline = RemoteSummarizer(ModelServerClient(path + ".missing"))
+        assert offline.summarize(ARTICLE) == AdvancedSummarizer().summarize(ARTICLE)
+        assert offline.batch_summarize([ARTICLE, "short"]) == [AdvancedSummarizer().summarize(ARTICLE), "short"]
+
+    def test_socket_is_private(self, server):
+        """The socket is created mode 0600 and the process umask is left as it was"""
+        instance, path = server
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+        umask = os.umask(0o022)
+        os.umask(umask)
+        assert umask != 0o177
+
+    def test_embeddings_fall_back_locally(self, server, monkeypatch):
+        """A dead server falls back to a local generator for the same model, at startup or per call"""
+        import embedcache
+        import embeddings
+        import model_server
+
+        instance, path = server
+        monkeypatch.setattr(embeddings, "EmbeddingGenerator", HashEmbedder)
+        embedder = RemoteEmbeddingGenerator(ModelServerClient(path))
+        embedder.client = ModelServerClient(path + ".missing")
+        np.testing.assert_array_equal(embedder.embed(["a", "b"]), HashEmbedder().embed(["a", "b"]))
+        assert embedder._local.calls == 1
+
+        embedder.model_id = "other"
+        with pytest.raises(OSError):
+            embedder.embed("a")
+
+        monkeypatch.setattr(model_server, "MODEL_SERVER_SOCKET", path + ".missing")
+        monkeypatch.setattr(model_server, "_client", None)
+        monkeypatch.setattr(embeddings, "_embedding_generator", None)
+        monkeypatch.setattr(embedcache, "EMBED_CACHE_ENABLED", False)
+        assert isinstance(embeddings.get_embedding_generator(), HashEmbedder)
+
+    def test_timed_out_request_is_forgotten(self, server):
+        """A call that times out leaves nothing pending; its late answer is dropped"""
+        instance, path = server
+        release = threading.Event()
+
+        class SlowSummarizer:
+            def batch_summarize(self, texts, **kwargs):
+                release.wait(5)
+                return ["late"] * len(texts)
+
+        instance.summarizer = SlowSummarizer()
+        client = ModelServerClient(path)
+        with pytest.raises(TimeoutError):
+            client.call("summarize", timeout=0.05, text=ARTICLE)
+        assert client._pending == {}
+
+        release.set()
+        assert client.call("info")["embeddings"] == "hash"
+
+    def test_batch_falls_back_per_text(self):
+        """Only the texts whose request failed are summarized locally"""
+        class FlakyClient:
+            timeout = 1
+
+            def submit(self, op, text, **kwargs):
+                if "FAIL" in text:
+                    raise ConnectionError("dropped")
+                future = Future()
+                future.set_result("remote")
+                return future
+
+            def wait(self, future, timeout=None):
+                return future.result(timeout)
+
+        failing = ARTICLE + " FAIL"
+        summaries = RemoteSummarizer(FlakyClient()).batch_summarize([ARTICLE, failing, "short"])
+        assert summaries == ["remote", AdvancedSummarizer().summarize(failing), "short"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,127 @@
+"""
+Unit Tests for the hot-reloading model registry
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+from fastmodel import export_pipeline
+from registry import ModelRegistry, validate_model
+
+TRAIN = [
+    "Parliament approves the new national climate bill",
+    "SHOCKING: celebrity secretly replaced by clone, insiders say",
+    "President signs national budget into law",
+    "Miracle cure the government doesn't want you to know about"
+]
+
+
+def train(labels, C=1.0):
+    return Pipeline([
+        ('vect', CountVectorizer()),
+        ('tfidf', TfidfTransformer()),
+        ('clf', LogisticRegression(C=C))
+    ]).fit(TRAIN, labels)
+
+
+@pytest.fixture
+def registry(tmp_path):
+    model_path = str(tmp_path / "model.pkl")
+    joblib.dump(train([1, 0, 1, 0]), model_path)
+    registry = ModelRegistry(model_path, str(tmp_path / "fast"))
+    registry.load()
+    return registry
+
+
+class TestModelRegistry:
+    """Test loading, validation and swapping"""
+
+    def test_reload_swaps_version(self, registry):
+        """A replaced pickle is swapped in; models held by in-flight batches keep working"""
+        swapped = []
+        registry.on_swap.append(swapped.append)
+        old_model, old_version = registry.model, registry.version
+        assert registry.active.kind == "pipeline"
+
+        joblib.dump(train([1, 0, 1, 0], C=100.0), registry.model_path)
+        active = asyncio.run(registry.reload())
+
+        assert active.version != old_version and registry.model is active.model
+        assert swapped == [active]
+        assert old_model.predict_proba(TRAIN).shape == (4, 2)
+        assert registry.stats()["reloads"] == 1
+
+    def test_prefers_current_fast_artifact(self, registry):
+        """The fast scorer is used once it is exported from the pickle on disk"""
+        export_pipeline(joblib.load(registry.model_path), registry.fast_path, source=registry.model_path)
+        active = asyncio.run(registry.reload())
+        assert active.kind == "fast"
+        assert registry.stats()["fast_model"]["terms"] > 0
+
+    def test_reexport_keeps_active_fast_scorer(self, registry):
+        """Retraining and exporting over a live fast scorer leaves it scoring until the swap"""
+        export_pipeline(joblib.load(registry.model_path), registry.fast_path, source=registry.model_path)
+        old = asyncio.run(registry.reload())
+        assert old.kind == "fast"
+        expected = old.model.predict_proba(TRAIN)
+
+        retrained = train([0, 1, 0, 1], C=100.0)
+        joblib.dump(retrained, registry.model_path)
+        export_pipeline(retrained, registry.fast_path, source=registry.model_path)
+        np.testing.assert_array_equal(old.model.predict_proba(TRAIN), expected)
+
+        active = asyncio.run(registry.reload())
+        assert active.kind == "fast" and active.path != old.path
+        np.testing.assert_allclose(active.model.predict_proba(TRAIN), retrained.predict_proba(TRAIN), atol=1e-12)
+        np.testing.assert_array_equal(old.model.predict_proba(TRAIN), expected)
+
+    def test_failed_canary_keeps_active_model(self, registry):
+        """A model that fails validation is never swapped in"""
+        before = registry.active
+        joblib.dump(Pipeline([('vect', CountVectorizer()), ('clf', LogisticRegression())])
+                    .fit(TRAIN * 2, [0, 1, 2, 3] * 2), registry.model_path)
+
+        with pytest.raises(ValueError):
+            asyncio.run(registry.reload())
+        assert registry.active is before
+        assert registry.stats()["failures"] == 1
+
+        with open(registry.model_path, "wb") as f:
+            f.write(b"truncated")
+        with pytest.raises(Exception):
+            asyncio.run(registry.reload())
+        assert registry.active is before
+
+    def test_validate_model(self):
+        """The canary check accepts a binary classifier"""
+        validate_model(train([1, 0, 1, 0]))
+
+    def test_watcher_reloads_after_change_settles(self, registry):
+        """The watcher picks up a replaced pickle without an explicit reload"""
+        old_version = registry.version
+
+        async def scenario():
+            registry.start_watcher(0.02)
+            joblib.dump(train([1, 0, 1, 0], C=100.0), registry.model_path)
+            for _ in range(100):
+                await asyncio.sleep(0.02)
+                if registry.version != old_version:
+                    break
+            registry.stop_watcher()
+
+        asyncio.run(scenario())
+        assert registry.version != old_version
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,346 @@
+"""
+Unit Tests for source verification plumbing (no external network)
+"""
+
+import asyncio
+import pytest
+import socket
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import search
+import resilience
+from aiohttp import web
+
+
+def _free_port() -> int:
+    """A port nothing listens on, assigned by the OS"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _local_server(handler, port: int):
+    """Start a throwaway HTTP server on localhost"""
+    app = web.Application()
+    app.router.add_get('/', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', port).start()
+    return runner
+
+
+async def _ok(request):
+    return web.Response(text="ok")
+
+
+class TestSharedSession:
+    """Test the application-wide pooled client session"""
+
+    def test_connections_are_reused(self):
+        """Sequential fetches share one session and reuse keep-alive connections"""
+        async def run():
+            port = _free_port()
+            runner = await _local_server(_ok, port)
+            try:
+                first = await search.get_http_session()
+                before = dict(search.pool_stats)
+                for _ in range(3):
+                    assert await search.fetch_url(first, f'http://127.0.0.1:{port}/') == "ok"
+                assert await search.get_http_session() is first
+                return before, dict(search.pool_stats)
+            finally:
+                await search.close_http_session()
+                await runner.cleanup()
+
+        before, after = asyncio.run(run())
+        assert after["requests"] - before["requests"] == 3
+        assert after["connections_created"] - before["connections_created"] == 1
+        assert after["connections_reused"] - before["connections_reused"] == 2
+
+
+class TestSearchCache:
+    """Test the stale-while-revalidate headline cache"""
+
+    def test_fresh_stale_and_negative(self, monkeypatch):
+        """Fresh hits skip the fetch, stale hits refresh once in the background, empty pages are negatively cached"""
+        hits = {"count": 0}
+
+        async def page(request):
+            hits["count"] += 1
+            if request.query.get("q") == "nothing":
+                return web.Response(text="<html></html>", content_type="text/html")
+            return web.Response(
+                text="<h2>Parliament approves the new national climate bill</h2>",
+                content_type="text/html"
+            )
+
+        port = _free_port()
+        monkeypatch.setitem(search.TRUSTED_SOURCES, "localtest", f"http://127.0.0.1:{port}/?q=")
+
+        async def run():
+            runner = await _local_server(page, port)
+            try:
+                session = await search.get_http_session()
+                first = await search.get_headlines(session, "localtest", "climate")
+                second = await search.get_headlines(session, "localtest", "climate")
+                assert first == second == ["Parliament approves the new national climate bill"]
+                assert hits["count"] == 1
+
+                # Age the entry: served stale immediately, refreshed by one background task
+                key = search._search_key("localtest", "climate")
+                search.search_cache.set(key, ["stale headline that is long enough"], ttl=0, stale_ttl=60)
+                stale = await search.get_headlines(session, "localtest", "climate")
+                again = await search.get_headlines(session, "localtest", "climate")
+                assert stale == again == ["stale headline that is long enough"]
+                await search._refreshing[key]
+                assert hits["count"] == 2
+                assert await search.get_headlines(session, "localtest", "climate") == first
+
+                # Empty result is cached too
+                assert await search.get_headlines(session, "localtest", "nothing") == []
+                assert await search.get_headlines(session, "localtest", "nothing") == []
+                assert hits["count"] == 3
+
+                # A refresh that comes back empty keeps serving the stale entry
+                key = search._search_key("localtest", "nothing")
+                search.search_cache.set(key, ["stale headline that is long enough"], ttl=0, stale_ttl=60)
+                assert await search.get_headlines(session, "localtest", "nothing") == ["stale headline that is long enough"]
+                await search._refreshing[key]
+                assert hits["count"] == 4
+                assert await search.get_headlines(session, "localtest", "nothing") == ["stale headline that is long enough"]
+                assert search.search_stats["refresh_kept_stale"] >= 1
+            finally:
+                await search.close_http_session()
+                await runner.cleanup()
+                search.search_cache.clear()
+
+        asyncio.run(run())
+
+
+class TestBatchSimilarity:
+    """Test one-pass headline scoring against the per-pair TF-IDF path"""
+
+    def test_matches_per_pair_scores(self):
+        """Batch scores equal calculate_similarity for every headline"""
+        from utils import calculate_similarity, batch_similarity
+        text = "Parliament approves the new national climate bill after a late-night vote"
+        headlines = [
+            "Parliament approves national climate bill",
+            "Late-night vote ends with climate bill approved by parliament",
+            "Stock markets rally on strong earnings",
+            "the and of",
+            ""
+        ]
+        expected = [calculate_similarity(text, h) for h in headlines]
+        assert batch_similarity(text, headlines) == pytest.approx(expected, abs=1e-12)
+        assert batch_similarity("", headlines) == [0.0] * len(headlines)
+
+    def test_scores_all_sources_together(self):
+        """Each source's max_similarity comes from its own slice of the batch"""
+        results = search.score_source_results("climate bill passes parliament", [
+            {"source": "a", "headlines": ["Climate bill passes parliament", "Unrelated sports result"]},
+            {"source": "b", "headlines": []},
+            {"source": "c", "headlines": ["Football final ends in a draw"], "skipped": None}
+        ])
+        assert [r["source"] for r in results] == ["a", "b", "c"]
+        assert results[0]["max_similarity"] == pytest.approx(1.0)
+        assert results[1]["max_similarity"] == 0.0
+        assert results[2]["max_similarity"] == 0.0
+
+
+class TestSourceHealth:
+    """Test adaptive timeouts and the circuit breaker state machine"""
+
+    def test_adaptive_timeout(self, monkeypatch):
+        """Timeout follows observed latency once enough samples exist, within the clamps"""
+        monkeypatch.setattr(resilience, "SOURCE_MIN_SAMPLES", 3)
+        health = resilience.SourceHealth("t")
+        assert health.timeout() == resilience.SOURCE_TIMEOUT_DEFAULT
+
+        for latency in (0.1, 0.1, 0.1, 2.0):
+            health.record_success(latency)
+        assert health.timeout() == pytest.approx(3.0)
+
+        for _ in range(50):
+            health.record_success(0.01)
+        assert health.timeout() == resilience.SOURCE_TIMEOUT_MIN
+
+    def test_timeouts_back_off_and_probe_recovers(self, monkeypatch):
+        """A source slower than its deadline pushes the deadline up; a half-open probe gets the default"""
+        monkeypatch.setattr(resilience, "BREAKER_RESET_SECONDS", 0)
+        health = resilience.SourceHealth("t")
+        for _ in range(50):
+            health.record_success(1.0)
+        assert health.timeout() == pytest.approx(1.5)
+
+        # The source now takes 4s: every request times out, but the deadline grows
+        deadlines = []
+        while len(deadlines) < 4:
+            deadline = health.timeout()
+            health.record_failure(deadline)
+            deadlines.append(deadline)
+        assert deadlines[-1] > deadlines[0]
+
+        for _ in range(resilience.BREAKER_FAILURE_THRESHOLD):
+            health.record_failure(health.timeout())
+        assert health.state == resilience.OPEN
+        assert health.allow_request() and health.state == resilience.HALF_OPEN
+        assert health.timeout() == resilience.SOURCE_TIMEOUT_DEFAULT >= 4.0
+        health.record_success(4.0)
+        assert health.state == resilience.CLOSED
+
+    def test_breaker_opens_and_probes(self, monkeypatch):
+        """Consecutive failures open the breaker; after the reset window one probe is allowed"""
+        monkeypatch.setattr(resilience, "BREAKER_FAILURE_THRESHOLD", 2)
+        monkeypatch.setattr(resilience, "BREAKER_RESET_SECONDS", 0.05)
+        health = resilience.SourceHealth("t")
+
+        health.record_failure()
+        assert health.allow_request()
+        health.record_failure()
+        assert health.state == resilience.OPEN
+        assert not health.allow_request()
+
+        time.sleep(0.06)
+        assert health.allow_request()
+        assert health.state == resilience.HALF_OPEN
+        assert not health.allow_request()
+
+        health.record_failure()
+        assert health.state == resilience.OPEN
+        time.sleep(0.06)
+        assert health.allow_request()
+        health.record_success(0.1)
+        assert health.state == resilience.CLOSED
+        assert health.stats()["times_opened"] == 2
+
+
+class TestSourceResilience:
+    """Test breaker skipping and the overall verification deadline against a local server"""
+
+    def test_open_breaker_skips_source(self, monkeypatch):
+        """A failing source is short-circuited without further requests"""
+        hits = {"count": 0}
+
+        async def broken(request):
+            hits["count"] += 1
+            return web.Response(status=500)
+
+        monkeypatch.setattr(resilience, "_health", {})
+        monkeypatch.setattr(resilience, "BREAKER_FAILURE_THRESHOLD", 2)
+        port = _free_port()
+        monkeypatch.setitem(search.TRUSTED_SOURCES, "localtest", f"http://127.0.0.1:{port}/?q=")
+
+        async def run():
+            runner = await _local_server(broken, port)
+            try:
+                session = await search.get_http_session()
+                for query in ("first query", "second query"):
+                    assert await search.get_headlines(session, "localtest", query) == []
+                result = await search.search_source(session, "localtest", "third query", "third query")
+                assert result["skipped"] == "circuit_open"
+            finally:
+                await search.close_http_session()
+                await runner.cleanup()
+                search.search_cache.clear()
+
+        asyncio.run(run())
+        assert hits["count"] == 2
+        assert search.aggregate_results([
+            {"source": "localtest", "headlines": [], "max_similarity": 0.0, "skipped": "circuit_open"}
+        ])["skipped"] == {"localtest": "circuit_open"}
+
+    def test_deadline_cancels_slow_sources(self, monkeypatch):
+        """Sources still pending at the deadline are reported as skipped and their requests stopped"""
+        dropped = asyncio.Event()
+
+        async def slow(request):
+            for _ in range(40):
+                await asyncio.sleep(0.05)
+                if request.transport is None or request.transport.is_closing():
+                    dropped.set()
+                    break
+            return web.Response(text="<h2>Too late for this verification run</h2>", content_type="text/html")
+
+        monkeypatch.setattr(resilience, "_health", {})
+        port = _free_port()
+        monkeypatch.setattr(search, "TRUSTED_SOURCES", {"localtest": f"http://127.0.0.1:{port}/?q="})
+
+        async def run():
+            runner = await _local_server(slow, port)
+            try:
+                started = time.perf_counter()
+                result = await search.verify_with_sources("slow source story", ["slow"], deadline=0.2)
+                elapsed = time.perf_counter() - started
+                # The cancelled fetch closes its connection; the handler sees it go
+                await asyncio.wait_for(dropped.wait(), 1)
+                return result, elapsed
+            finally:
+                await search.close_http_session()
+                await runner.cleanup()
+                search.search_cache.clear()
+
+        result, elapsed = asyncio.run(run())
+        assert elapsed < 1.5
+        assert result["skipped"] == {"localtest": "deadline"}
+        assert result["scores"] == {}
+
+
+class TestDecisiveVerification:
+    """Test early exit once the verdict can no longer change"""
+
+    def test_settled_status(self):
+        """The verdict is settled only when every outcome of the remaining sources agrees"""
+        from utils import settled_verification_status
+        assert settled_verification_status({"a": 0.9, "b": 0.7}, remaining=4) == "Verified"
+        assert settled_verification_status({"a": 0.9}, remaining=1) is None
+        assert settled_verification_status({"a": 0.1}, remaining=2) is None
+        assert settled_verification_status({"a": 0.5, "b": 0.1}, remaining=0) == "Breaking News - Low Confirmation"
+
+    def test_cancels_remaining_sources(self, monkeypatch):
+        """Two confirming sources decide the verdict without waiting for a slow one, streamed or not"""
+        story = "Parliament approves the new national climate bill"
+
+        async def page(request):
+            if request.query.get("site") == "slow":
+                await asyncio.sleep(2)
+            return web.Response(text=f"<h2>{story}</h2>", content_type="text/html")
+
+        monkeypatch.setattr(resilience, "_health", {})
+        port = _free_port()
+        monkeypatch.setattr(search, "TRUSTED_SOURCES", {
+            name: f"http://127.0.0.1:{port}/?site={name}&q="
+            for name in ("fast1", "fast2", "slow")
+        })
+
+        async def run():
+            runner = await _local_server(page, port)
+            try:
+                started = time.perf_counter()
+                result = await search.verify_with_sources(story, ["climate"], decisive=True)
+                elapsed = time.perf_counter() - started
+
+                # The streaming path stops at the same point
+                search.search_cache.clear()
+                started = time.perf_counter()
+                streamed = [r async for r in search.iter_source_results(story, ["climate"], decisive=True)]
+                return result, elapsed, streamed, time.perf_counter() - started
+            finally:
+                await search.close_http_session()
+                await runner.cleanup()
+                search.search_cache.clear()
+
+        result, elapsed, streamed, stream_elapsed = asyncio.run(run())
+        assert elapsed < 1.5 and stream_elapsed < 1.5
+        assert result["status"] == "Verified"
+        assert result["sources"] == ["fast1", "fast2"]
+        assert result["skipped"] == {"slow": "decided"}
+        assert search.aggregate_results(streamed) == result
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,83 @@
+"""
+Unit Tests for the pre-fork server
+"""
+
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+import pytest
+
+BACKEND = os.path.join(os.path.dirname(__file__), '..', 'backend')
+
+pytest.importorskip("uvicorn")
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork") or not os.path.exists("/proc"),
+                                reason="pre-fork mode needs os.fork and /proc")
+
+
+def workers_of(pid):
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(child) for child in f.read().split()]
+
+
+def wait_for(check, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            result = check()
+            if result:
+                return result
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise AssertionError("timed out")
+
+
+@pytest.fixture
+def server():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    env = dict(os.environ, PRELOAD_COMPONENTS="idf,nlp", WARMUP_COMPONENTS="", SERVE_RESTART_BACKOFF="0")
+    proc = subprocess.Popen(
+        [sys.executable, "serve.py", "--workers", "2", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=BACKEND, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+    )
+    yield proc, port
+    if proc.poll() is None:
+        proc.kill()
+    proc.wait()
+
+
+def get(port, path):
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=10) as response:
+        return json.loads(response.read())
+
+
+class TestPreforkServer:
+    """Test forked workers, restarts and shutdown"""
+
+    def test_serves_restarts_and_stops(self, server):
+        """Workers answer with the preloaded components, dead ones are replaced, SIGTERM drains all"""
+        proc, port = server
+        ready = wait_for(lambda: get(port, "/ready"))
+        assert ready["components"]["idf"] == "warm" and ready["components"]["nlp"] == "warm"
+
+        first = wait_for(lambda: len(workers_of(proc.pid)) == 2 and workers_of(proc.pid))
+        os.kill(first[0], signal.SIGKILL)
+        wait_for(lambda: len(workers_of(proc.pid)) == 2 and first[0] not in workers_of(proc.pid))
+        assert wait_for(lambda: get(port, "/health"))["status"] == "healthy"
+
+        proc.send_signal(signal.SIGTERM)
+        output, _ = proc.communicate(timeout=30)
+        assert proc.returncode == 0
+        assert "objects frozen" in output and "All workers stopped" in output
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
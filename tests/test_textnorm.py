@@ -0,0 +1,92 @@
+"""
+Unit Tests for the shared model-input normalizer
+"""
+
+import pickle
+import random
+import re
+import string
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from textnorm import normalize, normalize_batch, with_normalizer
+
+
+def wordpre(text):
+    """The eight-pass chain the Flask demo used before textnorm"""
+    text = text.lower()
+    text = re.sub(r'\[.*?\]', '', text)
+    text = re.sub("\\W", " ", text)
+    text = re.sub(r'https?://\S+|www\.\S+', '', text)
+    text = re.sub('<.*?>+', '', text)
+    text = re.sub('[%s]' % re.escape(string.punctuation), '', text)
+    text = re.sub('\n', '', text)
+    text = re.sub(r'\w*\d\w*', '', text)
+    return text
+
+
+PIECES = ['Trump', 'said', ' ', '.', '2017', 'covid19', '_', 'snake_case', '[', ']', '[Reuters]',
+          '\n', '\t', 'https://t.co/x1', 'www.cnn.com', '<b>', '>', 'café', '“', '”', '—', '²', '٣',
+          'İ', '\x00', "don't", '$5', 'ab[x]1']
+
+
+class TestNormalize:
+    """Test the single normalizer against the legacy wordpre chain"""
+
+    def test_matches_wordpre(self):
+        """Identical output to the old chain, ASCII and Unicode inputs alike"""
+        cases = ["", "Breaking NEWS: 3 dead [video] at www.example.com/a1 <br> #sad_day"]
+        random.seed(11)
+        cases += [''.join(random.choices(PIECES, k=random.randint(0, 25))) for _ in range(5000)]
+        for text in cases:
+            assert normalize(text) == wordpre(text), repr(text)
+
+    def test_batch_matches_single(self):
+        """normalize_batch equals normalizing each text, across chunk boundaries"""
+        random.seed(12)
+        texts = [''.join(random.choices(PIECES, k=random.randint(0, 25))) for _ in range(2500)]
+        assert normalize_batch(texts) == [normalize(t) for t in texts]
+        assert normalize_batch(["Some text", None, float('nan'), ""]) == ["some text", "", "", ""]
+
+    def test_pipeline_pickles(self):
+        """A pipeline with the normalizer step survives a pickle round trip"""
+        from sklearn.feature_extraction.text import CountVectorizer
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import Pipeline
+        from sklearn.preprocessing import FunctionTransformer
+
+        pipe = Pipeline([
+            ('norm', FunctionTransformer(normalize_batch)),
+            ('vect', CountVectorizer()),
+            ('clf', LogisticRegression())
+        ])
+        texts = ["Markets rally 2% [Reuters]", "SHOCKING secret revealed!!!", "Officials confirm plan",
+                 "You won't BELIEVE this"]
+        pipe.fit(texts, [1, 0, 1, 0])
+
+        clone = pickle.loads(pickle.dumps(pipe))
+        assert clone.predict(texts).tolist() == pipe.predict(texts).tolist()
+        assert "reuters" not in clone.named_steps['vect'].vocabulary_
+
+    def test_with_normalizer(self):
+        """A pipeline trained without the step gets it once; one that has it is left alone"""
+        from sklearn.feature_extraction.text import CountVectorizer
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import Pipeline
+
+        texts = ["Markets rally 2% [Reuters]", "SHOCKING secret revealed!!!", "Officials confirm plan",
+                 "You won't BELIEVE this"]
+        old = Pipeline([('vect', CountVectorizer()), ('clf', LogisticRegression())])
+        old.fit(normalize_batch(texts), [1, 0, 1, 0])
+
+        wrapped = with_normalizer(old)
+        assert [name for name, _ in wrapped.steps] == ['norm', 'vect', 'clf']
+        assert with_normalizer(wrapped) is wrapped
+        assert wrapped.predict_proba(texts).tolist() == old.predict_proba(normalize_batch(texts)).tolist()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,85 @@
+"""
+Golden tests: the single-pass cleaner and fast tokenizer must reproduce the
+original clean_text + NLTK word_tokenize keywords exactly
+"""
+
+import csv
+import random
+import re
+import pytest
+import sys
+import os
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from nltk.tokenize import NLTKWordTokenizer
+import utils
+from utils import clean_text, extract_keywords, extract_keywords_batch, iter_tokens, Document
+
+POLITIFACT = os.path.join(os.path.dirname(__file__), '..', 'politifact', 'politifact_fake.csv')
+
+# Cleaned text is one line without sentence punctuation, so word_tokenize
+# (Punkt + NLTKWordTokenizer) reduces to NLTKWordTokenizer on the whole string
+_treebank = NLTKWordTokenizer()
+
+
+def legacy_clean(text):
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'\@\w+|\#', '', text)
+    text = re.sub(r'[^A-Za-z0-9\s]+', ' ', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text.lower()
+
+
+def legacy_keywords(text, top_n=10):
+    tokens = _treebank.tokenize(legacy_clean(text))
+    keywords = [w for w in tokens if w not in utils.STOP_WORDS and len(w) > 3]
+    return [w for w, _ in Counter(keywords).most_common(top_n)]
+
+
+def golden_texts():
+    texts = [
+        "BREAKING: @CNN reports http://t.co/abc the #President cannot attend!!",
+        "Visit www.example.com/page?x=1 or email me@example.com #fakenews",
+        "We're gonna win, wanna bet? Gotta see it. Lemme know, gimme 5 minutes",
+        "@user@other #tag#tag2 a#b @http://x.com @abwwwx 100% \"quoted\" — dash",
+        "Ünïcödé naïve café résumé, tabs\tand\nnewlines",
+        ""
+    ]
+    csv.field_size_limit(sys.maxsize)
+    with open(POLITIFACT, newline='', encoding='utf-8') as f:
+        texts.extend(row['title'] for row in csv.DictReader(f) if row.get('title'))
+    return texts
+
+
+class TestFastTokenizer:
+    """Test equivalence with the original regex + NLTK path"""
+
+    def test_clean_text_matches_legacy(self):
+        for text in golden_texts():
+            assert clean_text(text) == legacy_clean(text), text
+
+    def test_clean_text_fuzz(self):
+        """Random mixes of URLs, mentions, hashes and symbols clean identically"""
+        random.seed(0)
+        alphabet = list("ab cHtpw.:/@#_!é-\n\t12'\"") + ["http", "www", "https://", "@user", "#tag"]
+        for _ in range(20000):
+            text = "".join(random.choices(alphabet, k=random.randint(0, 25)))
+            assert clean_text(text) == legacy_clean(text), repr(text)
+
+    def test_tokens_match_treebank(self):
+        for text in golden_texts():
+            cleaned = legacy_clean(text)
+            assert list(iter_tokens(cleaned)) == _treebank.tokenize(cleaned), text
+
+    def test_keywords_match_legacy(self):
+        texts = golden_texts()
+        for text in texts:
+            assert extract_keywords(text) == legacy_keywords(text), text
+            assert extract_keywords(Document(text), top_n=5) == legacy_keywords(text, top_n=5)
+        assert extract_keywords_batch(texts, top_n=3) == [legacy_keywords(t, 3) for t in texts]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,54 @@
+"""
+Unit Tests for lazy startup and the background warm-up
+"""
+
+import asyncio
+import json
+import subprocess
+import pytest
+import sys
+import os
+
+BACKEND = os.path.join(os.path.dirname(__file__), '..', 'backend')
+sys.path.insert(0, BACKEND)
+
+from warmup import Warmup
+
+
+class TestWarmup:
+    """Test component loading and readiness state"""
+
+    def test_states(self):
+        """Components go from cold to warm, and a failing loader is reported"""
+        loaded = set()
+
+        def fail():
+            raise RuntimeError("no network")
+
+        warmup = Warmup({
+            "fast": (lambda: loaded.add("fast"), lambda: "fast" in loaded),
+            "broken": (fail, lambda: False)
+        })
+        assert warmup.stats()["components"] == {"fast": "cold", "broken": "cold"}
+
+        asyncio.run(warmup.warm_up(["fast", "broken", "unknown"]))
+        stats = warmup.stats()
+        assert stats["components"] == {"fast": "warm", "broken": "failed"}
+        assert stats["errors"] == {"broken": "no network"}
+        assert set(stats["seconds"]) == {"fast", "broken"}
+        assert stats["finished_at"] is not None
+
+    def test_import_main_stays_light(self):
+        """Importing the API loads none of the heavy libraries"""
+        heavy = ["sklearn", "scipy", "nltk", "transformers", "torch", "sentence_transformers", "faiss", "openai"]
+        script = (
+            "import sys, json, main; "
+            f"print(json.dumps([name for name in {heavy!r} if name in sys.modules]))"
+        )
+        proc = subprocess.run([sys.executable, "-c", script], cwd=BACKEND, capture_output=True, text=True)
+        assert proc.returncode == 0, proc.stderr
+        assert json.loads(proc.stdout.strip().splitlines()[-1]) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
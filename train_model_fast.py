@@ -1,10 +1,19 @@
 import pandas as pd
 import joblib
 from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
+from sklearn.preprocessing import FunctionTransformer
 from sklearn.linear_model import LogisticRegression
 from sklearn.pipeline import Pipeline
 from sklearn.model_selection import train_test_split
+import os
+import sys
 import warnings
+
+# The shared normalizer lives in backend/; the pipeline pickles a reference to it
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+from textnorm import normalize_batch
+from fastmodel import export_pipeline
+
 warnings.filterwarnings('ignore')
 
 # Load dataset
@@ -37,6 +46,7 @@ print(f"Train: {len(X_train)}, Test: {len(X_test)}")
 # Train
 print("\nTraining...")
 pipe = Pipeline([
+    ('norm', FunctionTransformer(normalize_batch)),
     ('vect', CountVectorizer(max_features=5000)),
     ('tfidf', TfidfTransformer()),
     ('clf', LogisticRegression(max_iter=500))
@@ -53,6 +63,7 @@ print(f"✓ Test accuracy: {test_score*100:.2f}%")
 
 # Save
 joblib.dump(pipe, 'model/model.pkl')
+export_pipeline(pipe, 'model/fast', source='model/model.pkl')
 print(f"\n✓ Model saved to model/model.pkl")
 
 # Test